@@ -11,7 +11,6 @@ from typing import Optional
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from prisma import Prisma
 from prometheus_fastapi_instrumentator import Instrumentator
 from pydantic import BaseModel
 
@@ -39,7 +38,16 @@ from src.security.crypto_service import encrypt_data
 
 # Phase 5 middleware
 from src.services.audit_middleware import AuditMiddleware
+from src.services.audit_writer import get_audit_writer
+from src.services.pnl_service import PnlService
+from src.services.tradingview_config_service import (
+    get_tradingview_config_service,
+)
+from src.services.tradingview_dedup import get_alert_deduplicator
+from src.services.tradingview_ingest import get_tradingview_queue
 from src.trading.strategy_interface import StrategyRegistry
+from src.trading.tradingview_executor import get_tradingview_executor
+from src.utils.database import connect_db, disconnect_db, get_prisma
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 ENCRYPTION_KEY = os.getenv("ENCRYPTION_KEY")
@@ -47,7 +55,7 @@ ENCRYPTION_KEY = os.getenv("ENCRYPTION_KEY")
 logger = getLogger(__name__)
 
 app = FastAPI(title="ZeaZDev-ABTPro-i18n Backend", version="1.0.1")
-prisma = Prisma()
+prisma = get_prisma()
 
 origins = {
     "http://localhost:3000",
@@ -62,7 +70,8 @@ app.add_middleware(
 )
 
 # Phase 5: Add audit middleware
-if os.getenv("ENABLE_AUDIT_LOGGING", "true").lower() == "true":
+AUDIT_LOGGING_ENABLED = os.getenv("ENABLE_AUDIT_LOGGING", "true").lower() == "true"
+if AUDIT_LOGGING_ENABLED:
     app.add_middleware(AuditMiddleware)
 
 # Initialize Prometheus instrumentation at module level (before startup)
@@ -88,18 +97,49 @@ class LoginInput(BaseModel):
 async def startup():
     """Startup handler with lazy DB connection retry"""
     try:
-        await prisma.connect()
+        await connect_db()
     except Exception as e:
         # Log error but don't crash - allow health endpoint to handle retries
         print(f"Warning: Database connection failed during startup: {e}")
 
+    if AUDIT_LOGGING_ENABLED:
+        get_audit_writer().start()
+
+    # Route queued TradingView alerts to auto-trading (clients warm up in
+    # the background)
+    executor = get_tradingview_executor()
+    get_tradingview_queue().add_route(executor.handle_alert)
+    config_service = get_tradingview_config_service()
+    config_service.add_listener(executor.sync_config)
+    try:
+        # Prefill the webhook secret cache and the executor's user configs
+        await config_service.load_all()
+    except Exception as e:
+        print(f"Warning: Failed to load TradingView webhook configs: {e}")
+    executor.start()
+    get_tradingview_queue().start()
+
 
 @app.on_event("shutdown")
 async def shutdown():
     """Shutdown handler with safe disconnect"""
     try:
-        if prisma.is_connected():
-            await prisma.disconnect()
+        # Handle queued TradingView alerts before the DB connection goes away
+        await get_tradingview_queue().stop()
+        await get_tradingview_executor().stop()
+        await get_alert_deduplicator().close()
+    except Exception as e:
+        print(f"Warning: Error draining TradingView alerts: {e}")
+
+    if AUDIT_LOGGING_ENABLED:
+        try:
+            # Flush queued audit logs before the DB connection goes away
+            await get_audit_writer().stop()
+        except Exception as e:
+            print(f"Warning: Error flushing audit logs: {e}")
+
+    try:
+        await disconnect_db()
     except Exception as e:
         print(f"Warning: Error during database disconnect: {e}")
 
@@ -109,7 +149,7 @@ async def health():
     """Health check endpoint with lazy DB connection"""
     if not prisma.is_connected():
         try:
-            await prisma.connect()
+            await connect_db()
         except Exception as e:
             logger.warning(
                 f"DB connect failed in health check: {e.__class__.__name__}",
@@ -157,9 +197,8 @@ async def list_strategies():
 
 @app.get("/dashboard/pnl")
 async def dashboard_pnl():
-    # Aggregate from TradeLog & BotRun
-    trades = await prisma.tradelog.find_many()
-    pnl = sum([t.pnl for t in trades])
+    # Read the materialized global rollup instead of scanning TradeLog
+    pnl = (await PnlService(prisma).get_global_pnl())["total_pnl"]
     open_bots = await prisma.botrun.count(where={"status": "RUNNING"})
     return {
         "total_pnl": round(pnl, 4),
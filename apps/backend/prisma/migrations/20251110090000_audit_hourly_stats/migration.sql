@@ -0,0 +1,30 @@
+-- Audit Log Hourly Rollups Migration
+-- CreateTable AuditLogHourlyStat
+CREATE TABLE "AuditLogHourlyStat" (
+    "bucket" TIMESTAMP(3) NOT NULL,
+    "dimension" TEXT NOT NULL,
+    "key" TEXT NOT NULL,
+    "count" INTEGER NOT NULL DEFAULT 0,
+
+    CONSTRAINT "AuditLogHourlyStat_pkey" PRIMARY KEY ("bucket","dimension","key")
+);
+
+-- CreateIndex
+CREATE INDEX "AuditLogHourlyStat_dimension_bucket_idx" ON "AuditLogHourlyStat"("dimension", "bucket");
+
+-- Backfill rollups from existing audit logs
+INSERT INTO "AuditLogHourlyStat" ("bucket", "dimension", "key", "count")
+SELECT date_trunc('hour', "createdAt"), 'action', "action", COUNT(*)
+FROM "AuditLog"
+GROUP BY 1, 3;
+
+INSERT INTO "AuditLogHourlyStat" ("bucket", "dimension", "key", "count")
+SELECT date_trunc('hour', "createdAt"), 'resource', "resource", COUNT(*)
+FROM "AuditLog"
+GROUP BY 1, 3;
+
+INSERT INTO "AuditLogHourlyStat" ("bucket", "dimension", "key", "count")
+SELECT date_trunc('hour', "createdAt"), 'user', "userId"::TEXT, COUNT(*)
+FROM "AuditLog"
+WHERE "userId" IS NOT NULL
+GROUP BY 1, 3;
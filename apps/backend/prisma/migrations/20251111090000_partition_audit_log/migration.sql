@@ -0,0 +1,74 @@
+-- Partition AuditLog by month Migration
+-- Audit logs move to a table range-partitioned on "createdAt" with one
+-- partition per month ("AuditLog_pYYYY_MM"). Retention drops whole
+-- partitions and date-range queries only scan the matching months.
+-- Future partitions are created by the maintain_audit_partitions task.
+
+-- RenameTable
+ALTER TABLE "AuditLog" RENAME TO "AuditLog_old";
+ALTER TABLE "AuditLog_old" RENAME CONSTRAINT "AuditLog_pkey" TO "AuditLog_old_pkey";
+ALTER SEQUENCE "AuditLog_id_seq" RENAME TO "AuditLog_old_id_seq";
+ALTER TABLE "AuditLog_old" DROP CONSTRAINT IF EXISTS "AuditLog_userId_fkey";
+DROP INDEX IF EXISTS "AuditLog_userId_idx";
+DROP INDEX IF EXISTS "AuditLog_action_idx";
+DROP INDEX IF EXISTS "AuditLog_resource_idx";
+DROP INDEX IF EXISTS "AuditLog_createdAt_idx";
+
+-- CreateTable AuditLog (partitioned, the key must be part of the primary key)
+CREATE TABLE "AuditLog" (
+    "id" SERIAL NOT NULL,
+    "userId" INTEGER,
+    "action" TEXT NOT NULL,
+    "resource" TEXT NOT NULL,
+    "method" TEXT NOT NULL,
+    "statusCode" INTEGER NOT NULL,
+    "ipAddress" TEXT,
+    "userAgent" TEXT,
+    "requestData" TEXT,
+    "metadata" TEXT,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "AuditLog_pkey" PRIMARY KEY ("id","createdAt")
+) PARTITION BY RANGE ("createdAt");
+
+-- CreateIndex (created on every partition)
+CREATE INDEX "AuditLog_userId_idx" ON "AuditLog"("userId");
+CREATE INDEX "AuditLog_action_idx" ON "AuditLog"("action");
+CREATE INDEX "AuditLog_resource_idx" ON "AuditLog"("resource");
+CREATE INDEX "AuditLog_createdAt_idx" ON "AuditLog"("createdAt");
+
+-- AddForeignKey
+ALTER TABLE "AuditLog" ADD CONSTRAINT "AuditLog_userId_fkey" FOREIGN KEY ("userId") REFERENCES "User"("id") ON DELETE SET NULL ON UPDATE CASCADE;
+
+-- CreatePartitions from the oldest existing log up to three months ahead
+DO $$
+DECLARE
+    month_start TIMESTAMP;
+    last_month TIMESTAMP := date_trunc('month', CURRENT_TIMESTAMP) + INTERVAL '3 months';
+BEGIN
+    SELECT date_trunc('month', COALESCE(MIN("createdAt"), CURRENT_TIMESTAMP))
+    INTO month_start
+    FROM "AuditLog_old";
+
+    WHILE month_start <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF "AuditLog" FOR VALUES FROM (%L) TO (%L)',
+            'AuditLog_p' || to_char(month_start, 'YYYY_MM'),
+            month_start,
+            month_start + INTERVAL '1 month'
+        );
+        month_start := month_start + INTERVAL '1 month';
+    END LOOP;
+END $$;
+
+-- Catch-all for rows outside the maintained months
+CREATE TABLE "AuditLog_default" PARTITION OF "AuditLog" DEFAULT;
+
+-- Copy existing logs and keep the id sequence moving forward
+INSERT INTO "AuditLog" ("id", "userId", "action", "resource", "method", "statusCode", "ipAddress", "userAgent", "requestData", "metadata", "createdAt")
+SELECT "id", "userId", "action", "resource", "method", "statusCode", "ipAddress", "userAgent", "requestData", "metadata", "createdAt"
+FROM "AuditLog_old";
+SELECT setval(pg_get_serial_sequence('"AuditLog"', 'id'), COALESCE((SELECT MAX("id") FROM "AuditLog"), 0) + 1, false);
+
+-- DropTable
+DROP TABLE "AuditLog_old";
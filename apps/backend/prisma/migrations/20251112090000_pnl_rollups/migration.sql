@@ -0,0 +1,27 @@
+-- PnL Rollups Migration
+-- CreateTable PnlRollup
+CREATE TABLE "PnlRollup" (
+    "scope" TEXT NOT NULL,
+    "scopeId" INTEGER NOT NULL,
+    "totalPnl" DOUBLE PRECISION NOT NULL DEFAULT 0,
+    "tradeCount" INTEGER NOT NULL DEFAULT 0,
+    "updatedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "PnlRollup_pkey" PRIMARY KEY ("scope","scopeId")
+);
+
+-- Backfill rollups from existing trades
+INSERT INTO "PnlRollup" ("scope", "scopeId", "totalPnl", "tradeCount")
+SELECT 'GLOBAL', 0, COALESCE(SUM("pnl"), 0), COUNT(*)
+FROM "TradeLog";
+
+INSERT INTO "PnlRollup" ("scope", "scopeId", "totalPnl", "tradeCount")
+SELECT 'BOT', "botRunId", SUM("pnl"), COUNT(*)
+FROM "TradeLog"
+GROUP BY "botRunId";
+
+INSERT INTO "PnlRollup" ("scope", "scopeId", "totalPnl", "tradeCount")
+SELECT 'USER', b."userId", SUM(t."pnl"), COUNT(*)
+FROM "TradeLog" t
+JOIN "BotRun" b ON b."id" = t."botRunId"
+GROUP BY b."userId";
@@ -0,0 +1,20 @@
+-- Portfolio Snapshots Migration
+-- CreateTable PortfolioSnapshot
+CREATE TABLE "PortfolioSnapshot" (
+    "id" SERIAL NOT NULL,
+    "accountId" INTEGER NOT NULL,
+    "userId" INTEGER NOT NULL,
+    "value" DOUBLE PRECISION NOT NULL,
+    "pnl" DOUBLE PRECISION NOT NULL DEFAULT 0,
+    "weights" TEXT NOT NULL,
+    "takenAt" TIMESTAMP(3) NOT NULL,
+
+    CONSTRAINT "PortfolioSnapshot_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateIndex
+CREATE INDEX "PortfolioSnapshot_accountId_takenAt_idx" ON "PortfolioSnapshot"("accountId", "takenAt");
+CREATE INDEX "PortfolioSnapshot_userId_takenAt_idx" ON "PortfolioSnapshot"("userId", "takenAt");
+
+-- AddForeignKey
+ALTER TABLE "PortfolioSnapshot" ADD CONSTRAINT "PortfolioSnapshot_accountId_fkey" FOREIGN KEY ("accountId") REFERENCES "Account"("id") ON DELETE RESTRICT ON UPDATE CASCADE;
@@ -0,0 +1,18 @@
+-- ML Feature Store Migration
+-- CreateTable MLFeature
+CREATE TABLE "MLFeature" (
+    "id" SERIAL NOT NULL,
+    "featureSet" TEXT NOT NULL,
+    "symbol" TEXT NOT NULL,
+    "timeframe" TEXT NOT NULL,
+    "timestamp" TIMESTAMP(3) NOT NULL,
+    "version" TEXT NOT NULL,
+    "values" DOUBLE PRECISION[],
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "MLFeature_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateIndex
+CREATE UNIQUE INDEX "MLFeature_featureSet_symbol_timeframe_timestamp_key" ON "MLFeature"("featureSet", "symbol", "timeframe", "timestamp");
+CREATE INDEX "MLFeature_symbol_createdAt_idx" ON "MLFeature"("symbol", "createdAt");
@@ -0,0 +1,22 @@
+-- TradingView Webhook Configs Migration
+-- CreateTable TradingViewWebhookConfig
+CREATE TABLE "TradingViewWebhookConfig" (
+    "id" SERIAL NOT NULL,
+    "userId" INTEGER NOT NULL,
+    "secretHash" TEXT NOT NULL,
+    "autoTrade" BOOLEAN NOT NULL DEFAULT false,
+    "exchange" TEXT NOT NULL DEFAULT 'binance',
+    "positionSize" DOUBLE PRECISION,
+    "riskPerTrade" DOUBLE PRECISION NOT NULL DEFAULT 1.0,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updatedAt" TIMESTAMP(3) NOT NULL,
+
+    CONSTRAINT "TradingViewWebhookConfig_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateIndex
+CREATE UNIQUE INDEX "TradingViewWebhookConfig_userId_key" ON "TradingViewWebhookConfig"("userId");
+CREATE UNIQUE INDEX "TradingViewWebhookConfig_secretHash_key" ON "TradingViewWebhookConfig"("secretHash");
+
+-- AddForeignKey
+ALTER TABLE "TradingViewWebhookConfig" ADD CONSTRAINT "TradingViewWebhookConfig_userId_fkey" FOREIGN KEY ("userId") REFERENCES "User"("id") ON DELETE RESTRICT ON UPDATE CASCADE;
@@ -0,0 +1,9 @@
+-- ML Feature Version Key Migration
+-- Rows of a new feature version are stored next to older ones instead of
+-- being skipped as duplicates
+
+-- DropIndex
+DROP INDEX "MLFeature_featureSet_symbol_timeframe_timestamp_key";
+
+-- CreateIndex
+CREATE UNIQUE INDEX "MLFeature_featureSet_symbol_timeframe_version_timestamp_key" ON "MLFeature"("featureSet", "symbol", "timeframe", "version", "timestamp");
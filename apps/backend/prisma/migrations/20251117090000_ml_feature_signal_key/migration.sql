@@ -0,0 +1,12 @@
+-- ML Feature Signal Key Migration
+-- Signals scored on the same candle (different strategies or sides) are
+-- stored as separate rows instead of collapsing into one
+
+-- AlterTable
+ALTER TABLE "MLFeature" ADD COLUMN "signalKey" TEXT NOT NULL DEFAULT '';
+
+-- DropIndex
+DROP INDEX "MLFeature_featureSet_symbol_timeframe_version_timestamp_key";
+
+-- CreateIndex (named explicitly: the default name exceeds 63 characters)
+CREATE UNIQUE INDEX "MLFeature_row_key" ON "MLFeature"("featureSet", "symbol", "timeframe", "version", "timestamp", "signalKey");
@@ -6,10 +6,12 @@
 
 import csv
 import io
+import json
 from datetime import datetime
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, Optional
 
 from fastapi import APIRouter, Query, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from src.services.audit_service import AuditService
@@ -18,6 +20,20 @@ from src.utils.exceptions import raise_bad_request, raise_not_found
 router = APIRouter()
 audit_service = AuditService()
 
+# Fields written to CSV exports (request/metadata JSON is left out)
+CSV_FIELDS = [
+    "id",
+    "userId",
+    "userEmail",
+    "action",
+    "resource",
+    "method",
+    "statusCode",
+    "ipAddress",
+    "userAgent",
+    "createdAt",
+]
+
 
 class AuditLogQuery(BaseModel):
     userId: Optional[int] = None
@@ -38,6 +54,9 @@ async def get_audit_logs(
     endDate: Optional[str] = Query(None, description="End date (ISO 8601)"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(50, ge=1, le=1000, description="Items per page"),
+    cursor: Optional[str] = Query(
+        None, description="Keyset cursor (nextCursor from a previous page)"
+    ),
 ):
     """
     Query audit logs with optional filters
@@ -49,6 +68,8 @@ async def get_audit_logs(
     - **endDate**: End of date range (ISO 8601 format)
     - **page**: Page number (default: 1)
     - **limit**: Items per page (default: 50, max: 1000)
+    - **cursor**: Continue after a previous page's nextCursor instead of using
+      page (faster for deep pages, no total count)
     """
     # Parse dates
     start_dt = None
@@ -70,15 +91,19 @@ async def get_audit_logs(
                 status_code=400, detail="Invalid endDate format. Use ISO 8601."
             )
 
-    result = await audit_service.get_logs(
-        user_id=userId,
-        action=action,
-        resource=resource,
-        start_date=start_dt,
-        end_date=end_dt,
-        page=page,
-        limit=limit,
-    )
+    try:
+        result = await audit_service.get_logs(
+            user_id=userId,
+            action=action,
+            resource=resource,
+            start_date=start_dt,
+            end_date=end_dt,
+            page=page,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise_bad_request(str(e))
 
     return result
 
@@ -126,9 +151,47 @@ async def get_audit_stats(
     return stats
 
 
+async def _stream_csv(logs: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    """Render logs as CSV, one line per chunk"""
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=CSV_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    yield output.getvalue()
+
+    async for log in logs:
+        output.seek(0)
+        output.truncate()
+        # Only write non-sensitive fields to CSV
+        writer.writerow(log)
+        yield output.getvalue()
+
+
+async def _stream_ndjson(logs: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    """Render logs as newline-delimited JSON"""
+    async for log in logs:
+        yield json.dumps(log) + "\n"
+
+
+async def _stream_json(logs: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    """Render logs as a single JSON document, written incrementally"""
+    yield f'{{"exportedAt": {json.dumps(datetime.utcnow().isoformat())}, "logs": ['
+    total = 0
+    async for log in logs:
+        yield ("," if total else "") + json.dumps(log)
+        total += 1
+    yield f'], "totalRecords": {total}}}'
+
+
+EXPORT_FORMATS = {
+    "csv": (_stream_csv, "text/csv"),
+    "ndjson": (_stream_ndjson, "application/x-ndjson"),
+    "json": (_stream_json, "application/json"),
+}
+
+
 @router.get("/export")
 async def export_audit_logs(
-    format: str = Query("csv", description="Export format (csv or json)"),
+    format: str = Query("csv", description="Export format (csv, ndjson or json)"),
     userId: Optional[int] = Query(None, description="Filter by user ID"),
     action: Optional[str] = Query(None, description="Filter by action type"),
     resource: Optional[str] = Query(None, description="Filter by resource"),
@@ -136,17 +199,20 @@ async def export_audit_logs(
     endDate: Optional[str] = Query(None, description="End date (ISO 8601)"),
 ):
     """
-    Export audit logs in CSV or JSON format
+    Export audit logs in CSV, NDJSON or JSON format
+
+    Every matching log is exported. Rows are streamed as they are read in
+    keyset-paginated batches, so large ranges don't build up in memory.
 
-    - **format**: Export format (csv or json)
+    - **format**: Export format (csv, ndjson or json)
     - **userId**: Filter by user ID
     - **action**: Filter by action type
     - **resource**: Filter by API endpoint
     - **startDate**: Start of date range
     - **endDate**: End of date range
     """
-    if format not in ["csv", "json"]:
-        raise_bad_request("Format must be 'csv' or 'json'")
+    if format not in EXPORT_FORMATS:
+        raise_bad_request("Format must be 'csv', 'ndjson' or 'json'")
 
     # Parse dates
     start_dt = None
@@ -164,55 +230,18 @@ async def export_audit_logs(
         except ValueError:
             raise_bad_request("Invalid endDate format. Use ISO 8601.")
 
-    # Get all logs (no pagination for export)
-    result = await audit_service.get_logs(
+    logs = audit_service.iter_logs(
         user_id=userId,
         action=action,
         resource=resource,
         start_date=start_dt,
         end_date=end_dt,
-        page=1,
-        limit=1000,  # Max limit for export
     )
 
-    logs = result["logs"]
-
-    if format == "json":
-        return {
-            "logs": logs,
-            "exportedAt": datetime.utcnow().isoformat(),
-            "totalRecords": len(logs),
-        }
-
-    # CSV format
-    output = io.StringIO()
-    if logs:
-        fieldnames = [
-            "id",
-            "userId",
-            "userEmail",
-            "action",
-            "resource",
-            "method",
-            "statusCode",
-            "ipAddress",
-            "userAgent",
-            "createdAt",
-        ]
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for log in logs:
-            # Only write non-sensitive fields to CSV
-            row = {k: v for k, v in log.items() if k in fieldnames}
-            writer.writerow(row)
-
-    from fastapi.responses import StreamingResponse
-
-    output.seek(0)
-    filename = f"audit_logs_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv"
+    render, media_type = EXPORT_FORMATS[format]
+    filename = f"audit_logs_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{format}"
     return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
+        render(logs),
+        media_type=media_type,
         headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
@@ -2,17 +2,41 @@
 ML API endpoints for Phase 6.
 """
 
+import asyncio
+import logging
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+import numpy as np
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 
+from src.ml.feature_store import (
+    FEATURE_SET_VOLATILITY,
+    FEATURE_STORE_ENABLED,
+    get_feature_store,
+    parse_timestamp,
+)
+from src.ml.registry import get_model_registry
+from src.ml.training import TrainingJobs
 from src.utils.dependencies import get_optional_user_id
-from src.utils.exceptions import handle_service_error, raise_bad_request
+from src.utils.exceptions import (
+    handle_service_error,
+    raise_bad_request,
+    raise_not_found,
+)
+from src.worker.tasks import optimize_strategy, train_ml_model
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/ml", tags=["ML"])
 
+# Max signals/symbols per batch request
+MAX_SCORE_BATCH_SIZE = 1000
+
+# Feature store writes for scored signals still in flight
+_feature_writes: Set[asyncio.Task] = set()
+
 
 # Request/Response Models
 class SignalScoreRequest(BaseModel):
@@ -30,6 +54,16 @@ class SignalScoreResponse(BaseModel):
     risk: str
 
 
+class BatchSignalScoreRequest(BaseModel):
+    signals: List[SignalScoreRequest]
+    marketData: Optional[Dict[str, Any]] = None
+
+
+class BatchSignalScoreResponse(BaseModel):
+    results: List[SignalScoreResponse]
+    count: int
+
+
 class VolatilityPredictRequest(BaseModel):
     symbol: str
     timeframe: str
@@ -46,6 +80,17 @@ class VolatilityPredictResponse(BaseModel):
     risk: str
 
 
+class BatchVolatilityPredictRequest(BaseModel):
+    symbols: List[str]
+    timeframe: str
+    horizon: int = 24
+
+
+class BatchVolatilityPredictResponse(BaseModel):
+    predictions: List[VolatilityPredictResponse]
+    count: int
+
+
 class TuningRequest(BaseModel):
     userId: int
     strategy: str
@@ -54,6 +99,18 @@ class TuningRequest(BaseModel):
     optimizationGoal: str = "SHARPE_RATIO"
     parameters: Dict[str, Dict[str, float]]
     maxIterations: int = 1000
+    # RL (Q-learning) or SUCCESSIVE_HALVING
+    method: str = "RL"
+    exchange: str = "binance"
+    # Candles with close/rsi; fetched from the exchange when omitted
+    historicalData: Optional[List[Dict[str, float]]] = None
+
+
+class ModelTrainingRequest(BaseModel):
+    modelType: str
+    version: str
+    trainingData: Dict[str, Any]
+    hyperparameters: Optional[Dict[str, Any]] = None
 
 
 class TuningStatusResponse(BaseModel):
@@ -65,6 +122,48 @@ class TuningStatusResponse(BaseModel):
 
 
 # Signal Quality Endpoints
+def _with_signal_time(signal: Dict[str, Any]) -> Dict[str, Any]:
+    """Signal with an ISO string timestamp parsed to a datetime."""
+    if isinstance(signal.get("timestamp"), str):
+        return {**signal, "timestamp": parse_timestamp(signal["timestamp"])}
+    return signal
+
+
+def _store_signal_features(
+    scored: List[Tuple[str, str, str, Dict[str, Any]]],
+    market_data: Optional[Dict[str, Any]] = None,
+):
+    """
+    Append scored signals' features to the feature store in the background.
+
+    scored holds (symbol, timeframe, strategy, signal); the strategy keys
+    the stored row together with the signal's time and side.
+    """
+    if not FEATURE_STORE_ENABLED:
+        return
+
+    by_key: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for symbol, timeframe, strategy, signal in scored:
+        by_key.setdefault((symbol, timeframe), []).append(
+            {"strategy": strategy, **signal}
+        )
+
+    async def write():
+        store = get_feature_store()
+        for (symbol, timeframe), signals in by_key.items():
+            try:
+                await store.append_signal_features(
+                    symbol, timeframe, signals, market_data
+                )
+            except Exception as e:
+                # Features are derived data; scoring never waits on them
+                logger.warning(f"Signal feature store update failed: {e}")
+
+    task = asyncio.create_task(write())
+    _feature_writes.add(task)
+    task.add_done_callback(_feature_writes.discard)
+
+
 @router.post("/signal/score", response_model=SignalScoreResponse)
 async def score_signal(request: SignalScoreRequest):
     """
@@ -72,13 +171,15 @@ async def score_signal(request: SignalScoreRequest):
 
     Returns quality score, confidence, and recommendation.
     """
-    from ..ml.signal_quality import SignalQualityScorer
-
     try:
-        scorer = SignalQualityScorer()
+        scorer = await get_model_registry().get("SIGNAL_QUALITY")
 
         # Score the signal
-        result = scorer.score_signal(request.signal, market_data=None)
+        signal = _with_signal_time(request.signal)
+        result = scorer.score_signal(signal, market_data=None)
+        _store_signal_features(
+            [(request.symbol, request.timeframe, request.strategy, signal)]
+        )
 
         return SignalScoreResponse(
             score=result["score"],
@@ -91,6 +192,47 @@ async def score_signal(request: SignalScoreRequest):
         handle_service_error(e)
 
 
+@router.post("/signal/score/batch", response_model=BatchSignalScoreResponse)
+async def score_signals_batch(request: BatchSignalScoreRequest):
+    """
+    Score many trading signals in one model call.
+
+    Results are returned in request order. marketData, if given, applies
+    to every signal (e.g. all candidates on the same candle close).
+    """
+    if len(request.signals) > MAX_SCORE_BATCH_SIZE:
+        raise_bad_request(f"At most {MAX_SCORE_BATCH_SIZE} signals per batch")
+
+    try:
+        scorer = await get_model_registry().get("SIGNAL_QUALITY")
+
+        signals = [_with_signal_time(item.signal) for item in request.signals]
+        results = scorer.score_signals(signals, market_data=request.marketData)
+        _store_signal_features(
+            [
+                (item.symbol, item.timeframe, item.strategy, signal)
+                for item, signal in zip(request.signals, signals)
+            ],
+            request.marketData,
+        )
+
+        return BatchSignalScoreResponse(
+            results=[
+                SignalScoreResponse(
+                    score=result["score"],
+                    confidence=result["confidence"],
+                    recommendation=result["recommendation"],
+                    factors=result["factors"],
+                    risk=result["risk"],
+                )
+                for result in results
+            ],
+            count=len(results),
+        )
+    except Exception as e:
+        handle_service_error(e)
+
+
 @router.get("/signal/history")
 async def get_signal_history(
     userId: Optional[int] = Depends(get_optional_user_id), limit: int = 50
@@ -117,6 +259,36 @@ async def get_signal_stats(
 
 
 # Volatility Prediction Endpoints
+async def _volatility_feature_rows(symbols: List[str], timeframe: str) -> np.ndarray:
+    """Latest stored feature row per symbol (mock market data if none yet)."""
+    from ..ml.volatility import FEATURE_NAMES, VolatilityFeatures
+
+    store = get_feature_store()
+    latest = await asyncio.gather(
+        *(store.latest(FEATURE_SET_VOLATILITY, symbol, timeframe) for symbol in symbols)
+    )
+
+    fallback = None
+    rows = []
+    for stored in latest:
+        if stored is not None:
+            rows.append(stored[1])
+            continue
+        if fallback is None:
+            # Mock market data for now
+            market_data = {
+                "close": [100.0] * 100,
+                "high": [101.0] * 100,
+                "low": [99.0] * 100,
+                "volume": [1000000] * 100,
+            }
+            features = VolatilityFeatures().extract(market_data)
+            fallback = np.array([features[name] for name in FEATURE_NAMES])
+        rows.append(fallback)
+
+    return np.vstack(rows)
+
+
 @router.post("/volatility/predict", response_model=VolatilityPredictResponse)
 async def predict_volatility(request: VolatilityPredictRequest):
     """
@@ -124,20 +296,11 @@ async def predict_volatility(request: VolatilityPredictRequest):
 
     Returns predicted volatility with confidence interval.
     """
-    from ..ml.volatility import VolatilityPredictor
-
     try:
-        predictor = VolatilityPredictor()
+        predictor = await get_model_registry().get("VOLATILITY")
 
-        # Mock market data for now
-        market_data = {
-            "close": [100.0] * 100,
-            "high": [101.0] * 100,
-            "low": [99.0] * 100,
-            "volume": [1000000] * 100,
-        }
-
-        result = predictor.predict_volatility(market_data, horizon=request.horizon)
+        X = await _volatility_feature_rows([request.symbol], request.timeframe)
+        result = predictor.predict_from_features(X, horizon=request.horizon)[0]
 
         return VolatilityPredictResponse(
             symbol=request.symbol,
@@ -152,6 +315,41 @@ async def predict_volatility(request: VolatilityPredictRequest):
         handle_service_error(e)
 
 
+@router.post("/volatility/predict/batch", response_model=BatchVolatilityPredictResponse)
+async def predict_volatility_batch(request: BatchVolatilityPredictRequest):
+    """
+    Predict future volatility for many symbols in one pass.
+
+    Returns predictions in request order.
+    """
+    if len(request.symbols) > MAX_SCORE_BATCH_SIZE:
+        raise_bad_request(f"At most {MAX_SCORE_BATCH_SIZE} symbols per batch")
+
+    try:
+        predictor = await get_model_registry().get("VOLATILITY")
+
+        X = await _volatility_feature_rows(request.symbols, request.timeframe)
+        results = predictor.predict_from_features(X, horizon=request.horizon)
+
+        return BatchVolatilityPredictResponse(
+            predictions=[
+                VolatilityPredictResponse(
+                    symbol=symbol,
+                    predicted=result["predicted"],
+                    confidence=result["confidence"],
+                    range=result["range"],
+                    horizon=result["horizon"],
+                    regime=result["regime"],
+                    risk=result["risk"],
+                )
+                for symbol, result in zip(request.symbols, results)
+            ],
+            count=len(results),
+        )
+    except Exception as e:
+        handle_service_error(e)
+
+
 @router.get("/volatility/history")
 async def get_volatility_history(symbol: str, days: int = 7):
     """Get volatility prediction history."""
@@ -179,45 +377,81 @@ async def get_volatility_accuracy(symbol: str, period: str = "30d"):
 
 
 # RL Tuning Endpoints
+def _job_id(job_id: str) -> int:
+    """Parse a numeric job id from the path."""
+    if not job_id.isdigit():
+        raise_not_found("Job not found")
+    return int(job_id)
+
+
 @router.post("/tune/start")
 async def start_tuning(request: TuningRequest):
-    """Start strategy parameter optimization."""
-    import uuid
+    """Queue strategy parameter optimization on a worker."""
+    try:
+        optimization = await TrainingJobs().create_optimization(
+            request.userId,
+            request.strategy,
+            request.parameters,
+            request.maxIterations,
+            request.method,
+        )
+    except Exception as e:
+        handle_service_error(e)
 
-    job_id = f"tune_{uuid.uuid4().hex[:8]}"
+    optimize_strategy.delay(
+        optimization.id,
+        request.symbol,
+        request.timeframe,
+        request.optimizationGoal,
+        request.historicalData,
+        request.exchange,
+    )
 
-    # In real implementation, would start async Celery task
     return {
-        "jobId": job_id,
-        "status": "STARTED",
-        "estimatedTime": "15-20 minutes",
-        "message": "Optimization job started successfully",
+        "jobId": str(optimization.id),
+        "status": optimization.status,
+        "totalIterations": request.maxIterations,
+        "message": "Optimization job queued",
     }
 
 
 @router.get("/tune/status/{job_id}", response_model=TuningStatusResponse)
 async def get_tuning_status(job_id: str):
     """Check status of optimization job."""
-    # Placeholder response
+    try:
+        job = await TrainingJobs().get_optimization(_job_id(job_id))
+    except ValueError:
+        raise_not_found("Job not found")
+
     return TuningStatusResponse(
-        jobId=job_id,
-        status="RUNNING",
-        progress=0.65,
-        currentIteration=650,
-        totalIterations=1000,
+        jobId=job["jobId"],
+        status=job["status"],
+        progress=job["progress"],
+        currentIteration=job["currentIteration"],
+        totalIterations=job["totalIterations"],
     )
 
 
 @router.get("/tune/results/{job_id}")
 async def get_tuning_results(job_id: str):
     """Get optimization results."""
-    # Placeholder response
+    try:
+        job = await TrainingJobs().get_optimization(_job_id(job_id))
+    except ValueError:
+        raise_not_found("Job not found")
+
+    performance = job["performance"]
     return {
-        "jobId": job_id,
-        "status": "COMPLETED",
-        "originalParams": {},
-        "optimizedParams": {},
-        "performance": {"before": {}, "after": {}, "improvement": {}},
+        "jobId": job["jobId"],
+        "status": job["status"],
+        "originalParams": job["originalParams"],
+        "optimizedParams": job["optimizedParams"],
+        "performance": {
+            "before": performance.get("before", {}),
+            "after": performance.get("after", {}),
+            "improvement": performance.get("improvement", {}),
+        },
+        "error": performance.get("error"),
     }
 
 
@@ -238,34 +472,53 @@ async def apply_optimized_params(jobId: str, userId: int, strategy: str, confirm
 @router.get("/models/list")
 async def list_models():
     """List available ML models."""
-    return {
-        "models": [
-            {
-                "id": "signal_quality_v1",
-                "type": "SIGNAL_QUALITY",
-                "version": "1.0.0",
-                "status": "ACTIVE",
-                "accuracy": 0.78,
-                "trainedAt": "2025-11-09T00:00:00Z",
-            }
-        ]
-    }
+    try:
+        return {"models": await get_model_registry().list_models()}
+    except Exception as e:
+        handle_service_error(e)
+
+
+@router.post("/models/promote")
+async def promote_model(modelType: str, version: str):
+    """Promote a trained model version; serving processes swap it in."""
+    try:
+        return await get_model_registry().promote(modelType, version)
+    except Exception as e:
+        handle_service_error(e)
 
 
 @router.post("/models/train")
-async def train_model(modelType: str, version: str, trainingData: Dict[str, Any]):
-    """Trigger model training."""
-    import uuid
+async def train_model(request: ModelTrainingRequest):
+    """Queue model training on a worker; promote the version when done."""
+    try:
+        training = await TrainingJobs().create_model_training(
+            request.modelType,
+            request.version,
+            request.trainingData,
+            request.hyperparameters,
+        )
+    except Exception as e:
+        handle_service_error(e)
 
-    training_job_id = f"train_{uuid.uuid4().hex[:8]}"
+    train_ml_model.delay(training.id)
 
     return {
-        "trainingJobId": training_job_id,
-        "status": "STARTED",
-        "estimatedTime": "30-45 minutes",
+        "trainingJobId": training.id,
+        "modelType": training.modelType,
+        "version": training.modelVersion,
+        "status": training.status,
     }
 
 
+@router.get("/models/train/{training_id}")
+async def get_training_status(training_id: int):
+    """Check status and progress of a model training run."""
+    try:
+        return await TrainingJobs().get_model_training(training_id)
+    except ValueError:
+        raise_not_found("Training run not found")
+
+
 @router.get("/models/performance")
 async def get_model_performance(modelId: str):
     """Get model performance metrics."""
@@ -4,14 +4,15 @@
 // Author: ZeaZDev Meta-Intelligence (Generated) //
 // --- DO NOT EDIT HEADER --- //"""
 
+from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
 
 from src.services.portfolio_service import PortfolioService
 from src.utils.dependencies import get_current_user_id
-from src.utils.exceptions import handle_service_error
+from src.utils.exceptions import handle_service_error, raise_bad_request
 
 router = APIRouter()
 portfolio_service = PortfolioService()
@@ -33,6 +34,38 @@ async def get_portfolio_summary(user_id: int = Depends(get_current_user_id)):
         handle_service_error(e)
 
 
+@router.get("/history")
+async def get_portfolio_history(
+    account_id: Optional[int] = Query(None, description="Only this account"),
+    startDate: Optional[str] = Query(None, description="Start date (ISO 8601)"),
+    endDate: Optional[str] = Query(None, description="End date (ISO 8601)"),
+    user_id: int = Depends(get_current_user_id),
+):
+    """Get precomputed portfolio value points from scheduled snapshots"""
+    start_dt = None
+    end_dt = None
+
+    if startDate:
+        try:
+            start_dt = datetime.fromisoformat(startDate.replace("Z", "+00:00"))
+        except ValueError:
+            raise_bad_request("Invalid startDate format. Use ISO 8601.")
+
+    if endDate:
+        try:
+            end_dt = datetime.fromisoformat(endDate.replace("Z", "+00:00"))
+        except ValueError:
+            raise_bad_request("Invalid endDate format. Use ISO 8601.")
+
+    try:
+        points = await portfolio_service.get_portfolio_history(
+            user_id, account_id=account_id, start_date=start_dt, end_date=end_dt
+        )
+        return {"points": points, "count": len(points)}
+    except Exception as e:
+        handle_service_error(e)
+
+
 @router.get("/accounts")
 async def list_accounts(user_id: int = Depends(get_current_user_id)):
     """List all accounts"""
@@ -70,6 +103,22 @@ async def delete_account(account_id: int, user_id: int = Depends(get_current_use
         handle_service_error(e)
 
 
+@router.post("/accounts/sync")
+async def sync_all_accounts(user_id: int = Depends(get_current_user_id)):
+    """Sync positions for all of the user's enabled accounts"""
+    try:
+        results = await portfolio_service.sync_accounts(user_id=user_id)
+        return {
+            "accounts": [
+                {"account_id": account_id, "positions": positions}
+                for account_id, positions in results.items()
+            ],
+            "count": len(results),
+        }
+    except Exception as e:
+        handle_service_error(e)
+
+
 @router.post("/accounts/{account_id}/sync")
 async def sync_account_positions(account_id: int):
     """Sync positions from exchange"""
@@ -4,28 +4,35 @@
 // Author: ZeaZDev Meta-Intelligence (Generated) //
 // --- DO NOT EDIT HEADER --- //"""
 
+import hmac
 import os
 from datetime import datetime
 from logging import getLogger
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from fastapi import APIRouter, Depends, Header, HTTPException
 from prisma import Prisma
 from pydantic import BaseModel, Field
 
+from src.services.tradingview_config_service import get_tradingview_config_service
+from src.services.tradingview_dedup import get_alert_deduplicator
+from src.services.tradingview_ingest import get_tradingview_queue
+from src.utils.database import get_db
+from src.utils.dependencies import get_current_user_id
+from src.utils.exceptions import handle_service_error, raise_not_found
+
 logger = getLogger(__name__)
 
 router = APIRouter()
 
-# Get Prisma instance (should be injected from main app)
-prisma = Prisma()
-
 
 class TradingViewAlert(BaseModel):
     """TradingView webhook alert payload"""
 
     ticker: str = Field(..., description="Trading symbol (e.g., BTCUSDT)")
-    exchange: str = Field(default="binance", description="Exchange name")
+    exchange: Optional[str] = Field(
+        None, description="Exchange name (defaults to the configured exchange)"
+    )
     action: str = Field(..., description="BUY, SELL, or CLOSE")
     price: Optional[float] = Field(None, description="Alert trigger price")
     strategy: Optional[str] = Field(None, description="Strategy name from TradingView")
@@ -43,9 +50,11 @@ class TradingViewAlert(BaseModel):
 class TradingViewWebhookConfig(BaseModel):
     """Configuration for TradingView webhook"""
 
-    user_id: str
-    webhook_secret: str
+    webhook_secret: Optional[str] = Field(
+        None, description="Webhook secret (generated for a new config if omitted)"
+    )
     auto_trade: bool = Field(default=False, description="Automatically execute trades")
+    exchange: str = Field(default="binance", description="Exchange to trade on")
     position_size: Optional[float] = Field(
         None, description="Position size in base currency"
     )
@@ -54,17 +63,22 @@ class TradingViewWebhookConfig(BaseModel):
     )
 
 
-def verify_webhook_secret(
+async def verify_webhook_secret(
     x_webhook_secret: Optional[str] = Header(None),
-) -> str:
+) -> Optional[Dict[str, Any]]:
     """
     Verify TradingView webhook secret from header.
 
+    Secrets are matched against the per-user webhook configs (cached by
+    secret hash), then against the TRADINGVIEW_WEBHOOK_SECRET env var for
+    the single-account setup.
+
     Args:
         x_webhook_secret: Secret token from TradingView webhook header
 
     Returns:
-        Validated secret
+        Webhook config of the user the secret belongs to (only user_id
+        for the env var secret), or None when no secret is configured
 
     Raises:
         HTTPException: If secret is missing or invalid
@@ -75,26 +89,40 @@ def verify_webhook_secret(
             detail="Missing webhook secret. Configure X-Webhook-Secret header in TradingView.",
         )
 
-    # In production, validate against stored webhook configs
+    try:
+        config = await get_tradingview_config_service().authenticate(x_webhook_secret)
+    except Exception as e:
+        # Fall back to the env var secret if configs can't be loaded
+        logger.error(f"Webhook config lookup failed: {e}")
+        config = None
+    if config is not None:
+        return config
+
     expected_secret = os.getenv("TRADINGVIEW_WEBHOOK_SECRET")
-    if expected_secret and x_webhook_secret != expected_secret:
+    if not expected_secret:
+        # No secret configured: alerts are recorded but never traded
+        return None
+    if not hmac.compare_digest(x_webhook_secret.encode(), expected_secret.encode()):
         logger.warning("Invalid webhook secret received")
         raise HTTPException(status_code=403, detail="Invalid webhook secret")
 
-    return x_webhook_secret
+    # Single-account secret
+    user_id = os.getenv("TRADINGVIEW_USER_ID")
+    return {"user_id": int(user_id) if user_id else None}
 
 
-@router.post("/webhook")
+@router.post("/webhook", status_code=202)
 async def tradingview_webhook(
-    alert: TradingViewAlert, webhook_secret: str = Depends(verify_webhook_secret)
+    alert: TradingViewAlert,
+    webhook_config: Optional[Dict[str, Any]] = Depends(verify_webhook_secret),
 ):
     """
     Receive TradingView webhook alerts.
 
-    This endpoint receives alerts from TradingView and can:
-    1. Log the alert for audit purposes
-    2. Trigger automated trading (if configured)
-    3. Send notifications via Telegram
+    The alert is validated, de-duplicated and queued, and the endpoint
+    returns 202 right away. A background consumer pool then:
+    1. Routes the alert to trading (if configured)
+    2. Stores the alert in batches for audit purposes
 
     To configure in TradingView:
     1. Create an alert on your chart
@@ -107,73 +135,64 @@ async def tradingview_webhook(
 
     Args:
         alert: TradingView alert payload
-        webhook_secret: Validated webhook secret
+        webhook_config: Config of the user the webhook secret belongs to
 
     Returns:
-        Success message with alert ID
+        Acceptance message
     """
-    try:
-        # Ensure Prisma is connected
-        if not prisma.is_connected():
-            await prisma.connect()
-
-        # Normalize action to uppercase
-        action = alert.action.upper()
-        if action not in ["BUY", "SELL", "CLOSE", "HOLD"]:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid action: {action}. Must be BUY, SELL, CLOSE, or HOLD",
-            )
-
-        # Store alert in database for audit trail
-        alert_record = await prisma.tradingviewalert.create(
-            data={
-                "ticker": alert.ticker,
-                "exchange": alert.exchange,
-                "action": action,
-                "price": alert.price,
-                "strategy": alert.strategy or "TRADINGVIEW_ALERT",
-                "interval": alert.interval,
-                "message": alert.message,
-                "received_at": datetime.utcnow(),
-                "raw_payload": alert.dict(),
-            }
+    # Normalize action to uppercase
+    action = alert.action.upper()
+    if action not in ["BUY", "SELL", "CLOSE", "HOLD"]:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid action: {action}. Must be BUY, SELL, CLOSE, or HOLD",
         )
 
+    received_at = datetime.utcnow()
+    payload = alert.dict()
+    alert_data = {**payload, "action": action}
+    # Only an authenticated secret decides whose account may trade the alert
+    alert_data["user_id"] = webhook_config["user_id"] if webhook_config else None
+
+    # Drop retries and duplicate alerts before anything is queued or stored
+    deduplicator = get_alert_deduplicator()
+    dedup_key = await deduplicator.claim(alert_data)
+    if dedup_key is None:
         logger.info(
-            f"TradingView alert received: {alert.ticker} {action} @ {alert.price}",
-            extra={
-                "component": "tradingview",
-                "alert_id": alert_record.id,
-                "ticker": alert.ticker,
-                "action": action,
-            },
+            f"Duplicate TradingView alert dropped: {alert.ticker} {action}",
+            extra={"component": "tradingview", "ticker": alert.ticker},
         )
-
-        # TODO: Implement auto-trading logic here
-        # Check if user has auto_trade enabled
-        # Execute trade via CCXT if configured
-
         return {
-            "status": "success",
-            "alert_id": alert_record.id,
-            "message": f"Alert received: {action} {alert.ticker}",
-            "timestamp": datetime.utcnow().isoformat(),
+            "status": "duplicate",
+            "message": f"Duplicate alert ignored: {action} {alert.ticker}",
+            "timestamp": received_at.isoformat(),
         }
 
-    except Exception as e:
-        logger.error(
-            f"Error processing TradingView alert: {str(e)}",
-            extra={"component": "tradingview", "error": str(e)},
-        )
-        raise HTTPException(
-            status_code=500, detail=f"Failed to process alert: {str(e)}"
+    queued = get_tradingview_queue().enqueue(
+        {**alert_data, "received_at": received_at, "raw_payload": payload}
+    )
+    if not queued:
+        # Let TradingView's retry through once there is room
+        await deduplicator.release(dedup_key)
+        logger.warning(
+            f"TradingView alert queue full, rejected {alert.ticker} {action}",
+            extra={"component": "tradingview", "ticker": alert.ticker},
         )
+        raise HTTPException(status_code=503, detail="Alert queue is full, please retry")
+
+    return {
+        "status": "accepted",
+        "message": f"Alert received: {action} {alert.ticker}",
+        "timestamp": received_at.isoformat(),
+    }
 
 
 @router.get("/alerts")
 async def list_tradingview_alerts(
-    limit: int = 50, ticker: Optional[str] = None, action: Optional[str] = None
+    limit: int = 50,
+    ticker: Optional[str] = None,
+    action: Optional[str] = None,
+    prisma: Prisma = Depends(get_db),
 ):
     """
     List recent TradingView alerts.
@@ -187,9 +206,6 @@ async def list_tradingview_alerts(
         List of TradingView alerts
     """
     try:
-        if not prisma.is_connected():
-            await prisma.connect()
-
         where_clause = {}
         if ticker:
             where_clause["ticker"] = ticker
@@ -197,7 +213,7 @@ async def list_tradingview_alerts(
             where_clause["action"] = action.upper()
 
         alerts = await prisma.tradingviewalert.find_many(
-            where=where_clause, order={"received_at": "desc"}, take=limit
+            where=where_clause, order={"receivedAt": "desc"}, take=limit
         )
 
         return {
@@ -211,8 +227,9 @@ async def list_tradingview_alerts(
                     "strategy": alert.strategy,
                     "interval": alert.interval,
                     "message": alert.message,
+                    "processed": alert.processed,
                     "received_at": (
-                        alert.received_at.isoformat() if alert.received_at else None
+                        alert.receivedAt.isoformat() if alert.receivedAt else None
                     ),
                 }
                 for alert in alerts
@@ -225,6 +242,55 @@ async def list_tradingview_alerts(
         raise HTTPException(status_code=500, detail=f"Failed to fetch alerts: {str(e)}")
 
 
+@router.get("/webhook-config")
+async def get_webhook_user_config(user_id: int = Depends(get_current_user_id)):
+    """Get the current user's webhook config (the secret is never returned)"""
+    try:
+        config = await get_tradingview_config_service().get_config(user_id)
+    except Exception as e:
+        handle_service_error(e)
+    if config is None:
+        raise_not_found("No TradingView webhook config")
+    return config
+
+
+@router.put("/webhook-config")
+async def save_webhook_user_config(
+    request: TradingViewWebhookConfig, user_id: int = Depends(get_current_user_id)
+):
+    """
+    Create or update the current user's webhook config.
+
+    The generated secret is returned once, when a new config is created
+    without one; set it as the X-Webhook-Secret header in TradingView.
+    """
+    try:
+        return await get_tradingview_config_service().save_config(
+            user_id=user_id,
+            webhook_secret=request.webhook_secret,
+            auto_trade=request.auto_trade,
+            exchange=request.exchange,
+            position_size=request.position_size,
+            risk_per_trade=(
+                request.risk_per_trade if request.risk_per_trade is not None else 1.0
+            ),
+        )
+    except Exception as e:
+        handle_service_error(e)
+
+
+@router.delete("/webhook-config")
+async def delete_webhook_user_config(user_id: int = Depends(get_current_user_id)):
+    """Delete the current user's webhook config"""
+    try:
+        deleted = await get_tradingview_config_service().delete_config(user_id)
+    except Exception as e:
+        handle_service_error(e)
+    if not deleted:
+        raise_not_found("No TradingView webhook config")
+    return {"status": "deleted"}
+
+
 @router.get("/config")
 async def get_webhook_config():
     """
@@ -241,7 +307,8 @@ async def get_webhook_config():
         "setup_instructions": {
             "step_1": "Create an alert in TradingView on your desired chart/indicator",
             "step_2": f"Set Webhook URL to: {webhook_url}",
-            "step_3": "Add custom header: X-Webhook-Secret: your-secret-key",
+            "step_3": "Add custom header: X-Webhook-Secret: your webhook secret "
+            "(from PUT /tradingview/webhook-config)",
             "step_4": "Configure alert message in JSON format",
             "example_message": {
                 "ticker": "{{ticker}}",
@@ -12,14 +12,16 @@ from google.auth.transport import requests
 from google.oauth2 import id_token
 from prisma import Prisma
 
+from src.utils.database import get_prisma
+
 
 class OAuthService:
     """OAuth service for managing authentication flows"""
 
-    def __init__(self):
+    def __init__(self, prisma: Optional[Prisma] = None):
         self.google_client_id = os.getenv("GOOGLE_CLIENT_ID")
         self.google_client_secret = os.getenv("GOOGLE_CLIENT_SECRET")
-        self.prisma = Prisma()
+        self.prisma = prisma or get_prisma()
 
     async def verify_google_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Verify Google ID token and return user info"""
@@ -45,8 +47,6 @@ class OAuthService:
         self, google_id: str, email: str, profile_picture: Optional[str] = None
     ):
         """Get existing user or create new user from OAuth data"""
-        await self.prisma.connect()
-
         # Try to find user by Google ID
         user = await self.prisma.user.find_first(where={"googleId": google_id})
 
@@ -101,8 +101,6 @@ class OAuthService:
                         "dailySummary": True,
                     }
                 )
-
-        await self.prisma.disconnect()
         return user
 
     def generate_session_token(self) -> str:
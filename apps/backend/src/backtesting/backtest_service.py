@@ -12,14 +12,16 @@ from typing import Any, Dict, List, Optional
 import numpy as np
 from prisma import Prisma
 
+from src.utils.database import get_prisma
+
 logger = logging.getLogger(__name__)
 
 
 class BacktestService:
     """Service for running backtests and paper trading sessions"""
 
-    def __init__(self):
-        self.prisma = Prisma()
+    def __init__(self, prisma: Optional[Prisma] = None):
+        self.prisma = prisma or get_prisma()
 
     async def create_backtest(
         self,
@@ -33,38 +35,31 @@ class BacktestService:
         parameters: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """Create a new backtest run"""
-        await self.prisma.connect()
-
-        try:
-            backtest = await self.prisma.backtestrun.create(
-                data={
-                    "userId": user_id,
-                    "strategyName": strategy_name,
-                    "symbol": symbol,
-                    "timeframe": timeframe,
-                    "startDate": start_date,
-                    "endDate": end_date,
-                    "initialCapital": initial_capital,
-                    "status": "PENDING",
-                    "results": json.dumps({"parameters": parameters or {}}),
-                }
-            )
-
-            return {
-                "backtest_id": backtest.id,
-                "status": backtest.status,
-                "created_at": backtest.createdAt.isoformat(),
+        backtest = await self.prisma.backtestrun.create(
+            data={
+                "userId": user_id,
+                "strategyName": strategy_name,
+                "symbol": symbol,
+                "timeframe": timeframe,
+                "startDate": start_date,
+                "endDate": end_date,
+                "initialCapital": initial_capital,
+                "status": "PENDING",
+                "results": json.dumps({"parameters": parameters or {}}),
             }
-        finally:
-            await self.prisma.disconnect()
+        )
+
+        return {
+            "backtest_id": backtest.id,
+            "status": backtest.status,
+            "created_at": backtest.createdAt.isoformat(),
+        }
 
     async def run_backtest(self, backtest_id: int) -> Dict[str, Any]:
         """
         Execute a backtest (simplified version)
         In production, this would run in a Celery task
         """
-        await self.prisma.connect()
-
         try:
             # Get backtest configuration
             backtest = await self.prisma.backtestrun.find_first(
@@ -113,8 +108,6 @@ class BacktestService:
                 data={"status": "FAILED", "results": json.dumps({"error": str(e)})},
             )
             raise
-        finally:
-            await self.prisma.disconnect()
 
     def _generate_mock_backtest_results(
         self, initial_capital: float, symbol: str
@@ -164,78 +157,61 @@ class BacktestService:
 
     async def get_backtest_results(self, backtest_id: int) -> Dict[str, Any]:
         """Get backtest results"""
-        await self.prisma.connect()
-
-        try:
-            backtest = await self.prisma.backtestrun.find_first(
-                where={"id": backtest_id}
-            )
+        backtest = await self.prisma.backtestrun.find_first(where={"id": backtest_id})
 
-            if not backtest:
-                raise ValueError(f"Backtest {backtest_id} not found")
+        if not backtest:
+            raise ValueError(f"Backtest {backtest_id} not found")
 
-            results = json.loads(backtest.results) if backtest.results else {}
+        results = json.loads(backtest.results) if backtest.results else {}
 
-            return {
-                "backtest_id": backtest.id,
-                "strategy_name": backtest.strategyName,
-                "symbol": backtest.symbol,
-                "timeframe": backtest.timeframe,
-                "start_date": backtest.startDate.isoformat(),
-                "end_date": backtest.endDate.isoformat(),
-                "status": backtest.status,
-                "created_at": backtest.createdAt.isoformat(),
-                "completed_at": (
-                    backtest.completedAt.isoformat() if backtest.completedAt else None
-                ),
-                "results": results,
-            }
-        finally:
-            await self.prisma.disconnect()
+        return {
+            "backtest_id": backtest.id,
+            "strategy_name": backtest.strategyName,
+            "symbol": backtest.symbol,
+            "timeframe": backtest.timeframe,
+            "start_date": backtest.startDate.isoformat(),
+            "end_date": backtest.endDate.isoformat(),
+            "status": backtest.status,
+            "created_at": backtest.createdAt.isoformat(),
+            "completed_at": (
+                backtest.completedAt.isoformat() if backtest.completedAt else None
+            ),
+            "results": results,
+        }
 
     async def list_user_backtests(
         self, user_id: int, limit: int = 50
     ) -> List[Dict[str, Any]]:
         """List all backtests for a user"""
-        await self.prisma.connect()
-
-        try:
-            backtests = await self.prisma.backtestrun.find_many(
-                where={"userId": user_id}, order={"createdAt": "desc"}, take=limit
-            )
-
-            return [
-                {
-                    "backtest_id": bt.id,
-                    "strategy_name": bt.strategyName,
-                    "symbol": bt.symbol,
-                    "timeframe": bt.timeframe,
-                    "status": bt.status,
-                    "created_at": bt.createdAt.isoformat(),
-                }
-                for bt in backtests
-            ]
-        finally:
-            await self.prisma.disconnect()
+        backtests = await self.prisma.backtestrun.find_many(
+            where={"userId": user_id}, order={"createdAt": "desc"}, take=limit
+        )
+
+        return [
+            {
+                "backtest_id": bt.id,
+                "strategy_name": bt.strategyName,
+                "symbol": bt.symbol,
+                "timeframe": bt.timeframe,
+                "status": bt.status,
+                "created_at": bt.createdAt.isoformat(),
+            }
+            for bt in backtests
+        ]
 
     async def delete_backtest(self, backtest_id: int, user_id: int) -> Dict[str, Any]:
         """Delete a backtest"""
-        await self.prisma.connect()
-
-        try:
-            # Verify backtest belongs to user
-            backtest = await self.prisma.backtestrun.find_first(
-                where={"id": backtest_id, "userId": user_id}
-            )
+        # Verify backtest belongs to user
+        backtest = await self.prisma.backtestrun.find_first(
+            where={"id": backtest_id, "userId": user_id}
+        )
 
-            if not backtest:
-                raise ValueError("Backtest not found or does not belong to user")
+        if not backtest:
+            raise ValueError("Backtest not found or does not belong to user")
 
-            await self.prisma.backtestrun.delete(where={"id": backtest_id})
+        await self.prisma.backtestrun.delete(where={"id": backtest_id})
 
-            return {"success": True, "backtest_id": backtest_id}
-        finally:
-            await self.prisma.disconnect()
+        return {"success": True, "backtest_id": backtest_id}
 
     # Paper Trading Methods
 
@@ -249,137 +225,117 @@ class BacktestService:
         parameters: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """Start a paper trading session"""
-        await self.prisma.connect()
-
-        try:
-            session = await self.prisma.papertradingsession.create(
-                data={
-                    "userId": user_id,
-                    "strategyName": strategy_name,
-                    "symbol": symbol,
-                    "timeframe": timeframe,
-                    "virtualBalance": virtual_balance,
-                    "currentBalance": virtual_balance,
-                    "status": "ACTIVE",
-                }
-            )
-
-            return {
-                "session_id": session.id,
-                "strategy_name": strategy_name,
+        session = await self.prisma.papertradingsession.create(
+            data={
+                "userId": user_id,
+                "strategyName": strategy_name,
                 "symbol": symbol,
-                "virtual_balance": virtual_balance,
-                "status": session.status,
-                "started_at": session.startedAt.isoformat(),
+                "timeframe": timeframe,
+                "virtualBalance": virtual_balance,
+                "currentBalance": virtual_balance,
+                "status": "ACTIVE",
             }
-        finally:
-            await self.prisma.disconnect()
+        )
+
+        return {
+            "session_id": session.id,
+            "strategy_name": strategy_name,
+            "symbol": symbol,
+            "virtual_balance": virtual_balance,
+            "status": session.status,
+            "started_at": session.startedAt.isoformat(),
+        }
 
     async def stop_paper_trading(self, session_id: int, user_id: int) -> Dict[str, Any]:
         """Stop a paper trading session"""
-        await self.prisma.connect()
-
-        try:
-            # Verify session belongs to user
-            session = await self.prisma.papertradingsession.find_first(
-                where={"id": session_id, "userId": user_id}
+        # Verify session belongs to user
+        session = await self.prisma.papertradingsession.find_first(
+            where={"id": session_id, "userId": user_id}
+        )
+
+        if not session:
+            raise ValueError(
+                "Paper trading session not found or does not belong to user"
             )
 
-            if not session:
-                raise ValueError(
-                    "Paper trading session not found or does not belong to user"
-                )
-
-            # Update session
-            updated_session = await self.prisma.papertradingsession.update(
-                where={"id": session_id},
-                data={"status": "STOPPED", "stoppedAt": datetime.utcnow()},
-            )
+        # Update session
+        updated_session = await self.prisma.papertradingsession.update(
+            where={"id": session_id},
+            data={"status": "STOPPED", "stoppedAt": datetime.utcnow()},
+        )
 
-            # Calculate final stats
-            pnl = (
-                updated_session.currentBalance or updated_session.virtualBalance
-            ) - updated_session.virtualBalance
-            return_pct = (pnl / updated_session.virtualBalance) * 100
+        # Calculate final stats
+        pnl = (
+            updated_session.currentBalance or updated_session.virtualBalance
+        ) - updated_session.virtualBalance
+        return_pct = (pnl / updated_session.virtualBalance) * 100
 
-            return {
-                "session_id": session_id,
-                "status": "STOPPED",
-                "initial_balance": updated_session.virtualBalance,
-                "final_balance": updated_session.currentBalance
-                or updated_session.virtualBalance,
-                "pnl": round(pnl, 2),
-                "return_pct": round(return_pct, 2),
-                "stopped_at": (
-                    updated_session.stoppedAt.isoformat()
-                    if updated_session.stoppedAt
-                    else None
-                ),
-            }
-        finally:
-            await self.prisma.disconnect()
+        return {
+            "session_id": session_id,
+            "status": "STOPPED",
+            "initial_balance": updated_session.virtualBalance,
+            "final_balance": updated_session.currentBalance
+            or updated_session.virtualBalance,
+            "pnl": round(pnl, 2),
+            "return_pct": round(return_pct, 2),
+            "stopped_at": (
+                updated_session.stoppedAt.isoformat()
+                if updated_session.stoppedAt
+                else None
+            ),
+        }
 
     async def get_paper_trading_status(self, session_id: int) -> Dict[str, Any]:
         """Get status of a paper trading session"""
-        await self.prisma.connect()
-
-        try:
-            session = await self.prisma.papertradingsession.find_first(
-                where={"id": session_id}
-            )
+        session = await self.prisma.papertradingsession.find_first(
+            where={"id": session_id}
+        )
 
-            if not session:
-                raise ValueError(f"Paper trading session {session_id} not found")
+        if not session:
+            raise ValueError(f"Paper trading session {session_id} not found")
 
-            pnl = (
-                session.currentBalance or session.virtualBalance
-            ) - session.virtualBalance
-            return_pct = (pnl / session.virtualBalance) * 100
+        pnl = (
+            session.currentBalance or session.virtualBalance
+        ) - session.virtualBalance
+        return_pct = (pnl / session.virtualBalance) * 100
 
-            return {
-                "session_id": session.id,
-                "strategy_name": session.strategyName,
-                "symbol": session.symbol,
-                "timeframe": session.timeframe,
-                "status": session.status,
-                "initial_balance": session.virtualBalance,
-                "current_balance": session.currentBalance or session.virtualBalance,
-                "pnl": round(pnl, 2),
-                "return_pct": round(return_pct, 2),
-                "started_at": session.startedAt.isoformat(),
-                "stopped_at": (
-                    session.stoppedAt.isoformat() if session.stoppedAt else None
-                ),
-            }
-        finally:
-            await self.prisma.disconnect()
+        return {
+            "session_id": session.id,
+            "strategy_name": session.strategyName,
+            "symbol": session.symbol,
+            "timeframe": session.timeframe,
+            "status": session.status,
+            "initial_balance": session.virtualBalance,
+            "current_balance": session.currentBalance or session.virtualBalance,
+            "pnl": round(pnl, 2),
+            "return_pct": round(return_pct, 2),
+            "started_at": session.startedAt.isoformat(),
+            "stopped_at": (
+                session.stoppedAt.isoformat() if session.stoppedAt else None
+            ),
+        }
 
     async def list_paper_trading_sessions(
         self, user_id: int, active_only: bool = False
     ) -> List[Dict[str, Any]]:
         """List paper trading sessions for a user"""
-        await self.prisma.connect()
-
-        try:
-            where_clause = {"userId": user_id}
-            if active_only:
-                where_clause["status"] = "ACTIVE"
-
-            sessions = await self.prisma.papertradingsession.find_many(
-                where=where_clause, order={"startedAt": "desc"}
-            )
-
-            return [
-                {
-                    "session_id": s.id,
-                    "strategy_name": s.strategyName,
-                    "symbol": s.symbol,
-                    "status": s.status,
-                    "virtual_balance": s.virtualBalance,
-                    "current_balance": s.currentBalance or s.virtualBalance,
-                    "started_at": s.startedAt.isoformat(),
-                }
-                for s in sessions
-            ]
-        finally:
-            await self.prisma.disconnect()
+        where_clause = {"userId": user_id}
+        if active_only:
+            where_clause["status"] = "ACTIVE"
+
+        sessions = await self.prisma.papertradingsession.find_many(
+            where=where_clause, order={"startedAt": "desc"}
+        )
+
+        return [
+            {
+                "session_id": s.id,
+                "strategy_name": s.strategyName,
+                "symbol": s.symbol,
+                "status": s.status,
+                "virtual_balance": s.virtualBalance,
+                "current_balance": s.currentBalance or s.virtualBalance,
+                "started_at": s.startedAt.isoformat(),
+            }
+            for s in sessions
+        ]
@@ -0,0 +1,228 @@
+"""// ZeaZDev [Vectorized Backtester] //
+// Project: Auto Bot Trader i18n //
+// Version: 1.0.0 (Phase 6) //
+// Author: ZeaZDev Meta-Intelligence (Generated) //
+// --- DO NOT EDIT HEADER --- //"""
+
+import hashlib
+import inspect
+import json
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+import src.trading.strategies  # noqa: F401  (registers the strategies)
+from src.trading.strategy_interface import Strategy, StrategyRegistry
+
+# Tuning parameter names that map onto strategy constructor arguments
+PARAM_ALIASES = {
+    "oversoldThreshold": "oversold",
+    "overboughtThreshold": "overbought",
+}
+
+# Cached simulations per backtester
+MAX_CACHED_RUNS = 4096
+
+
+def params_hash(strategy_name: str, kwargs: Dict[str, Any]) -> str:
+    """Stable hash of a strategy name and its effective constructor arguments"""
+    payload = json.dumps([strategy_name, kwargs], sort_keys=True, default=float)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _constructor(strategy_name: str) -> Tuple[type, Dict[str, inspect.Parameter]]:
+    """Class and constructor parameters of a registered strategy"""
+    strategy_class = type(StrategyRegistry.create(strategy_name))
+    parameters = dict(inspect.signature(strategy_class.__init__).parameters)
+    parameters.pop("self", None)
+    return strategy_class, parameters
+
+
+def strategy_kwargs(strategy_name: str, params: Dict[str, float]) -> Dict[str, Any]:
+    """
+    Constructor arguments a strategy is built with for tuning parameters
+
+    Parameters are matched to constructor arguments by name (or alias);
+    integer arguments are rounded. Unknown parameters are ignored, so
+    parameter sets that build the same strategy give the same kwargs.
+    """
+    _, parameters = _constructor(strategy_name)
+
+    kwargs: Dict[str, Any] = {}
+    for name, value in params.items():
+        arg = parameters.get(PARAM_ALIASES.get(name, name))
+        if arg is None:
+            continue
+        if isinstance(arg.default, int) and not isinstance(arg.default, bool):
+            value = max(1, int(round(value)))
+        kwargs[arg.name] = value
+    return kwargs
+
+
+def effective_params(strategy_name: str, params: Dict[str, float]) -> Dict[str, Any]:
+    """Tuning parameters as the strategy uses them (integer arguments rounded)"""
+    kwargs = strategy_kwargs(strategy_name, params)
+    return {
+        name: kwargs.get(PARAM_ALIASES.get(name, name), value)
+        for name, value in params.items()
+    }
+
+
+def build_strategy(strategy_name: str, params: Dict[str, float]) -> Strategy:
+    """Create a registered strategy with tuning parameters applied"""
+    strategy_class, _ = _constructor(strategy_name)
+    return strategy_class(**strategy_kwargs(strategy_name, params))
+
+
+def strategy_arguments(strategy_name: str) -> Set[str]:
+    """Tuning parameter names (aliases included) a strategy's constructor takes"""
+    names = set(_constructor(strategy_name)[1])
+    return names | {alias for alias, arg in PARAM_ALIASES.items() if arg in names}
+
+
+def is_vectorized(strategy_name: str) -> bool:
+    """Whether a strategy implements signal_conditions()"""
+    strategy_class, _ = _constructor(strategy_name)
+    return strategy_class.signal_conditions is not Strategy.signal_conditions
+
+
+def resolve_positions(buy: np.ndarray, sell: np.ndarray) -> np.ndarray:
+    """
+    Long (1) / flat (0) position after each candle from entry conditions
+
+    Applies execute()'s last_signal rule (BUY unless the last signal was
+    BUY, else SELL unless it was SELL). Without candles where both
+    conditions hold, the position is simply the latest condition seen,
+    computed without a Python loop.
+    """
+    n = len(buy)
+    if not (buy & sell).any():
+        events = buy | sell
+        last_event = np.maximum.accumulate(np.where(events, np.arange(n), -1))
+        return np.where(last_event >= 0, buy[np.maximum(last_event, 0)], False).astype(
+            np.float64
+        )
+
+    positions = np.zeros(n)
+    last_signal = "HOLD"
+    for t, (is_buy, is_sell) in enumerate(zip(buy.tolist(), sell.tolist())):
+        if is_buy and last_signal != "BUY":
+            last_signal = "BUY"
+        elif is_sell and last_signal != "SELL":
+            last_signal = "SELL"
+        positions[t] = last_signal == "BUY"
+    return positions
+
+
+class VectorizedBacktester:
+    """
+    Long-only backtest of registered strategies over one price history
+
+    A BUY signal opens a position at that candle's close and a SELL
+    closes it, as in the bot loop. Strategies that implement
+    signal_conditions() are evaluated for the whole history at once;
+    others are replayed candle by candle through execute(). Entry
+    conditions and per-candle returns are cached by the hash of the
+    effective constructor arguments, so parameter sets that build the
+    same strategy are only evaluated once.
+    """
+
+    def __init__(self, historical_data: List[Dict[str, Any]]):
+        closes = [float(row.get("close", 100.0)) for row in historical_data]
+        self.ticker_data: Dict[str, Any] = {
+            "closes": closes,
+            "highs": [
+                float(row.get("high", c)) for row, c in zip(historical_data, closes)
+            ],
+            "lows": [
+                float(row.get("low", c)) for row, c in zip(historical_data, closes)
+            ],
+            "volumes": (
+                [float(row["volume"]) for row in historical_data]
+                if historical_data and all("volume" in row for row in historical_data)
+                else []
+            ),
+        }
+
+        close = np.asarray(closes, dtype=np.float64)
+        # Return of each candle over the previous close
+        self.price_returns = np.zeros(len(close))
+        if len(close) > 1:
+            self.price_returns[1:] = np.diff(close) / close[:-1]
+
+        # params_hash -> (buy, sell, returns), all read-only
+        self._cache: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    def simulate(self, strategy_name: str, params: Dict[str, float]) -> np.ndarray:
+        """
+        Per-candle strategy returns for a parameter set
+
+        Returns:
+            Read-only array of returns, one per candle
+        """
+        return self._run(strategy_name, params)[2]
+
+    def conditions(
+        self, strategy_name: str, params: Dict[str, float]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        BUY and SELL entry conditions on every candle for a parameter set
+
+        Returns:
+            Read-only boolean arrays (buy, sell), one entry per candle
+        """
+        buy, sell, _ = self._run(strategy_name, params)
+        return buy, sell
+
+    def _run(
+        self, strategy_name: str, params: Dict[str, float]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Cached conditions and returns of a parameter set"""
+        kwargs = strategy_kwargs(strategy_name, params)
+        key = params_hash(strategy_name, kwargs)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        strategy_class, _ = _constructor(strategy_name)
+        buy, sell = self._conditions(strategy_class(**kwargs))
+        buy = np.asarray(buy, dtype=bool)
+        sell = np.asarray(sell, dtype=bool)
+        positions = resolve_positions(buy, sell)
+
+        returns = np.zeros(len(positions))
+        returns[1:] = positions[:-1] * self.price_returns[1:]
+        for array in (buy, sell, returns):
+            array.flags.writeable = False
+
+        if len(self._cache) >= MAX_CACHED_RUNS:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[key] = (buy, sell, returns)
+        return self._cache[key]
+
+    def _conditions(self, strategy: Strategy) -> Tuple[np.ndarray, np.ndarray]:
+        """Entry conditions of a strategy for every candle"""
+        conditions: Optional[Tuple[np.ndarray, np.ndarray]] = (
+            strategy.signal_conditions(self.ticker_data)
+        )
+        if conditions is not None:
+            return conditions
+
+        # Replay execute() on every prefix; its own last_signal state means
+        # emitted signals are already de-duplicated
+        n = len(self.ticker_data["closes"])
+        buy = np.zeros(n, dtype=bool)
+        sell = np.zeros(n, dtype=bool)
+        context = {"backtest": True}
+        for t in range(n):
+            window = {
+                key: values[: t + 1]
+                for key, values in self.ticker_data.items()
+                if values
+            }
+            signal = strategy.execute(window, context).get("signal", "HOLD")
+            buy[t] = signal == "BUY"
+            sell[t] = signal == "SELL"
+        return buy, sell
@@ -0,0 +1,317 @@
+"""
+Persistent feature store for ML features.
+Materializes volatility and signal features per symbol/timeframe/timestamp.
+"""
+
+import hashlib
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from prisma import Prisma
+
+from src.utils.database import get_prisma
+
+from .signal_quality.feature_extractor import SIGNAL_FEATURES, FeatureExtractor
+from .volatility.features import FEATURE_NAMES, VolatilityFeatures
+
+logger = logging.getLogger(__name__)
+
+# Materialize features as candles close (bot loop) and signals are scored
+FEATURE_STORE_ENABLED = os.getenv("ML_FEATURE_STORE_ENABLED", "true").lower() == "true"
+
+FEATURE_SET_VOLATILITY = "VOLATILITY"
+FEATURE_SET_SIGNAL = "SIGNAL_QUALITY"
+
+# Column order of each feature set
+FEATURE_COLUMNS = {
+    FEATURE_SET_VOLATILITY: FEATURE_NAMES,
+    FEATURE_SET_SIGNAL: SIGNAL_FEATURES,
+}
+
+
+def feature_version(feature_set: str) -> str:
+    """Short hash of a feature set's column order; rows of another order are ignored."""
+    names = ",".join(FEATURE_COLUMNS[feature_set])
+    return hashlib.sha1(names.encode()).hexdigest()[:12]
+
+
+def signal_key(signal: Dict[str, Any]) -> str:
+    """Identity of a signal within its candle: its id, else strategy:side."""
+    if signal.get("id") is not None:
+        return str(signal["id"])
+    return f"{signal.get('strategy', '')}:{signal.get('type', 'NEUTRAL')}"
+
+
+def candle_time(timestamp_ms: float) -> datetime:
+    """Convert a ccxt candle timestamp (ms since epoch) to a naive UTC datetime."""
+    return datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc).replace(
+        tzinfo=None
+    )
+
+
+def parse_timestamp(value: Any) -> datetime:
+    """Parse an ISO timestamp (or pass a datetime) as a naive UTC datetime."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class FeatureStore:
+    """
+    Feature rows stored in the MLFeature table.
+
+    Each row holds one feature vector (in the feature set's fixed column
+    order) for a symbol, timeframe and candle timestamp; signal rows are
+    further keyed by signal_key(), so signals on one candle are kept
+    apart. Rows are appended
+    as candles close, training reads them back as ready-made matrices, and
+    inference reads the latest row with a single index lookup.
+    """
+
+    def __init__(self, prisma: Optional[Prisma] = None):
+        """
+        Initialize the feature store.
+
+        Args:
+            prisma: Prisma client (defaults to the shared client)
+        """
+        self.prisma = prisma or get_prisma()
+        # (feature set, symbol, timeframe) -> newest timestamp written here
+        self._appended: Dict[Tuple[str, str, str], datetime] = {}
+
+    async def append_candles(
+        self,
+        symbol: str,
+        timeframe: str,
+        ohlcv: Sequence[Sequence[float]],
+        lookback: int = 25,
+    ) -> int:
+        """
+        Materialize volatility features for closed candles not stored yet.
+
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            ohlcv: Closed candles as [timestamp_ms, open, high, low, close,
+                volume], oldest first
+            lookback: Candles per feature sample
+
+        Returns:
+            Number of rows written
+        """
+        if len(ohlcv) < lookback:
+            return 0
+
+        key = (FEATURE_SET_VOLATILITY, symbol, timeframe)
+        last_stored = await self._latest_timestamp(*key)
+
+        timestamps = [candle_time(candle[0]) for candle in ohlcv]
+        first_new = lookback - 1
+        if last_stored is not None:
+            while first_new < len(timestamps) and timestamps[first_new] <= last_stored:
+                first_new += 1
+        if first_new >= len(timestamps):
+            return 0
+
+        # Only the tail that produces new rows needs computing
+        tail = ohlcv[first_new - lookback + 1 :]
+        matrix, _ = VolatilityFeatures().extract_history(
+            {
+                "close": [c[4] for c in tail],
+                "high": [c[2] for c in tail],
+                "low": [c[3] for c in tail],
+                "volume": [c[5] for c in tail],
+            },
+            lookback=lookback,
+        )
+
+        return await self._write(key, timestamps[first_new:], matrix)
+
+    async def append_signal_features(
+        self,
+        symbol: str,
+        timeframe: str,
+        signals: Sequence[Dict[str, Any]],
+        market_data: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """
+        Materialize signal-quality features, keyed by each signal's timestamp
+        and signal_key().
+
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            signals: Signals with a datetime "timestamp" (and an "id", or
+                "strategy" and "type", telling signals on one candle apart)
+            market_data: Market data shared by the signals (optional)
+
+        Returns:
+            Number of rows written
+        """
+        signals = [signal for signal in signals if signal.get("timestamp")]
+        if not signals:
+            return 0
+
+        matrix = FeatureExtractor().extract_signal_matrix(signals, market_data)
+        return await self._write(
+            (FEATURE_SET_SIGNAL, symbol, timeframe),
+            [signal["timestamp"] for signal in signals],
+            matrix,
+            [signal_key(signal) for signal in signals],
+        )
+
+    async def latest(
+        self, feature_set: str, symbol: str, timeframe: str
+    ) -> Optional[Tuple[datetime, np.ndarray]]:
+        """
+        Get the most recent feature row.
+
+        Returns:
+            (timestamp, feature vector) or None if nothing is stored
+        """
+        row = await self.prisma.mlfeature.find_first(
+            where={
+                "featureSet": feature_set,
+                "symbol": symbol,
+                "timeframe": timeframe,
+                "version": feature_version(feature_set),
+            },
+            order={"timestamp": "desc"},
+        )
+        if not row:
+            return None
+
+        return row.timestamp, np.asarray(row.values, dtype=np.float64)
+
+    async def load_matrix(
+        self,
+        feature_set: str,
+        symbol: str,
+        timeframe: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> Tuple[List[datetime], np.ndarray]:
+        """
+        Read stored rows as a training matrix, oldest first.
+
+        Returns:
+            Timestamps and a (rows, n_features) float32 matrix
+        """
+        rows, matrix = await self._load_rows(
+            feature_set, symbol, timeframe, start_date, end_date
+        )
+        return [row.timestamp for row in rows], matrix
+
+    async def load_signal_matrix(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> Tuple[List[Tuple[datetime, str]], np.ndarray]:
+        """
+        Read stored signal rows as a training matrix, oldest first.
+
+        Returns:
+            (timestamp, signal key) of each row and a (rows, n_features)
+            float32 matrix
+        """
+        rows, matrix = await self._load_rows(
+            FEATURE_SET_SIGNAL, symbol, timeframe, start_date, end_date
+        )
+        return [(row.timestamp, row.signalKey) for row in rows], matrix
+
+    async def _load_rows(
+        self,
+        feature_set: str,
+        symbol: str,
+        timeframe: str,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+    ) -> Tuple[List[Any], np.ndarray]:
+        """Stored rows of the current version and their feature matrix."""
+        where: Dict[str, Any] = {
+            "featureSet": feature_set,
+            "symbol": symbol,
+            "timeframe": timeframe,
+            "version": feature_version(feature_set),
+        }
+        if start_date or end_date:
+            date_filter = {}
+            if start_date:
+                date_filter["gte"] = start_date
+            if end_date:
+                date_filter["lte"] = end_date
+            where["timestamp"] = date_filter
+
+        rows = await self.prisma.mlfeature.find_many(
+            where=where, order={"timestamp": "asc"}
+        )
+
+        n_features = len(FEATURE_COLUMNS[feature_set])
+        matrix = np.empty((len(rows), n_features), dtype=np.float32)
+        for i, row in enumerate(rows):
+            matrix[i] = row.values
+
+        return rows, matrix
+
+    async def _latest_timestamp(
+        self, feature_set: str, symbol: str, timeframe: str
+    ) -> Optional[datetime]:
+        """Timestamp of the newest stored row for a key."""
+        key = (feature_set, symbol, timeframe)
+        if key in self._appended:
+            return self._appended[key]
+
+        latest = await self.latest(feature_set, symbol, timeframe)
+        return latest[0] if latest else None
+
+    async def _write(
+        self,
+        key: Tuple[str, str, str],
+        timestamps: Sequence[datetime],
+        matrix: np.ndarray,
+        signal_keys: Optional[Sequence[str]] = None,
+    ) -> int:
+        """Append rows for a key, skipping rows stored at this version."""
+        feature_set, symbol, timeframe = key
+        version = feature_version(feature_set)
+        signal_keys = signal_keys or [""] * len(timestamps)
+
+        written = await self.prisma.mlfeature.create_many(
+            data=[
+                {
+                    "featureSet": feature_set,
+                    "symbol": symbol,
+                    "timeframe": timeframe,
+                    "timestamp": timestamp,
+                    "signalKey": signal_key,
+                    "version": version,
+                    "values": [float(v) for v in row],
+                }
+                for timestamp, signal_key, row in zip(timestamps, signal_keys, matrix)
+            ],
+            skip_duplicates=True,
+        )
+
+        newest = max(timestamps)
+        if key not in self._appended or newest > self._appended[key]:
+            self._appended[key] = newest
+
+        return written
+
+
+_store: Optional[FeatureStore] = None
+
+
+def get_feature_store() -> FeatureStore:
+    """Get the process-wide feature store."""
+    global _store
+    if _store is None:
+        _store = FeatureStore()
+    return _store
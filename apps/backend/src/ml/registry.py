@@ -0,0 +1,223 @@
+"""
+Model registry for trained ML models.
+Serves the promoted version of each model type from a warm in-process cache.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from prisma import Prisma
+
+from src.utils.database import get_prisma
+
+from .signal_quality import SignalQualityScorer
+from .volatility import VolatilityPredictor
+
+logger = logging.getLogger(__name__)
+
+MODEL_DIR = os.getenv("ML_MODEL_DIR", "/app/ml_models")
+
+# Seconds between checks for a newly promoted version
+REFRESH_INTERVAL = float(os.getenv("ML_MODEL_REFRESH_SECONDS", "60"))
+
+# Model types served by the registry
+MODEL_CLASSES = {
+    "SIGNAL_QUALITY": SignalQualityScorer,
+    "VOLATILITY": VolatilityPredictor,
+}
+
+# MLModelTraining status of the version being served
+STATUS_ACTIVE = "ACTIVE"
+STATUS_COMPLETED = "COMPLETED"
+
+
+def model_path(model_type: str, version: str) -> str:
+    """Artifact directory for a model version."""
+    return os.path.join(MODEL_DIR, f"{model_type.lower()}_v{version}")
+
+
+class ModelRegistry:
+    """
+    Process-wide registry of loaded models keyed by type and version.
+
+    The MLModelTraining row with status ACTIVE is the promoted version of
+    its type. Each version is loaded once; a newer promotion is picked up
+    within the refresh interval and swapped in with a single reference
+    assignment, so in-flight requests keep the instance they started with.
+    """
+
+    def __init__(
+        self,
+        prisma: Optional[Prisma] = None,
+        refresh_interval: Optional[float] = None,
+    ):
+        """
+        Initialize the model registry.
+
+        Args:
+            prisma: Prisma client (defaults to the shared client)
+            refresh_interval: Seconds between checks for a new version
+        """
+        self.prisma = prisma or get_prisma()
+        self.refresh_interval = (
+            refresh_interval if refresh_interval is not None else REFRESH_INTERVAL
+        )
+        # model type -> (version, instance)
+        self._models: Dict[str, Tuple[Optional[str], Any]] = {}
+        self._checked_at: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def get(self, model_type: str) -> Any:
+        """
+        Get the served instance of a model type.
+
+        Falls back to an untrained instance (neutral predictions) until a
+        version has been promoted.
+
+        Args:
+            model_type: SIGNAL_QUALITY or VOLATILITY
+
+        Returns:
+            Loaded model instance
+        """
+        if model_type not in MODEL_CLASSES:
+            raise ValueError(f"Unknown model type: {model_type}")
+
+        entry = self._models.get(model_type)
+        checked_at = self._checked_at.get(model_type, 0.0)
+        if entry is not None and time.monotonic() - checked_at < self.refresh_interval:
+            return entry[1]
+
+        return await self.refresh(model_type)
+
+    def get_version(self, model_type: str) -> Optional[str]:
+        """Version currently served for a model type (None if untrained)."""
+        entry = self._models.get(model_type)
+        return entry[0] if entry else None
+
+    async def refresh(self, model_type: str) -> Any:
+        """
+        Load the promoted version of a model type if it changed.
+
+        Args:
+            model_type: SIGNAL_QUALITY or VOLATILITY
+
+        Returns:
+            Served model instance
+        """
+        lock = self._locks.setdefault(model_type, asyncio.Lock())
+        async with lock:
+            entry = self._models.get(model_type)
+
+            try:
+                active = await self.prisma.mlmodeltraining.find_first(
+                    where={"modelType": model_type, "status": STATUS_ACTIVE},
+                    order={"completedAt": "desc"},
+                )
+            except Exception as e:
+                # Keep serving what we have if the lookup fails
+                logger.warning(f"Model registry lookup failed for {model_type}: {e}")
+                if entry is not None:
+                    return entry[1]
+                active = None
+
+            version = active.modelVersion if active else None
+            if entry is None or entry[0] != version:
+                try:
+                    entry = (version, await self._load(model_type, version))
+                    if version:
+                        logger.info(f"Serving {model_type} model version {version}")
+                except Exception as e:
+                    logger.error(f"Failed to load {model_type} v{version}: {e}")
+                    if entry is None:
+                        entry = (None, MODEL_CLASSES[model_type]())
+                self._models[model_type] = entry
+
+            self._checked_at[model_type] = time.monotonic()
+            return entry[1]
+
+    async def _load(self, model_type: str, version: Optional[str]) -> Any:
+        """Build a model instance, loading the version's artifact off-loop."""
+        model_class = MODEL_CLASSES[model_type]
+        if version is None:
+            return model_class()
+
+        path = model_path(model_type, version)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Model not found: {path}")
+
+        return await asyncio.to_thread(model_class, path)
+
+    async def promote(self, model_type: str, version: str) -> Dict[str, Any]:
+        """
+        Promote a trained version to be served and swap it in.
+
+        Args:
+            model_type: SIGNAL_QUALITY or VOLATILITY
+            version: Model version to serve
+
+        Returns:
+            Promoted model type and version
+        """
+        if model_type not in MODEL_CLASSES:
+            raise ValueError(f"Unknown model type: {model_type}")
+
+        training = await self.prisma.mlmodeltraining.find_first(
+            where={
+                "modelType": model_type,
+                "modelVersion": version,
+                "status": {"in": [STATUS_COMPLETED, STATUS_ACTIVE]},
+            }
+        )
+        if not training:
+            raise ValueError(f"No completed {model_type} model version {version}")
+
+        if not os.path.exists(model_path(model_type, version)):
+            raise ValueError(f"Model artifact missing for {model_type} v{version}")
+
+        async with self.prisma.tx() as transaction:
+            await transaction.mlmodeltraining.update_many(
+                where={"modelType": model_type, "status": STATUS_ACTIVE},
+                data={"status": STATUS_COMPLETED},
+            )
+            await transaction.mlmodeltraining.update(
+                where={"id": training.id}, data={"status": STATUS_ACTIVE}
+            )
+
+        # Swap in now; other processes follow within the refresh interval
+        await self.refresh(model_type)
+
+        return {"modelType": model_type, "version": version}
+
+    async def list_models(self) -> List[Dict[str, Any]]:
+        """List trained model versions, newest first."""
+        trainings = await self.prisma.mlmodeltraining.find_many(
+            where={"status": {"in": [STATUS_COMPLETED, STATUS_ACTIVE]}},
+            order={"startedAt": "desc"},
+        )
+
+        return [
+            {
+                "id": f"{t.modelType.lower()}_v{t.modelVersion}",
+                "type": t.modelType,
+                "version": t.modelVersion,
+                "status": t.status,
+                "performance": t.performance,
+                "trainedAt": t.completedAt.isoformat() if t.completedAt else None,
+            }
+            for t in trainings
+        ]
+
+
+_registry: Optional[ModelRegistry] = None
+
+
+def get_model_registry() -> ModelRegistry:
+    """Get the process-wide model registry."""
+    global _registry
+    if _registry is None:
+        _registry = ModelRegistry()
+    return _registry
@@ -1,6 +1,12 @@
 """Reinforcement learning strategy tuning module."""
 
-from .environment import TradingEnvironment
+from .environment import TradingEnvironment, VectorTradingEnvironment
+from .halving import SuccessiveHalvingTuner
 from .tuner import StrategyTuner
 
-__all__ = ["StrategyTuner", "TradingEnvironment"]
+__all__ = [
+    "StrategyTuner",
+    "SuccessiveHalvingTuner",
+    "TradingEnvironment",
+    "VectorTradingEnvironment",
+]
@@ -2,47 +2,169 @@
 Trading environment for reinforcement learning.
 """
 
-from typing import Any, Dict, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 
-class TradingEnvironment:
-    """Simulated trading environment for RL training."""
+from src.backtesting.vectorized import VectorizedBacktester
+
+# Bounds for parameters whose space gives no min/max
+PARAM_MIN = 0.0
+PARAM_MAX = 100.0
+
+# Each parameter's range is discretized into STATE_BUCKETS buckets for the
+# state index
+STATE_BUCKETS = 21
+
+# Step applied to a parameter by one action, as a fraction of its range
+PARAM_ADJUSTMENT = 0.01
+
+# Action index layout: 2 * param_index + direction
+ACTION_INCREASE = 0
+ACTION_DECREASE = 1
+
+# Last signal taken, as in the strategies' execute() (long after BUY)
+SIGNAL_NONE = 0
+SIGNAL_BUY = 1
+SIGNAL_SELL = 2
 
-    def __init__(self, historical_data: list, initial_params: Dict[str, float]):
+# States whose entry conditions a vector environment keeps at once
+SIGNAL_TABLE_ROWS = 256
+
+
+def param_bounds(
+    param_names: Sequence[str], param_space: Optional[Dict[str, Dict]]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Lower and upper bound of every parameter (space min/max or defaults)."""
+    specs = [(param_space or {}).get(name, {}) for name in param_names]
+    low = np.array([float(spec.get("min", PARAM_MIN)) for spec in specs])
+    high = np.array([float(spec.get("max", PARAM_MAX)) for spec in specs])
+    return low, np.maximum(high, low)
+
+
+class TradingEnvironment:
+    """
+    Simulated trading environment for RL training.
+
+    Step t walks the strategy forward over candle t: the current
+    parameters' entry conditions on that candle update the position (as
+    in a backtest), and the reward is the position's return on the next
+    candle. Parameters stay within their param_space min/max. Signals are
+    taken with each tunable parameter at its state bucket's lower edge,
+    so the conditions of a whole history are computed once per state
+    (and cached by the backtester) instead of backtesting every step.
+
+    States and actions are integers. The state is the mixed-radix index
+    of every parameter's bucket (params in sorted order); action 2*i
+    increases and 2*i+1 decreases the i-th tunable parameter. Only one
+    parameter changes per step, so the state index is updated in place
+    instead of being re-encoded.
+    """
+
+    def __init__(
+        self,
+        backtester: VectorizedBacktester,
+        strategy: str,
+        initial_params: Dict[str, float],
+        param_space: Optional[Dict[str, Dict]] = None,
+    ):
         """
         Initialize trading environment.
 
         Args:
-            historical_data: Historical market data
+            backtester: Backtester over the historical market data
+            strategy: Registered strategy name
             initial_params: Initial strategy parameters
+            param_space: Tunable parameters in action order with their
+                min/max (defaults to every parameter, sorted, in
+                [PARAM_MIN, PARAM_MAX])
         """
-        self.data = historical_data
+        self.backtester = backtester
+        self.strategy = strategy
+        self.n_steps = len(backtester.price_returns)
         self.initial_params = initial_params.copy()
-        self.params = initial_params.copy()
+        self.param_names = sorted(initial_params)
+        self.action_params = list(param_space or self.param_names)
+
+        self._low, self._high = param_bounds(self.param_names, param_space)
+        # Bucket width per parameter (degenerate ranges get one bucket)
+        self._widths = np.where(
+            self._high > self._low, (self._high - self._low) / (STATE_BUCKETS - 1), 1.0
+        )
+
+        index = {name: i for i, name in enumerate(self.param_names)}
+        # Value slot adjusted by each tunable parameter (-1 = not a param)
+        self._action_slots = [index.get(name, -1) for name in self.action_params]
+
+        # (low, high, bucket width) per parameter as floats for scalar steps
+        self._scales = list(
+            zip(self._low.tolist(), self._high.tolist(), self._widths.tolist())
+        )
+
+        self._radix = [STATE_BUCKETS**i for i in range(len(self.param_names))]
+        self._initial_values = np.clip(
+            [float(initial_params[name]) for name in self.param_names],
+            self._low,
+            self._high,
+        ).tolist()
+
+        self.values: List[float] = []
+        self.state = 0
         self.current_step = 0
-        self.balance = 10000.0
-        self.position = 0.0
         self.initial_balance = 10000.0
-
-    def reset(self) -> str:
+        self.balance = self.initial_balance
+        self.last_signal = SIGNAL_NONE
+        # Entry conditions of the state they were looked up for
+        self._signals_state = -1
+        self._buy: Sequence[bool] = []
+        self._sell: Sequence[bool] = []
+        self._next_returns = backtester.price_returns[1:].tolist() + [0.0]
+
+    @property
+    def n_states(self) -> int:
+        """Number of distinct states."""
+        return STATE_BUCKETS ** len(self.param_names)
+
+    @property
+    def n_actions(self) -> int:
+        """Number of distinct actions."""
+        return 2 * len(self.action_params)
+
+    @property
+    def params(self) -> Dict[str, float]:
+        """Current parameters by name."""
+        return dict(zip(self.param_names, self.values))
+
+    @property
+    def signal_params(self) -> Dict[str, float]:
+        """Parameters signals are taken with (tunable ones on the state grid)."""
+        values = list(self.values)
+        for slot in self._action_slots:
+            if slot >= 0:
+                low, high, width = self._scales[slot]
+                values[slot] = min(low + self._bucket(slot, values[slot]) * width, high)
+        return dict(zip(self.param_names, values))
+
+    def reset(self) -> int:
         """
         Reset environment to initial state.
 
         Returns:
             Initial state
         """
-        self.params = self.initial_params.copy()
+        self.values = list(self._initial_values)
+        self.state = self.encode_state(self.values)
         self.current_step = 0
         self.balance = self.initial_balance
-        self.position = 0.0
-        return self._get_state()
+        self.last_signal = SIGNAL_NONE
+        return self.state
 
-    def step(self, action: str) -> Tuple[str, float, bool, Dict]:
+    def step(self, action: int) -> Tuple[int, float, bool, Dict]:
         """
         Take a step in the environment.
 
         Args:
-            action: Action to take (parameter adjustment)
+            action: Action index (parameter adjustment)
 
         Returns:
             Tuple of (next_state, reward, done, info)
@@ -50,105 +172,265 @@ class TradingEnvironment:
         # Apply parameter adjustment
         self._apply_action(action)
 
-        # Simulate trading step
-        if self.current_step < len(self.data):
-            market_data = self.data[self.current_step]
-            reward = self._execute_trading_step(market_data)
-        else:
-            reward = 0.0
+        # Walk the strategy over this candle, then hold to the next one
+        reward = 0.0
+        t = self.current_step
+        if t < self.n_steps:
+            if self._signals_state != self.state:
+                self._buy, self._sell = self.backtester.conditions(
+                    self.strategy, self.signal_params
+                )
+                self._signals_state = self.state
+            if self._buy[t] and self.last_signal != SIGNAL_BUY:
+                self.last_signal = SIGNAL_BUY
+            elif self._sell[t] and self.last_signal != SIGNAL_SELL:
+                self.last_signal = SIGNAL_SELL
+            if self.last_signal == SIGNAL_BUY:
+                reward = self._next_returns[t]
+        self.balance *= 1.0 + reward
 
         self.current_step += 1
-        done = self.current_step >= len(self.data)
+        done = self.current_step >= self.n_steps
 
-        next_state = self._get_state()
-        info = {"balance": self.balance, "position": self.position}
+        info = {"balance": self.balance}
 
-        return next_state, reward, done, info
+        return self.state, reward, done, info
 
     def get_current_params(self) -> Dict[str, float]:
         """Get current parameters."""
-        return self.params.copy()
-
-    def _get_state(self) -> str:
-        """Get current state representation."""
-        # Discretize parameters for state representation
-        state_parts = []
-        for param, value in sorted(self.params.items()):
-            discretized = int(value / 5) * 5  # Round to nearest 5
-            state_parts.append(f"{param}={discretized}")
-
-        return "|".join(state_parts)
-
-    def _apply_action(self, action: str):
-        """Apply parameter adjustment action."""
-        if "_" not in action:
+        return self.params
+
+    def encode_state(self, values: Sequence[float]) -> int:
+        """State index of a full parameter vector (params in sorted order)."""
+        offsets = np.asarray(values, dtype=np.float64) - self._low
+        buckets = np.clip((offsets // self._widths).astype(int), 0, STATE_BUCKETS - 1)
+        return int(np.dot(buckets, self._radix)) if len(buckets) else 0
+
+    def _bucket(self, slot: int, value: float) -> int:
+        """Discretized bucket of one parameter value."""
+        low, _, width = self._scales[slot]
+        return min(max(int((value - low) // width), 0), STATE_BUCKETS - 1)
+
+    def _apply_action(self, action: int):
+        """Apply parameter adjustment action and update the state index."""
+        slot = self._action_slots[action // 2]
+        if slot < 0:
             return
 
-        param, direction = action.rsplit("_", 1)
+        low, high, _ = self._scales[slot]
+        step = (high - low) * PARAM_ADJUSTMENT
+        old = self.values[slot]
+        if action % 2 == ACTION_INCREASE:
+            new = min(old + step, high)
+        else:
+            new = max(old - step, low)
+        self.values[slot] = new
+
+        delta = self._bucket(slot, new) - self._bucket(slot, old)
+        self.state += delta * self._radix[slot]
+
+
+class VectorTradingEnvironment:
+    """
+    N independent trading environments stepped in lockstep.
+
+    Every environment walks the same price history with its own
+    parameters. The entry conditions of every state in use are kept as
+    rows of one table (buy + 2 * sell per candle), so a step gathers
+    each environment's condition on the current candle and updates every
+    position and reward with array operations; conditions are only
+    computed when an environment enters a state not in the table. States,
+    actions, bounds and rewards follow TradingEnvironment.
+    """
+
+    def __init__(
+        self,
+        backtester: VectorizedBacktester,
+        strategy: str,
+        initial_params: Dict[str, float],
+        n_envs: int,
+        param_space: Optional[Dict[str, Dict]] = None,
+    ):
+        """
+        Initialize the vectorized environment.
 
-        if param not in self.params:
-            return
+        Args:
+            backtester: Backtester over the historical market data
+            strategy: Registered strategy name
+            initial_params: Initial strategy parameters
+            n_envs: Number of environments
+            param_space: Tunable parameters in action order with their
+                min/max (defaults to every parameter, sorted, in
+                [PARAM_MIN, PARAM_MAX])
+        """
+        self.backtester = backtester
+        self.strategy = strategy
+        self.n_steps = len(backtester.price_returns)
+        self.n_envs = n_envs
+        self.param_names = sorted(initial_params)
+        self.action_params = list(param_space or self.param_names)
+
+        self._low, self._high = param_bounds(self.param_names, param_space)
+        self._widths = np.where(
+            self._high > self._low, (self._high - self._low) / (STATE_BUCKETS - 1), 1.0
+        )
 
-        # Get parameter constraints from space (if available)
-        adjustment = 1.0  # Default adjustment
+        index = {name: i for i, name in enumerate(self.param_names)}
+        # Value column adjusted by each action (-1 = not a param)
+        slots = [index.get(name, -1) for name in self.action_params]
+        self._action_slots = np.repeat(np.array(slots, dtype=np.intp), 2)
+        ranges = np.array(
+            [self._high[slot] - self._low[slot] if slot >= 0 else 0.0 for slot in slots]
+        )
+        self._action_steps = np.repeat(ranges * PARAM_ADJUSTMENT, 2) * np.tile(
+            [1.0, -1.0], len(slots)
+        )
 
-        if direction == "increase":
-            self.params[param] = min(self.params[param] + adjustment, 100.0)
-        elif direction == "decrease":
-            self.params[param] = max(self.params[param] - adjustment, 0.0)
+        self._radix = STATE_BUCKETS ** np.arange(len(self.param_names), dtype=np.int64)
+        self._initial_values = np.clip(
+            [float(initial_params[name]) for name in self.param_names],
+            self._low,
+            self._high,
+        )
+        self._rows = np.arange(n_envs)
+        # Columns moved by actions, snapped to the state grid for signals
+        self._tunable = np.unique(self._action_slots[self._action_slots >= 0])
 
-    def _execute_trading_step(self, market_data: Dict[str, Any]) -> float:
+        self.values = np.empty((n_envs, len(self.param_names)))
+        self.states = np.zeros(n_envs, dtype=np.int64)
+        self.current_step = 0
+        self.initial_balance = 10000.0
+        self.balance = np.full(n_envs, self.initial_balance)
+        self.last_signals = np.full(n_envs, SIGNAL_NONE, dtype=np.int8)
+
+        # Entry conditions per state: table row of each state, and the
+        # state and row each environment last looked up
+        capacity = max(SIGNAL_TABLE_ROWS, 2 * n_envs)
+        self._signals = np.zeros((capacity, self.n_steps), dtype=np.int8)
+        self._signal_rows: Dict[int, int] = {}
+        self._env_states = np.full(n_envs, -1, dtype=np.int64)
+        self._env_rows = np.zeros(n_envs, dtype=np.intp)
+        self._next_returns = np.append(backtester.price_returns[1:], 0.0)
+
+    @property
+    def n_states(self) -> int:
+        """Number of distinct states."""
+        return STATE_BUCKETS ** len(self.param_names)
+
+    @property
+    def n_actions(self) -> int:
+        """Number of distinct actions."""
+        return 2 * len(self.action_params)
+
+    def reset(self) -> np.ndarray:
         """
-        Execute one trading step and return reward.
-
-        Args:
-            market_data: Current market data
+        Reset every environment to the initial state.
 
         Returns:
-            Reward for this step
+            Initial states, shape (N,)
         """
-        # Simplified trading logic - generate signal based on parameters
-        signal = self._generate_signal(market_data)
-
-        # Execute trade
-        if signal == "BUY" and self.position == 0:
-            # Open long position
-            price = market_data.get("close", 100.0)
-            self.position = self.balance / price
-            self.balance = 0
-        elif signal == "SELL" and self.position > 0:
-            # Close position
-            price = market_data.get("close", 100.0)
-            self.balance = self.position * price
-            self.position = 0
-
-        # Calculate reward (change in portfolio value)
-        portfolio_value = self.balance + (
-            self.position * market_data.get("close", 100.0)
-        )
-        reward = (portfolio_value - self.initial_balance) / self.initial_balance
-
-        return reward
+        self.values[:] = self._initial_values
+        self.states = self._encode(self.values)
+        self.current_step = 0
+        self.balance[:] = self.initial_balance
+        self.last_signals[:] = SIGNAL_NONE
+        return self.states.copy()
 
-    def _generate_signal(self, market_data: Dict[str, Any]) -> str:
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, bool]:
         """
-        Generate trading signal based on current parameters.
+        Take one step in every environment.
 
         Args:
-            market_data: Current market data
+            actions: Action index per environment, shape (N,)
 
         Returns:
-            Trading signal ('BUY', 'SELL', or 'HOLD')
+            Tuple of (next_states, rewards, done)
         """
-        # Simplified signal generation using RSI-like logic
-        rsi = market_data.get("rsi", 50.0)
+        self._apply_actions(actions)
+
+        # Walk every strategy over this candle, then hold to the next one
+        t = self.current_step
+        if t < self.n_steps:
+            codes = self._signals[self._lookup_signals(), t]
+            last = self.last_signals
+            take_buy = (codes & 1).astype(bool) & (last != SIGNAL_BUY)
+            take_sell = ~take_buy & (codes & 2).astype(bool) & (last != SIGNAL_SELL)
+            last[take_buy] = SIGNAL_BUY
+            last[take_sell] = SIGNAL_SELL
+            rewards = np.where(last == SIGNAL_BUY, self._next_returns[t], 0.0)
+        else:
+            rewards = np.zeros(self.n_envs)
+        self.balance *= 1.0 + rewards
 
-        oversold = self.params.get("oversoldThreshold", 30.0)
-        overbought = self.params.get("overboughtThreshold", 70.0)
+        self.current_step += 1
+        done = self.current_step >= self.n_steps
+
+        return self.states.copy(), rewards, done
+
+    def get_params(self, env: int) -> Dict[str, float]:
+        """Current parameters of one environment."""
+        return {
+            name: float(value)
+            for name, value in zip(self.param_names, self.values[env])
+        }
+
+    def signal_params(self, env: int) -> Dict[str, float]:
+        """Parameters of one environment's signals (tunable ones on the grid)."""
+        values = self.values[env].copy()
+        cols = self._tunable
+        grid = self._low[cols] + self._buckets(values[cols], cols) * self._widths[cols]
+        values[cols] = np.minimum(grid, self._high[cols])
+        return dict(zip(self.param_names, values.tolist()))
+
+    def _encode(self, values: np.ndarray) -> np.ndarray:
+        """State index of each row of parameter values."""
+        return self._buckets(values).astype(np.int64) @ self._radix
+
+    def _buckets(self, values: np.ndarray, cols=slice(None)) -> np.ndarray:
+        """Bucket of each parameter value (columns given by cols)."""
+        buckets = (values - self._low[cols]) // self._widths[cols]
+        return np.clip(buckets, 0, STATE_BUCKETS - 1)
+
+    def _apply_actions(self, actions: np.ndarray):
+        """Apply each environment's parameter adjustment."""
+        slots = self._action_slots[actions]
+        valid = slots >= 0
+        if not valid.any():
+            return
 
-        if rsi < oversold:
-            return "BUY"
-        elif rsi > overbought:
-            return "SELL"
-        else:
-            return "HOLD"
+        rows = self._rows[valid]
+        cols = slots[valid]
+        old = self.values[rows, cols]
+        new = np.clip(
+            old + self._action_steps[actions[valid]], self._low[cols], self._high[cols]
+        )
+        self.values[rows, cols] = new
+
+        delta = self._buckets(new, cols) - self._buckets(old, cols)
+        self.states[rows] += delta.astype(np.int64) * self._radix[cols]
+
+    def _lookup_signals(self) -> np.ndarray:
+        """Signal table row of every environment's current state."""
+        changed = np.flatnonzero(self.states != self._env_states)
+        if not len(changed):
+            return self._env_rows
+
+        new_states = set(self.states[changed].tolist()) - set(self._signal_rows)
+        if len(self._signal_rows) + len(new_states) > len(self._signals):
+            # Table full: start over with the states in use
+            self._signal_rows.clear()
+            changed = self._rows
+
+        for env in changed.tolist():
+            state = int(self.states[env])
+            row = self._signal_rows.get(state)
+            if row is None:
+                row = self._signal_rows[state] = len(self._signal_rows)
+                buy, sell = self.backtester.conditions(
+                    self.strategy, self.signal_params(env)
+                )
+                self._signals[row] = buy
+                self._signals[row] += 2 * sell
+            self._env_rows[env] = row
+        self._env_states[changed] = self.states[changed]
+        return self._env_rows
@@ -0,0 +1,159 @@
+"""
+Strategy parameter tuning by successive halving.
+"""
+
+import math
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.backtesting.vectorized import VectorizedBacktester, effective_params
+
+from .environment import param_bounds
+from .tuner import StrategyTuner
+
+
+class SuccessiveHalvingTuner(StrategyTuner):
+    """
+    Strategy parameter optimization by successive halving.
+
+    Random candidates from the parameter space are backtested on a short,
+    most recent window of the history; the best 1/eta of them are promoted
+    to a window eta times longer, until the survivors are backtested on
+    the full history. Most candidates only ever see a cheap window, so a
+    wide search costs a fraction of backtesting every candidate in full.
+    """
+
+    def __init__(
+        self,
+        param_space: Dict[str, Dict],
+        eta: int = 3,
+        min_window: int = 200,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize the successive halving tuner.
+
+        Args:
+            param_space: Parameter search space ({"min", "max"} per param)
+            eta: Promotion ratio between rungs (keep best 1/eta)
+            min_window: Candles in the shortest backtest window
+            seed: Random seed for candidate sampling (optional)
+        """
+        super().__init__(param_space, seed=seed)
+        self.eta = max(2, eta)
+        self.min_window = min_window
+
+    def optimize(
+        self,
+        strategy: str,
+        historical_data: List[Dict],
+        initial_params: Dict[str, float],
+        max_episodes: int = 1000,
+        optimization_goal: str = "SHARPE_RATIO",
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+    ) -> Tuple[Dict[str, float], Dict[str, Any]]:
+        """
+        Optimize strategy parameters by successive halving.
+
+        Args:
+            strategy: Strategy name
+            historical_data: Historical market data
+            initial_params: Initial parameter values (always a candidate)
+            max_episodes: Number of candidates sampled
+            optimization_goal: Metric ranked at every rung ('SHARPE_RATIO',
+                'TOTAL_RETURN', 'MAX_DRAWDOWN' or 'WIN_RATE')
+            progress_callback: Called with (evaluations_done, total) after
+                each backtest (optional)
+
+        Returns:
+            Tuple of (optimized_params, performance_metrics)
+        """
+        # Baseline on the full history: fails fast on an unknown strategy
+        # and is cached for the final evaluation
+        self._simulate_strategy(strategy, initial_params, historical_data)
+
+        # Candidates as the strategy uses them, so the best one is returned
+        # exactly as it was backtested
+        candidates = [
+            effective_params(strategy, params)
+            for params in [initial_params]
+            + self._sample_candidates(initial_params, max(0, max_episodes - 1))
+        ]
+        windows = self._rung_windows(len(historical_data))
+
+        # Survivors per rung, to report progress against a fixed total
+        sizes = [len(candidates)]
+        for _ in windows[1:]:
+            sizes.append(max(1, math.ceil(sizes[-1] / self.eta)))
+        total = sum(sizes)
+
+        evaluated = 0
+        candles = 0
+        scores: List[float] = []
+        for rung, window in enumerate(windows):
+            # The full-history rung shares the cache used for evaluation
+            backtester = (
+                self._backtester
+                if window == len(historical_data)
+                else VectorizedBacktester(historical_data[-window:])
+            )
+
+            scores = []
+            for params in candidates:
+                returns = backtester.simulate(strategy, params)
+                scores.append(self._score(returns, optimization_goal))
+                evaluated += 1
+                candles += window
+                if progress_callback:
+                    progress_callback(evaluated, total)
+
+            if rung < len(windows) - 1:
+                keep = sizes[rung + 1]
+                order = np.argsort(scores)[::-1][:keep]
+                candidates = [candidates[i] for i in order]
+
+        best_params = candidates[int(np.argmax(scores))]
+
+        performance = self._evaluate_params(
+            strategy, best_params, historical_data, initial_params
+        )
+        performance["search"] = {
+            "method": "SUCCESSIVE_HALVING",
+            "candidates": sizes[0],
+            "evaluations": evaluated,
+            "rungs": windows,
+            "candlesEvaluated": candles,
+            "fullBudget": sizes[0] * len(historical_data),
+        }
+
+        return best_params, performance
+
+    def _sample_candidates(
+        self, initial_params: Dict[str, float], count: int
+    ) -> List[Dict[str, float]]:
+        """Sample parameter sets uniformly from the search space."""
+        names = list(self.param_space)
+        low, high = param_bounds(names, self.param_space)
+        samples = self.rng.uniform(low, high, size=(count, len(names)))
+
+        return [
+            {**initial_params, **dict(zip(names, map(float, row)))} for row in samples
+        ]
+
+    def _rung_windows(self, n_candles: int) -> List[int]:
+        """Backtest window per rung, shortest first, ending at the full history."""
+        windows = [n_candles]
+        while windows[0] // self.eta >= self.min_window:
+            windows.insert(0, windows[0] // self.eta)
+        return windows
+
+    def _score(self, returns: np.ndarray, optimization_goal: str) -> float:
+        """Rank value of a backtest (higher is better)."""
+        if optimization_goal == "TOTAL_RETURN":
+            return float(np.sum(returns))
+        if optimization_goal == "MAX_DRAWDOWN":
+            return self._calculate_max_drawdown(returns)
+        if optimization_goal == "WIN_RATE":
+            return self._calculate_win_rate(returns)
+        return self._calculate_sharpe_ratio(returns)
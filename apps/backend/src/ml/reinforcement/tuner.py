@@ -2,11 +2,73 @@
 Strategy parameter tuning using reinforcement learning.
 """
 
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 
-from .environment import TradingEnvironment
+from src.backtesting.vectorized import (
+    VectorizedBacktester,
+    effective_params,
+    is_vectorized,
+    strategy_arguments,
+)
+
+from .environment import TradingEnvironment, VectorTradingEnvironment
+
+# Largest Q-table (states x actions) kept as a dense array; larger spaces
+# store rows only for visited states
+MAX_DENSE_Q_ENTRIES = 2_000_000
+
+
+class QTable:
+    """Q-values indexed by integer state and action."""
+
+    def __init__(self, n_states: int, n_actions: int):
+        """
+        Initialize an all-zero Q-table.
+
+        Args:
+            n_states: Number of states
+            n_actions: Number of actions
+        """
+        self.n_actions = n_actions
+        self.dense = n_states * n_actions <= MAX_DENSE_Q_ENTRIES
+        if self.dense:
+            self._values = np.zeros((n_states, n_actions))
+        else:
+            self._rows: Dict[int, np.ndarray] = {}
+            self._zeros = np.zeros(n_actions)
+            self._zeros.flags.writeable = False
+
+    def row(self, state: int) -> np.ndarray:
+        """Q-values of every action in a state (read-only for unseen states)."""
+        if self.dense:
+            return self._values[state]
+        return self._rows.get(state, self._zeros)
+
+    def update(self, state: int, action: int, value: float):
+        """Set the Q-value of a state/action pair."""
+        if self.dense:
+            self._values[state, action] = value
+            return
+        row = self._rows.get(state)
+        if row is None:
+            row = self._rows[state] = np.zeros(self.n_actions)
+        row[action] = value
+
+    def rows(self, states: np.ndarray) -> np.ndarray:
+        """Q-values of every action for many states, shape (N, n_actions)."""
+        if self.dense:
+            return self._values[states]
+        return np.stack([self.row(int(state)) for state in states])
+
+    def add(self, states: np.ndarray, actions: np.ndarray, deltas: np.ndarray):
+        """Add deltas to state/action pairs (repeated pairs accumulate)."""
+        if self.dense:
+            np.add.at(self._values, (states, actions), deltas)
+            return
+        for state, action, delta in zip(states.tolist(), actions.tolist(), deltas):
+            self.update(state, action, self.row(state)[action] + delta)
 
 
 class StrategyTuner:
@@ -17,6 +79,8 @@ class StrategyTuner:
         param_space: Dict[str, Dict],
         learning_rate: float = 0.1,
         discount: float = 0.95,
+        seed: Optional[int] = None,
+        n_envs: int = 1,
     ):
         """
         Initialize the strategy tuner.
@@ -25,11 +89,18 @@ class StrategyTuner:
             param_space: Dictionary defining parameter search space
             learning_rate: Learning rate for Q-learning
             discount: Discount factor for future rewards
+            seed: Random seed for exploration (optional)
+            n_envs: Episodes run in lockstep per batch (1 = sequential)
         """
         self.param_space = param_space
         self.lr = learning_rate
         self.gamma = discount
-        self.q_table = {}
+        self.n_actions = 2 * len(param_space)
+        self.q_table: Optional[QTable] = None
+        self.rng = np.random.default_rng(seed)
+        self.n_envs = max(1, n_envs)
+        self._backtester: Optional[VectorizedBacktester] = None
+        self._backtest_data: Optional[List[Dict]] = None
 
     def optimize(
         self,
@@ -38,6 +109,7 @@ class StrategyTuner:
         initial_params: Dict[str, float],
         max_episodes: int = 1000,
         optimization_goal: str = "SHARPE_RATIO",
+        progress_callback: Optional[Callable[[int, int], None]] = None,
     ) -> Tuple[Dict[str, float], Dict[str, Any]]:
         """
         Optimize strategy parameters using Q-learning.
@@ -48,114 +120,204 @@ class StrategyTuner:
             initial_params: Initial parameter values
             max_episodes: Maximum training episodes
             optimization_goal: Goal to optimize ('SHARPE_RATIO', 'TOTAL_RETURN', etc.)
+            progress_callback: Called with (episodes_done, max_episodes) after
+                each episode or batch (optional)
 
         Returns:
             Tuple of (optimized_params, performance_metrics)
-        """
-        env = TradingEnvironment(historical_data, initial_params)
 
-        best_params = initial_params.copy()
-        best_reward = -float("inf")
-
-        for episode in range(max_episodes):
-            state = env.reset()
-            total_reward = 0
-            epsilon = max(0.01, 1.0 - episode / max_episodes)  # Epsilon decay
-
-            steps = 0
-            max_steps = len(historical_data) - 1
-
-            while steps < max_steps:
-                # Choose action (parameter adjustment)
-                action = self._get_action(state, epsilon)
-
-                # Take step in environment
-                next_state, reward, done, info = env.step(action)
+        Raises:
+            ValueError: If the strategy cannot be tuned with RL
+        """
+        self.check_strategy(strategy)
 
-                # Update Q-table
-                self._update_q_value(state, action, reward, next_state)
+        # Baseline backtest first: cached for the final evaluation, and
+        # builds the backtester the environments reward from
+        self._simulate_strategy(strategy, initial_params, historical_data)
 
-                total_reward += reward
-                state = next_state
-                steps += 1
+        env = TradingEnvironment(
+            self._backtester, strategy, initial_params, self.param_space
+        )
+        self.q_table = QTable(env.n_states, self.n_actions)
 
-                if done:
-                    break
+        best_params = initial_params.copy()
+        best_reward = -float("inf")
+        max_steps = len(historical_data) - 1
+
+        episode = 0
+        while episode < max_episodes:
+            batch = min(self.n_envs, max_episodes - episode)
+            # Epsilon decay by episode number
+            epsilons = np.maximum(
+                0.01, 1.0 - (episode + np.arange(batch)) / max_episodes
+            )
+
+            if batch == 1:
+                total_reward, params = self._run_episode(env, max_steps, epsilons[0])
+            else:
+                total_reward, params = self._run_episode_batch(
+                    strategy, initial_params, max_steps, epsilons
+                )
 
             # Track best parameters
             if total_reward > best_reward:
                 best_reward = total_reward
-                best_params = env.get_current_params()
+                best_params = params
+
+            episode += batch
+            if progress_callback:
+                progress_callback(episode, max_episodes)
+
+        # Report the parameters as the strategy actually used them
+        best_params = effective_params(strategy, best_params)
 
         # Calculate performance metrics
         performance = self._evaluate_params(
-            best_params, historical_data, initial_params
+            strategy, best_params, historical_data, initial_params
         )
 
         return best_params, performance
 
-    def _get_action(self, state: str, epsilon: float) -> str:
+    def check_strategy(self, strategy: str):
         """
-        Get action using epsilon-greedy policy.
+        Reject a strategy whose parameters RL tuning cannot act on.
 
-        Args:
-            state: Current state
-            epsilon: Exploration rate
+        Every tuned parameter must be a strategy constructor argument
+        (or its alias), and the strategy must implement
+        signal_conditions(): rewards come from the entry conditions of
+        every state visited, which is too slow when replaying execute().
+
+        Raises:
+            ValueError: If the strategy or a parameter cannot be tuned
+        """
+        if not is_vectorized(strategy):
+            raise ValueError(
+                f"Strategy {strategy} has no vectorized signals and cannot be "
+                "tuned with RL; use SUCCESSIVE_HALVING"
+            )
+
+        unknown = sorted(set(self.param_space) - strategy_arguments(strategy))
+        if unknown:
+            raise ValueError(
+                f"Strategy {strategy} has no parameters {', '.join(unknown)}"
+            )
+
+    def _run_episode(
+        self, env: TradingEnvironment, max_steps: int, epsilon: float
+    ) -> Tuple[float, Dict[str, float]]:
+        """Run one episode, returning its total reward and final signal params."""
+        state = env.reset()
+        total_reward = 0
+        steps = 0
+
+        # Draw the episode's exploration decisions and random actions
+        # up front instead of one RNG call per step
+        explore = (self.rng.random(max_steps) < epsilon).tolist()
+        random_actions = self.rng.integers(self.n_actions, size=max_steps).tolist()
+
+        while steps < max_steps:
+            # Choose action (parameter adjustment), epsilon-greedy
+            if explore[steps]:
+                action = random_actions[steps]
+            else:
+                action = self._best_action(state, random_actions[steps])
+
+            # Take step in environment
+            next_state, reward, done, info = env.step(action)
+
+            # Update Q-table
+            self._update_q_value(state, action, reward, next_state)
+
+            total_reward += reward
+            state = next_state
+            steps += 1
+
+            if done:
+                break
+
+        return total_reward, env.signal_params
+
+    def _run_episode_batch(
+        self,
+        strategy: str,
+        initial_params: Dict[str, float],
+        max_steps: int,
+        epsilons: np.ndarray,
+    ) -> Tuple[float, Dict[str, float]]:
+        """
+        Run len(epsilons) episodes in lockstep on a vectorized environment.
+
+        All episodes share the Q-table; each step's updates are computed
+        from the same Q-values and applied together.
 
         Returns:
-            Action to take
+            Best total reward of the batch and that episode's final signal
+            params
         """
-        if np.random.random() < epsilon:
-            # Explore: random parameter adjustment
-            return self._random_action()
-        else:
-            # Exploit: best known action
-            return self._best_action(state)
-
-    def _random_action(self) -> str:
-        """Generate random parameter adjustment."""
-        param = np.random.choice(list(self.param_space.keys()))
-        direction = np.random.choice(["increase", "decrease"])
-        return f"{param}_{direction}"
-
-    def _best_action(self, state: str) -> str:
-        """Get best action for given state."""
-        possible_actions = self._get_possible_actions()
-
-        q_values = [
-            self.q_table.get((state, action), 0.0) for action in possible_actions
-        ]
-
-        if max(q_values) == 0:
-            return self._random_action()
-
-        best_action_idx = np.argmax(q_values)
-        return possible_actions[best_action_idx]
-
-    def _get_possible_actions(self) -> List[str]:
-        """Get list of all possible actions."""
-        actions = []
-        for param in self.param_space.keys():
-            actions.append(f"{param}_increase")
-            actions.append(f"{param}_decrease")
-        return actions
-
-    def _update_q_value(self, state: str, action: str, reward: float, next_state: str):
+        n_envs = len(epsilons)
+        env = VectorTradingEnvironment(
+            self._backtester, strategy, initial_params, n_envs, self.param_space
+        )
+        states = env.reset()
+        total_rewards = np.zeros(n_envs)
+        rows = np.arange(n_envs)
+
+        # Exploration draws for the whole batch, shape (max_steps, N)
+        random_actions = self.rng.integers(self.n_actions, size=(max_steps, n_envs))
+        explore = self.rng.random((max_steps, n_envs)) < epsilons
+
+        for step in range(max_steps):
+            # Epsilon-greedy over every environment at once
+            q_values = self.q_table.rows(states)
+            actions = np.where(
+                explore[step] | (q_values.max(axis=1) == 0),
+                random_actions[step],
+                q_values.argmax(axis=1),
+            )
+
+            next_states, rewards, done = env.step(actions)
+
+            # Batched Q-learning update
+            current_q = q_values[rows, actions]
+            max_next_q = self.q_table.rows(next_states).max(axis=1)
+            self.q_table.add(
+                states,
+                actions,
+                self.lr * (rewards + self.gamma * max_next_q - current_q),
+            )
+
+            total_rewards += rewards
+            states = next_states
+
+            if done:
+                break
+
+        best = int(total_rewards.argmax())
+        return float(total_rewards[best]), env.signal_params(best)
+
+    def _best_action(self, state: int, fallback: int) -> int:
+        """Get best action for given state (fallback if none is known yet)."""
+        q_values = self.q_table.row(state)
+
+        if q_values.max() == 0:
+            return fallback
+
+        return int(q_values.argmax())
+
+    def _update_q_value(self, state: int, action: int, reward: float, next_state: int):
         """Update Q-table using Q-learning update rule."""
-        current_q = self.q_table.get((state, action), 0.0)
+        current_q = self.q_table.row(state)[action]
 
         # Get max Q-value for next state
-        possible_actions = self._get_possible_actions()
-        max_next_q = max(
-            [self.q_table.get((next_state, a), 0.0) for a in possible_actions]
-        )
+        max_next_q = self.q_table.row(next_state).max()
 
         # Q-learning update
         new_q = current_q + self.lr * (reward + self.gamma * max_next_q - current_q)
-        self.q_table[(state, action)] = new_q
+        self.q_table.update(state, action, new_q)
 
     def _evaluate_params(
         self,
+        strategy: str,
         params: Dict[str, float],
         historical_data: List[Dict],
         original_params: Dict[str, float],
@@ -164,6 +326,7 @@ class StrategyTuner:
         Evaluate parameter performance.
 
         Args:
+            strategy: Registered strategy name
             params: Parameters to evaluate
             historical_data: Historical data
             original_params: Original parameters for comparison
@@ -172,15 +335,17 @@ class StrategyTuner:
             Performance metrics
         """
         # Simulate trading with optimized params
-        optimized_returns = self._simulate_strategy(params, historical_data)
-        original_returns = self._simulate_strategy(original_params, historical_data)
+        optimized_returns = self._simulate_strategy(strategy, params, historical_data)
+        original_returns = self._simulate_strategy(
+            strategy, original_params, historical_data
+        )
 
         # Calculate metrics
         optimized_sharpe = self._calculate_sharpe_ratio(optimized_returns)
         original_sharpe = self._calculate_sharpe_ratio(original_returns)
 
-        optimized_total_return = sum(optimized_returns)
-        original_total_return = sum(original_returns)
+        optimized_total_return = float(np.sum(optimized_returns))
+        original_total_return = float(np.sum(original_returns))
 
         optimized_max_dd = self._calculate_max_drawdown(optimized_returns)
         original_max_dd = self._calculate_max_drawdown(original_returns)
@@ -218,12 +383,18 @@ class StrategyTuner:
         }
 
     def _simulate_strategy(
-        self, params: Dict[str, float], data: List[Dict]
-    ) -> List[float]:
-        """Simulate strategy with given parameters."""
-        # Simplified simulation - returns random walk for now
-        returns = np.random.randn(len(data)) * 0.01
-        return returns.tolist()
+        self, strategy: str, params: Dict[str, float], data: List[Dict]
+    ) -> np.ndarray:
+        """
+        Per-candle returns of the registered strategy with given parameters.
+
+        Runs on the vectorized backtest path; results are cached by
+        parameter hash for as long as the same history is evaluated.
+        """
+        if self._backtest_data is not data:
+            self._backtester = VectorizedBacktester(data)
+            self._backtest_data = data
+        return self._backtester.simulate(strategy, params)
 
     def _calculate_sharpe_ratio(self, returns: List[float]) -> float:
         """Calculate Sharpe ratio."""
@@ -249,5 +420,4 @@ class StrategyTuner:
         """Calculate win rate."""
         if len(returns) == 0:
             return 0.0
-        wins = sum(1 for r in returns if r > 0)
-        return wins / len(returns)
+        return float(np.mean(np.asarray(returns) > 0))
@@ -1,6 +1,6 @@
 """Signal quality scoring module."""
 
-from .feature_extractor import FeatureExtractor
+from .feature_extractor import SIGNAL_FEATURES, FeatureExtractor
 from .scorer import SignalQualityScorer
 
-__all__ = ["SignalQualityScorer", "FeatureExtractor"]
+__all__ = ["SignalQualityScorer", "FeatureExtractor", "SIGNAL_FEATURES"]
@@ -2,10 +2,36 @@
 Feature extraction for signal quality scoring.
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Sequence, Union
 
 import numpy as np
 
+# Column order of signal feature matrices (sorted names, the order models
+# trained from feature dicts expect)
+SIGNAL_FEATURES = (
+    "bollinger_position",
+    "day_of_week",
+    "hour_of_day",
+    "ma_cross",
+    "macd",
+    "market_momentum",
+    "market_volatility",
+    "market_volume_ratio",
+    "price",
+    "price_log",
+    "risk_reward_ratio",
+    "rsi",
+    "rsi_normalized",
+    "signal_buy",
+    "signal_sell",
+    "stop_loss_distance",
+    "take_profit_distance",
+    "trend_bearish",
+    "trend_bullish",
+    "volume",
+    "volume_log",
+)
+
 
 class FeatureExtractor:
     """Extract features from trading signals for ML models."""
@@ -90,6 +116,78 @@ class FeatureExtractor:
 
         return features
 
+    def extract_signal_matrix(
+        self,
+        signals: Sequence[Dict[str, Any]],
+        market_data: Union[Dict[str, Any], List[Optional[Dict[str, Any]]], None] = None,
+    ) -> np.ndarray:
+        """
+        Extract features for many signals into one matrix.
+
+        Produces the same values as extract_signal_features, column by
+        column instead of dict by dict.
+
+        Args:
+            signals: Trading signal dictionaries
+            market_data: Market data shared by all signals, or one entry
+                per signal (optional)
+
+        Returns:
+            float32 array of shape (len(signals), len(SIGNAL_FEATURES))
+            with columns in SIGNAL_FEATURES order
+        """
+        n = len(signals)
+        if isinstance(market_data, list):
+            contexts = [m or {} for m in market_data]
+        else:
+            contexts = [market_data or {}] * n
+        indicators = [signal.get("indicators", {}) for signal in signals]
+
+        def column(rows, key, default) -> np.ndarray:
+            return np.fromiter(
+                (float(row.get(key, default)) for row in rows), np.float64, n
+            )
+
+        rsi = column(indicators, "rsi", 50.0)
+        volume = column(indicators, "volume", 1000000)
+        price = column(signals, "price", 0)
+        trends = [row.get("trend", "NEUTRAL") for row in indicators]
+        types = [signal.get("type", "NEUTRAL") for signal in signals]
+        timestamps = [signal.get("timestamp") for signal in signals]
+
+        columns = {
+            "bollinger_position": column(indicators, "bollinger_position", 0.5),
+            "day_of_week": np.fromiter(
+                (t.weekday() / 7.0 if t else 0.5 for t in timestamps), np.float64, n
+            ),
+            "hour_of_day": np.fromiter(
+                (t.hour / 24.0 if t else 0.5 for t in timestamps), np.float64, n
+            ),
+            "ma_cross": column(indicators, "ma_cross", 0.0),
+            "macd": column(indicators, "macd", 0.0),
+            "market_momentum": column(contexts, "momentum", 0.0),
+            "market_volatility": column(contexts, "volatility", 0.02),
+            "market_volume_ratio": column(contexts, "volume_ratio", 1.0),
+            "price": price,
+            "price_log": np.where(price > 0, np.log1p(np.maximum(price, 0)), 0.0),
+            "risk_reward_ratio": column(signals, "risk_reward_ratio", 1.5),
+            "rsi": rsi,
+            "rsi_normalized": (rsi - 50) / 50,
+            "signal_buy": np.array([t == "BUY" for t in types], np.float64),
+            "signal_sell": np.array([t == "SELL" for t in types], np.float64),
+            "stop_loss_distance": column(signals, "stop_loss_distance", 0.02),
+            "take_profit_distance": column(signals, "take_profit_distance", 0.04),
+            "trend_bearish": np.array([t == "BEARISH" for t in trends], np.float64),
+            "trend_bullish": np.array([t == "BULLISH" for t in trends], np.float64),
+            "volume": volume,
+            "volume_log": np.log1p(volume),
+        }
+
+        matrix = np.empty((n, len(SIGNAL_FEATURES)), dtype=np.float32)
+        for i, name in enumerate(SIGNAL_FEATURES):
+            matrix[:, i] = columns[name]
+        return matrix
+
     def extract_market_features(self, market_data: Dict[str, Any]) -> Dict[str, float]:
         """
         Extract features from market data.
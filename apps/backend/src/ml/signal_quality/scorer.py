@@ -4,13 +4,14 @@ Uses ML to evaluate trading signals before execution.
 """
 
 import os
-import pickle
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Union
 
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import StandardScaler
 
+from ..utils.artifacts import load_model_state, save_forest_artifact
+
 
 class SignalQualityScorer:
     """ML-based signal quality scoring system."""
@@ -47,12 +48,20 @@ class SignalQualityScorer:
         from .feature_extractor import FeatureExtractor
 
         extractor = FeatureExtractor()
-        features = [
-            extractor.extract_signal_features(sig) for sig in historical_signals
-        ]
+        X = extractor.extract_signal_matrix(historical_signals)
+        return self.train_on_features(X, outcomes)
+
+    def train_on_features(self, X: np.ndarray, outcomes: List[str]) -> Dict[str, float]:
+        """
+        Train on precomputed feature rows, e.g. read from the feature store.
+
+        Args:
+            X: (N, n_features) matrix in SIGNAL_FEATURES column order
+            outcomes: Outcome of each row ('WIN' or 'LOSS')
 
-        # Convert to numpy array
-        X = np.array([[f[key] for key in sorted(f.keys())] for f in features])
+        Returns:
+            Training metrics
+        """
         y = np.array([1 if outcome == "WIN" else 0 for outcome in outcomes])
 
         # Fit scaler and transform features
@@ -65,7 +74,7 @@ class SignalQualityScorer:
         # Calculate training accuracy
         accuracy = self.model.score(X_scaled, y)
 
-        return {"accuracy": accuracy, "samples": len(historical_signals)}
+        return {"accuracy": accuracy, "samples": len(y)}
 
     def score_signal(
         self, signal: Dict[str, Any], market_data: Dict[str, Any] = None
@@ -80,77 +89,127 @@ class SignalQualityScorer:
         Returns:
             Score result with confidence and recommendation
         """
+        from .feature_extractor import SIGNAL_FEATURES, FeatureExtractor
+
+        if not self.is_trained:
+            return self._neutral_result()
+
+        X = FeatureExtractor().extract_signal_matrix([signal], market_data)
+        result = self._score_matrix(X)[0]
+        result["features"] = {
+            name: float(value) for name, value in zip(SIGNAL_FEATURES, X[0])
+        }
+        return result
+
+    def score_signals(
+        self,
+        signals: List[Dict[str, Any]],
+        market_data: Union[Dict[str, Any], List[Optional[Dict[str, Any]]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Score many trading signals with a single model call.
+
+        Args:
+            signals: Trading signals to score
+            market_data: Market data shared by all signals, or one entry
+                per signal (optional)
+
+        Returns:
+            Score results in the same order as signals
+        """
         from .feature_extractor import FeatureExtractor
 
+        if not signals:
+            return []
         if not self.is_trained:
-            # Return neutral score if not trained
-            return {
-                "score": 0.5,
-                "confidence": 0.0,
-                "recommendation": "NEUTRAL",
-                "factors": {},
-                "risk": "UNKNOWN",
-            }
+            return [self._neutral_result() for _ in signals]
 
-        extractor = FeatureExtractor()
-        features = extractor.extract_signal_features(signal, market_data)
+        X = FeatureExtractor().extract_signal_matrix(signals, market_data)
+        return self._score_matrix(X)
 
-        # Convert to array in sorted key order
-        X = np.array([[features[key] for key in sorted(features.keys())]])
+    def _neutral_result(self) -> Dict[str, Any]:
+        """Neutral score returned while the model is not trained."""
+        return {
+            "score": 0.5,
+            "confidence": 0.0,
+            "recommendation": "NEUTRAL",
+            "factors": {},
+            "risk": "UNKNOWN",
+        }
+
+    def _score_matrix(self, X: np.ndarray) -> List[Dict[str, Any]]:
+        """Score a (N, F) feature matrix with one predict_proba call."""
         X_scaled = self.scaler.transform(X)
 
         # Get probability predictions
-        proba = self.model.predict_proba(X_scaled)[0]
-
-        score = proba[1]  # Probability of winning trade
-        confidence = max(proba)
-
-        # Determine recommendation
-        if score >= 0.7:
-            recommendation = "EXECUTE"
-            risk = "LOW"
-        elif score >= 0.5:
-            recommendation = "PROCEED_WITH_CAUTION"
-            risk = "MODERATE"
-        else:
-            recommendation = "SKIP"
-            risk = "HIGH"
-
-        # Calculate factor contributions (simplified)
-        factors = {
-            "historicalWinRate": min(score * 1.1, 1.0),
-            "marketCondition": score * 0.95,
-            "riskRewardRatio": score * 1.05,
-            "volumeAlignment": score * 0.98,
-        }
+        proba = self.model.predict_proba(X_scaled)
+
+        scores = proba[:, 1]  # Probability of winning trade
+        confidences = proba.max(axis=1)
+
+        results = []
+        for score, confidence in zip(scores.tolist(), confidences.tolist()):
+            # Determine recommendation
+            if score >= 0.7:
+                recommendation = "EXECUTE"
+                risk = "LOW"
+            elif score >= 0.5:
+                recommendation = "PROCEED_WITH_CAUTION"
+                risk = "MODERATE"
+            else:
+                recommendation = "SKIP"
+                risk = "HIGH"
+
+            # Calculate factor contributions (simplified)
+            factors = {
+                "historicalWinRate": min(score * 1.1, 1.0),
+                "marketCondition": score * 0.95,
+                "riskRewardRatio": score * 1.05,
+                "volumeAlignment": score * 0.98,
+            }
 
-        return {
-            "score": float(score),
-            "confidence": float(confidence),
-            "recommendation": recommendation,
-            "factors": factors,
-            "risk": risk,
-            "features": features,
-        }
+            results.append(
+                {
+                    "score": score,
+                    "confidence": confidence,
+                    "recommendation": recommendation,
+                    "factors": factors,
+                    "risk": risk,
+                }
+            )
 
-    def save_model(self, path: str):
-        """Save trained model to file."""
-        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return results
 
-        model_data = {
-            "model": self.model,
-            "scaler": self.scaler,
-            "is_trained": self.is_trained,
-        }
+    def save_model(self, path: str, version: Optional[str] = None):
+        """
+        Save the model as a pickle-free artifact directory.
 
-        with open(path, "wb") as f:
-            pickle.dump(model_data, f)
+        Args:
+            path: Artifact directory
+            version: Model version recorded in the metadata (optional)
+        """
+        from .feature_extractor import SIGNAL_FEATURES
+
+        save_forest_artifact(
+            path,
+            self.model,
+            self.scaler,
+            self.is_trained,
+            feature_names=SIGNAL_FEATURES,
+            extra={"modelType": "SIGNAL_QUALITY", "version": version},
+        )
 
     def load_model(self, path: str):
-        """Load trained model from file."""
-        with open(path, "rb") as f:
-            model_data = pickle.load(f)
+        """Load a model artifact (the trees hold their own array copies)."""
+        from .feature_extractor import SIGNAL_FEATURES
+
+        model, scaler, is_trained, metadata = load_model_state(
+            path, RandomForestClassifier
+        )
+        feature_names = metadata.get("featureNames")
+        if feature_names and feature_names != list(SIGNAL_FEATURES):
+            raise ValueError(f"Feature order of {path} does not match this build")
 
-        self.model = model_data["model"]
-        self.scaler = model_data["scaler"]
-        self.is_trained = model_data["is_trained"]
+        self.model = model
+        self.scaler = scaler
+        self.is_trained = is_trained
@@ -0,0 +1,545 @@
+"""
+Background training jobs for ML models and strategy tuning.
+Run in Celery workers; progress is recorded on the MLModelTraining and
+StrategyOptimization rows so the API only reads the tables.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from prisma import Prisma
+
+import src.trading.strategies  # noqa: F401  (registers the strategies)
+from src.trading.strategy_interface import StrategyRegistry
+from src.utils.database import get_prisma
+
+from .feature_store import (
+    FEATURE_COLUMNS,
+    FEATURE_SET_VOLATILITY,
+    FeatureStore,
+    parse_timestamp,
+    signal_key,
+)
+from .registry import MODEL_CLASSES, STATUS_ACTIVE, STATUS_COMPLETED, model_path
+from .reinforcement import StrategyTuner, SuccessiveHalvingTuner
+
+logger = logging.getLogger(__name__)
+
+# Parallel jobs for forest training (-1 = all cores of the worker)
+N_JOBS = int(os.getenv("ML_TRAINING_N_JOBS", "-1"))
+
+# Candles fetched for strategy tuning when no history is supplied
+TUNING_CANDLES = int(os.getenv("ML_TUNING_CANDLES", "1000"))
+
+# Tuning episodes run in lockstep per batch
+TUNING_ENVS = int(os.getenv("ML_TUNING_ENVS", "32"))
+
+# Candles ahead a stored volatility row is trained to predict: the target
+# is the realized_vol_24h of the row this many candles later
+STORED_VOLATILITY_HORIZON = 24
+
+# Seconds between progress writes while a job is running
+PROGRESS_INTERVAL = 2.0
+
+STATUS_TRAINING = "TRAINING"
+STATUS_FAILED = "FAILED"
+
+# StrategyOptimization statuses
+STATUS_PENDING = "PENDING"
+STATUS_RUNNING = "RUNNING"
+
+# Strategy optimization methods (StrategyOptimization.method)
+OPTIMIZATION_METHODS = ("RL", "SUCCESSIVE_HALVING")
+
+# Training stages and the progress reported when each starts
+STAGE_PROGRESS = {
+    "QUEUED": 0.0,
+    "LOADING_DATA": 0.1,
+    "FITTING": 0.2,
+    "SAVING": 0.9,
+}
+
+
+def market_history(ohlcv: List[List[float]]) -> List[Dict]:
+    """Convert OHLCV candles into the per-step market data used for tuning."""
+    return [
+        {
+            "close": float(candle[4]),
+            "high": float(candle[2]),
+            "low": float(candle[3]),
+            "volume": float(candle[5]),
+        }
+        for candle in ohlcv
+    ]
+
+
+class TrainingJobs:
+    """Create, run and report ML training and strategy tuning jobs."""
+
+    def __init__(self, prisma: Optional[Prisma] = None):
+        """
+        Initialize training jobs.
+
+        Args:
+            prisma: Prisma client (defaults to the shared client)
+        """
+        self.prisma = prisma or get_prisma()
+
+    async def create_model_training(
+        self,
+        model_type: str,
+        version: str,
+        training_data: Dict[str, Any],
+        hyperparameters: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """
+        Record a queued model training run.
+
+        Args:
+            model_type: SIGNAL_QUALITY or VOLATILITY
+            version: Version to train
+            training_data: Training samples (see _fit_model)
+            hyperparameters: Model parameters overriding the defaults
+
+        Returns:
+            Created MLModelTraining row
+        """
+        if model_type not in MODEL_CLASSES:
+            raise ValueError(f"Unknown model type: {model_type}")
+
+        existing = await self.prisma.mlmodeltraining.find_first(
+            where={
+                "modelType": model_type,
+                "modelVersion": version,
+                "status": {"not": STATUS_FAILED},
+            }
+        )
+        if existing:
+            raise ValueError(f"{model_type} model version {version} already exists")
+
+        valid_params = MODEL_CLASSES[model_type]().model.get_params()
+        unknown = sorted(set(hyperparameters or {}) - set(valid_params))
+        if unknown:
+            raise ValueError(f"Unknown hyperparameters: {', '.join(unknown)}")
+
+        return await self.prisma.mlmodeltraining.create(
+            data={
+                "modelType": model_type,
+                "modelVersion": version,
+                "trainingData": json.dumps(training_data),
+                "hyperparameters": json.dumps(hyperparameters or {}),
+                "performance": json.dumps({"stage": "QUEUED", "progress": 0.0}),
+                "status": STATUS_TRAINING,
+            }
+        )
+
+    async def run_model_training(self, training_id: int) -> Dict[str, Any]:
+        """
+        Train, save and complete a queued model training run.
+
+        The forest is fitted with N_JOBS workers in a thread so progress
+        can still be written. On failure the row is marked FAILED.
+
+        Returns:
+            Training metrics
+        """
+        training = await self.prisma.mlmodeltraining.find_unique(
+            where={"id": training_id}
+        )
+        if not training:
+            raise ValueError(f"Training run {training_id} not found")
+
+        try:
+            await self._set_stage(training_id, "LOADING_DATA")
+            training_data = json.loads(training.trainingData)
+            features = None
+            if "symbol" in training_data:
+                features = await self._load_features(training.modelType, training_data)
+
+            model = MODEL_CLASSES[training.modelType]()
+            model.model.set_params(**json.loads(training.hyperparameters or "{}"))
+
+            await self._set_stage(training_id, "FITTING")
+            model.model.set_params(n_jobs=N_JOBS)
+            metrics = await asyncio.to_thread(
+                self._fit_model, training.modelType, model, training_data, features
+            )
+            # Serve with the default single-threaded predict
+            model.model.set_params(n_jobs=None)
+
+            await self._set_stage(training_id, "SAVING")
+            path = model_path(training.modelType, training.modelVersion)
+            await asyncio.to_thread(
+                model.save_model, path, version=training.modelVersion
+            )
+
+            await self.prisma.mlmodeltraining.update(
+                where={"id": training_id},
+                data={
+                    "status": STATUS_COMPLETED,
+                    "performance": json.dumps(
+                        {"stage": STATUS_COMPLETED, "progress": 1.0, **metrics}
+                    ),
+                    "completedAt": datetime.utcnow(),
+                },
+            )
+            return metrics
+
+        except Exception as e:
+            await self.prisma.mlmodeltraining.update(
+                where={"id": training_id},
+                data={
+                    "status": STATUS_FAILED,
+                    "errorMessage": str(e),
+                    "completedAt": datetime.utcnow(),
+                },
+            )
+            raise
+
+    async def _load_features(
+        self, model_type: str, training_data: Dict[str, Any]
+    ) -> Tuple[np.ndarray, Any]:
+        """
+        Build a model's X/y from rows materialized in the feature store.
+
+        SIGNAL_QUALITY pairs stored signal rows with the outcomes given as
+        [{"timestamp": ..., "outcome": "WIN" | "LOSS", ...}, ...], each
+        carrying the scored signal's "id", or "strategy" and "type", to
+        match its row (see signal_key). VOLATILITY
+        targets each stored row with the realized volatility of the next
+        STORED_VOLATILITY_HORIZON candles (the realized_vol_24h of the row
+        that many candles later), optionally within startDate/endDate.
+
+        Returns:
+            Feature matrix and targets
+        """
+        store = FeatureStore(self.prisma)
+        symbol = training_data["symbol"]
+        timeframe = training_data.get("timeframe")
+        if not timeframe:
+            raise ValueError("timeframe is required with symbol")
+
+        if model_type == "SIGNAL_QUALITY":
+            outcomes = {
+                (parse_timestamp(item["timestamp"]), signal_key(item)): item["outcome"]
+                for item in training_data.get("outcomes") or []
+            }
+            if not outcomes:
+                raise ValueError("outcomes must be non-empty")
+
+            times = [timestamp for timestamp, _ in outcomes]
+            keys, matrix = await store.load_signal_matrix(
+                symbol, timeframe, start_date=min(times), end_date=max(times)
+            )
+            rows = [i for i, key in enumerate(keys) if key in outcomes]
+            if not rows:
+                raise ValueError("No stored signal features match the outcomes")
+            return matrix[rows], [outcomes[keys[i]] for i in rows]
+
+        horizon = int(training_data.get("horizon", STORED_VOLATILITY_HORIZON))
+        if horizon != STORED_VOLATILITY_HORIZON:
+            raise ValueError(
+                f"Stored volatility features support horizon "
+                f"{STORED_VOLATILITY_HORIZON} only"
+            )
+
+        start, end = training_data.get("startDate"), training_data.get("endDate")
+        timestamps, matrix = await store.load_matrix(
+            FEATURE_SET_VOLATILITY,
+            symbol,
+            timeframe,
+            start_date=parse_timestamp(start) if start else None,
+            end_date=parse_timestamp(end) if end else None,
+        )
+
+        # Row of each timestamp horizon candles ahead (gaps have none)
+        times = np.array(timestamps, dtype="datetime64[ms]")
+        spacing = np.diff(times)
+        spacing = spacing[spacing > np.timedelta64(0, "ms")]
+        if not len(spacing):
+            raise ValueError(f"Not enough stored volatility features for {symbol}")
+        targets = times + horizon * spacing.min()
+        ahead = np.searchsorted(times, targets)
+        valid = ahead < len(times)
+        valid[valid] = times[ahead[valid]] == targets[valid]
+        if not valid.any():
+            raise ValueError(f"Not enough stored volatility features for {symbol}")
+
+        column = FEATURE_COLUMNS[FEATURE_SET_VOLATILITY].index("realized_vol_24h")
+        return matrix[valid], matrix[ahead[valid], column]
+
+    @staticmethod
+    def _fit_model(
+        model_type: str,
+        model: Any,
+        training_data: Dict[str, Any],
+        features: Optional[Tuple[np.ndarray, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Fit a model on its training data.
+
+        With features (X/y loaded from the feature store for
+        {"symbol", "timeframe", ...}) the model is fitted on them directly.
+        Otherwise SIGNAL_QUALITY expects {"signals": [...], "outcomes": [...]}
+        and VOLATILITY expects {"marketData": {...}, "horizon": 24} for a
+        continuous history, or {"samples": [...], "realizedVolatility": [...]}.
+        """
+        if features is not None:
+            return model.train_on_features(*features)
+
+        if model_type == "SIGNAL_QUALITY":
+            signals = training_data.get("signals") or []
+            outcomes = training_data.get("outcomes") or []
+            if not signals or len(signals) != len(outcomes):
+                raise ValueError("signals and outcomes must be non-empty and aligned")
+            return model.train(signals, outcomes)
+
+        if "marketData" in training_data:
+            return model.train_on_history(
+                training_data["marketData"],
+                horizon=int(training_data.get("horizon", 24)),
+            )
+
+        samples = training_data.get("samples") or []
+        targets = training_data.get("realizedVolatility") or []
+        if not samples or len(samples) != len(targets):
+            raise ValueError(
+                "samples and realizedVolatility must be non-empty and aligned"
+            )
+        return model.train(samples, targets)
+
+    async def get_model_training(self, training_id: int) -> Dict[str, Any]:
+        """Status and progress of a model training run."""
+        training = await self.prisma.mlmodeltraining.find_unique(
+            where={"id": training_id}
+        )
+        if not training:
+            raise ValueError(f"Training run {training_id} not found")
+
+        performance = json.loads(training.performance or "{}")
+        return {
+            "trainingJobId": training.id,
+            "modelType": training.modelType,
+            "version": training.modelVersion,
+            "status": training.status,
+            "stage": performance.pop("stage", training.status),
+            "progress": performance.pop(
+                "progress",
+                1.0 if training.status in (STATUS_COMPLETED, STATUS_ACTIVE) else 0.0,
+            ),
+            "performance": performance,
+            "startedAt": training.startedAt,
+            "completedAt": training.completedAt,
+            "error": training.errorMessage,
+        }
+
+    async def create_optimization(
+        self,
+        user_id: int,
+        strategy: str,
+        param_space: Dict[str, Dict[str, float]],
+        max_iterations: int,
+        method: str = "RL",
+    ) -> Any:
+        """
+        Record a queued strategy optimization.
+
+        Initial parameters are each parameter's "current" value, or the
+        middle of its min/max range. max_iterations is the number of
+        episodes (RL) or sampled candidates (SUCCESSIVE_HALVING).
+
+        Returns:
+            Created StrategyOptimization row
+        """
+        if strategy not in StrategyRegistry.list_names():
+            raise ValueError(f"Strategy {strategy} not registered")
+        if method not in OPTIMIZATION_METHODS:
+            raise ValueError(
+                f"Invalid method: {method}. "
+                f"Must be one of {', '.join(OPTIMIZATION_METHODS)}"
+            )
+        if not param_space:
+            raise ValueError("At least one parameter is required")
+        if max_iterations <= 0:
+            raise ValueError("maxIterations must be positive")
+        if method == "RL":
+            StrategyTuner(param_space).check_strategy(strategy)
+
+        initial_params = {
+            name: float(
+                spec.get("current", (spec.get("min", 0.0) + spec.get("max", 0.0)) / 2)
+            )
+            for name, spec in param_space.items()
+        }
+
+        return await self.prisma.strategyoptimization.create(
+            data={
+                "userId": user_id,
+                "strategy": strategy,
+                "originalParams": json.dumps(initial_params),
+                "optimizedParams": json.dumps({}),
+                "performance": json.dumps(
+                    {"paramSpace": param_space, "totalIterations": max_iterations}
+                ),
+                "method": method,
+                "status": STATUS_PENDING,
+            }
+        )
+
+    async def run_optimization(
+        self,
+        optimization_id: int,
+        symbol: str,
+        timeframe: str,
+        optimization_goal: str = "SHARPE_RATIO",
+        historical_data: Optional[List[Dict]] = None,
+        exchange: str = "binance",
+    ) -> Dict[str, Any]:
+        """
+        Run a queued strategy optimization.
+
+        Without historical_data, the last TUNING_CANDLES candles are fetched
+        with the user's exchange key. Episodes completed are written to
+        the iterations column while the tuner runs.
+
+        Returns:
+            Optimized parameters and performance
+        """
+        optimization = await self.prisma.strategyoptimization.find_unique(
+            where={"id": optimization_id}
+        )
+        if not optimization:
+            raise ValueError(f"Optimization {optimization_id} not found")
+
+        config = json.loads(optimization.performance)
+        total = config["totalIterations"]
+
+        try:
+            await self.prisma.strategyoptimization.update(
+                where={"id": optimization_id}, data={"status": STATUS_RUNNING}
+            )
+
+            if not historical_data:
+                historical_data = await self._fetch_history(
+                    exchange, optimization.userId, symbol, timeframe
+                )
+            if len(historical_data) < 2:
+                raise ValueError("Not enough historical data to tune on")
+
+            if optimization.method == "SUCCESSIVE_HALVING":
+                tuner = SuccessiveHalvingTuner(config["paramSpace"])
+            else:
+                tuner = StrategyTuner(config["paramSpace"], n_envs=TUNING_ENVS)
+            episodes_done = [0]
+
+            def on_progress(done: int, steps: int):
+                # Scale to the stored total (halving counts backtests)
+                episodes_done[0] = int(done / steps * total)
+
+            async def report():
+                await self.prisma.strategyoptimization.update(
+                    where={"id": optimization_id},
+                    data={"iterations": episodes_done[0]},
+                )
+
+            optimized_params, performance = await self._run_with_progress(
+                lambda: tuner.optimize(
+                    optimization.strategy,
+                    historical_data,
+                    json.loads(optimization.originalParams),
+                    max_episodes=total,
+                    optimization_goal=optimization_goal,
+                    progress_callback=on_progress,
+                ),
+                report,
+            )
+
+            await self.prisma.strategyoptimization.update(
+                where={"id": optimization_id},
+                data={
+                    "status": STATUS_COMPLETED,
+                    "iterations": total,
+                    "optimizedParams": json.dumps(optimized_params),
+                    "performance": json.dumps({**config, **performance}),
+                    "completedAt": datetime.utcnow(),
+                },
+            )
+            return {"optimizedParams": optimized_params, "performance": performance}
+
+        except Exception as e:
+            await self.prisma.strategyoptimization.update(
+                where={"id": optimization_id},
+                data={
+                    "status": STATUS_FAILED,
+                    "performance": json.dumps({**config, "error": str(e)}),
+                    "completedAt": datetime.utcnow(),
+                },
+            )
+            raise
+
+    async def get_optimization(self, optimization_id: int) -> Dict[str, Any]:
+        """Status, progress and (once completed) results of an optimization."""
+        optimization = await self.prisma.strategyoptimization.find_unique(
+            where={"id": optimization_id}
+        )
+        if not optimization:
+            raise ValueError(f"Optimization {optimization_id} not found")
+
+        performance = json.loads(optimization.performance or "{}")
+        total = performance.pop("totalIterations", 0)
+        performance.pop("paramSpace", None)
+
+        return {
+            "jobId": str(optimization.id),
+            "status": optimization.status,
+            "progress": optimization.iterations / total if total else 0.0,
+            "currentIteration": optimization.iterations,
+            "totalIterations": total,
+            "originalParams": json.loads(optimization.originalParams),
+            "optimizedParams": json.loads(optimization.optimizedParams),
+            "performance": performance,
+            "completedAt": optimization.completedAt,
+        }
+
+    async def _fetch_history(
+        self, exchange_name: str, user_id: int, symbol: str, timeframe: str
+    ) -> List[Dict]:
+        """Fetch recent candles with the user's exchange key."""
+        from src.services.exchange_service import ExchangeConnector
+
+        exchange = await ExchangeConnector.for_exchange(exchange_name, user_id)
+        ohlcv = await asyncio.to_thread(
+            exchange.fetch_ohlcv, symbol, timeframe=timeframe, limit=TUNING_CANDLES
+        )
+        return market_history(ohlcv)
+
+    async def _set_stage(self, training_id: int, stage: str):
+        """Record the current stage of a training run."""
+        await self.prisma.mlmodeltraining.update(
+            where={"id": training_id},
+            data={
+                "performance": json.dumps(
+                    {"stage": stage, "progress": STAGE_PROGRESS[stage]}
+                )
+            },
+        )
+
+    @staticmethod
+    async def _run_with_progress(
+        func: Callable[[], Any], report: Callable[[], Awaitable[None]]
+    ) -> Any:
+        """Run func in a thread, calling report every PROGRESS_INTERVAL."""
+        job = asyncio.ensure_future(asyncio.to_thread(func))
+        while True:
+            done, _ = await asyncio.wait({job}, timeout=PROGRESS_INTERVAL)
+            if done:
+                return job.result()
+            try:
+                await report()
+            except Exception as e:
+                logger.warning(f"Progress update failed: {e}")
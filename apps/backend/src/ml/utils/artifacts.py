@@ -0,0 +1,288 @@
+"""
+Model artifact storage without pickle.
+
+An artifact is a directory holding metadata.json (model type, version,
+feature order, estimator parameters and scaler statistics) and the tree
+arrays of a fitted random forest as plain .npy files. The arrays contain
+no Python objects, so loading never executes code from the file.
+
+The arrays are opened memory-mapped, but sklearn's Tree.__setstate__
+copies its nodes and values, so every process holds its own copy of the
+forest. Only arrays used directly from the load (such as the node values
+returned in the metadata) stay mapped and share the OS page cache.
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import sklearn
+from sklearn import ensemble
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree._tree import NODE_DTYPE, Tree
+
+ARTIFACT_FORMAT = 1
+
+# Legacy pickle files are only loaded when explicitly allowed
+ALLOW_PICKLE_MODELS = os.getenv("ML_ALLOW_PICKLE_MODELS", "false").lower() == "true"
+
+METADATA_FILE = "metadata.json"
+NODES_FILE = "nodes.npy"
+VALUES_FILE = "values.npy"
+OFFSETS_FILE = "offsets.npy"
+
+# Forest classes an artifact may rebuild (nothing else is ever instantiated)
+FOREST_CLASSES = {
+    "RandomForestClassifier": ensemble.RandomForestClassifier,
+    "RandomForestRegressor": ensemble.RandomForestRegressor,
+}
+
+
+def _json_safe(value: Any) -> Any:
+    """Convert NumPy scalars/arrays in metadata to plain JSON values."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return value
+
+
+def save_forest_artifact(
+    path: str,
+    model: Any,
+    scaler: StandardScaler,
+    is_trained: bool,
+    feature_names: Optional[Sequence[str]] = None,
+    extra: Optional[Dict[str, Any]] = None,
+):
+    """
+    Write a random forest and its scaler as an artifact directory.
+
+    Args:
+        path: Artifact directory (created if missing)
+        model: RandomForestClassifier or RandomForestRegressor
+        scaler: StandardScaler applied before the model
+        is_trained: Whether model and scaler are fitted
+        feature_names: Feature column order the model expects
+        extra: Additional metadata (e.g. model type and version)
+    """
+    estimator = type(model).__name__
+    if estimator not in FOREST_CLASSES:
+        raise ValueError(f"Unsupported model class: {estimator}")
+
+    os.makedirs(path, exist_ok=True)
+
+    metadata: Dict[str, Any] = {
+        "format": ARTIFACT_FORMAT,
+        "estimator": estimator,
+        "sklearnVersion": sklearn.__version__,
+        "params": {k: _json_safe(v) for k, v in model.get_params().items()},
+        "isTrained": is_trained,
+        "featureNames": list(feature_names) if feature_names else None,
+        **(extra or {}),
+    }
+
+    if is_trained:
+        trees = [tree.tree_ for tree in model.estimators_]
+        offsets = np.zeros(len(trees) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([tree.node_count for tree in trees])
+
+        # Pad class dimension so every tree's values stack into one array
+        max_classes = max(tree.value.shape[2] for tree in trees)
+        values = np.zeros(
+            (offsets[-1], model.n_outputs_, max_classes), dtype=np.float64
+        )
+        nodes = np.empty(offsets[-1], dtype=NODE_DTYPE)
+        for i, tree in enumerate(trees):
+            state = tree.__getstate__()
+            nodes[offsets[i] : offsets[i + 1]] = state["nodes"]
+            values[offsets[i] : offsets[i + 1], :, : tree.value.shape[2]] = state[
+                "values"
+            ]
+
+        np.save(os.path.join(path, NODES_FILE), nodes, allow_pickle=False)
+        np.save(os.path.join(path, VALUES_FILE), values, allow_pickle=False)
+        np.save(os.path.join(path, OFFSETS_FILE), offsets, allow_pickle=False)
+
+        metadata.update(
+            {
+                "nFeatures": int(model.n_features_in_),
+                "nOutputs": int(model.n_outputs_),
+                "classes": (
+                    _json_safe(model.classes_) if hasattr(model, "classes_") else None
+                ),
+                "treeMaxDepths": [int(tree.max_depth) for tree in trees],
+                "scaler": {
+                    "mean": _json_safe(scaler.mean_),
+                    "scale": _json_safe(scaler.scale_),
+                    "var": _json_safe(scaler.var_),
+                    "nSamplesSeen": _json_safe(scaler.n_samples_seen_),
+                },
+            }
+        )
+
+    # Metadata last: a directory without it is an incomplete artifact
+    with open(os.path.join(path, METADATA_FILE), "w") as f:
+        json.dump(metadata, f)
+
+
+def is_artifact(path: str) -> bool:
+    """Whether path is an artifact directory."""
+    return os.path.isfile(os.path.join(path, METADATA_FILE))
+
+
+def load_forest_artifact(
+    path: str, mmap: bool = True
+) -> Tuple[Any, StandardScaler, Dict[str, Any]]:
+    """
+    Rebuild a random forest and scaler from an artifact directory.
+
+    Args:
+        path: Artifact directory
+        mmap: Open tree arrays memory-mapped (read-only); the rebuilt
+            trees still copy them
+
+    Returns:
+        (model, scaler, metadata); the model is unfitted when the artifact
+        was saved untrained
+    """
+    with open(os.path.join(path, METADATA_FILE)) as f:
+        metadata = json.load(f)
+
+    if metadata.get("format") != ARTIFACT_FORMAT:
+        raise ValueError(f"Unsupported artifact format: {metadata.get('format')}")
+
+    forest_class = FOREST_CLASSES.get(metadata["estimator"])
+    if forest_class is None:
+        raise ValueError(f"Unsupported model class: {metadata['estimator']}")
+
+    valid_params = forest_class().get_params()
+    model = forest_class(
+        **{k: v for k, v in metadata["params"].items() if k in valid_params}
+    )
+    scaler = StandardScaler()
+
+    if not metadata["isTrained"]:
+        return model, scaler, metadata
+
+    mmap_mode = "r" if mmap else None
+    nodes = np.load(
+        os.path.join(path, NODES_FILE), mmap_mode=mmap_mode, allow_pickle=False
+    )
+    values = np.load(
+        os.path.join(path, VALUES_FILE), mmap_mode=mmap_mode, allow_pickle=False
+    )
+    offsets = np.load(os.path.join(path, OFFSETS_FILE), allow_pickle=False)
+
+    nodes = _as_node_dtype(nodes)
+    n_features = metadata["nFeatures"]
+    n_outputs = metadata["nOutputs"]
+    classes = metadata.get("classes")
+
+    if classes is not None:
+        n_classes = np.array([len(classes)], dtype=np.intp)
+        model.classes_ = np.array(classes)
+        model.n_classes_ = len(classes)
+    else:
+        n_classes = np.ones(n_outputs, dtype=np.intp)
+
+    tree_params = {p: getattr(model, p) for p in model.estimator_params}
+    tree_class = model._estimator.__class__ if hasattr(model, "_estimator") else None
+    if tree_class is None:
+        tree_class = model.estimator.__class__
+
+    estimators: List[Any] = []
+    for i, max_depth in enumerate(metadata["treeMaxDepths"]):
+        start, end = int(offsets[i]), int(offsets[i + 1])
+        tree = Tree(n_features, n_classes, n_outputs)
+        tree.__setstate__(
+            {
+                "max_depth": max_depth,
+                "node_count": end - start,
+                "nodes": nodes[start:end],
+                "values": np.ascontiguousarray(values[start:end, :, : n_classes.max()]),
+            }
+        )
+
+        estimator = tree_class(**tree_params)
+        estimator.tree_ = tree
+        estimator.n_features_in_ = n_features
+        estimator.n_outputs_ = n_outputs
+        if classes is not None:
+            estimator.classes_ = model.classes_
+            estimator.n_classes_ = model.n_classes_
+        estimators.append(estimator)
+
+    # Raw node outputs for callers that evaluate trees themselves
+    metadata["nodeValues"] = values
+    metadata["treeOffsets"] = offsets
+
+    model.estimators_ = estimators
+    model.n_features_in_ = n_features
+    model.n_outputs_ = n_outputs
+
+    scaler_stats = metadata["scaler"]
+    scaler.mean_ = np.array(scaler_stats["mean"])
+    scaler.scale_ = np.array(scaler_stats["scale"])
+    scaler.var_ = np.array(scaler_stats["var"])
+    scaler.n_samples_seen_ = scaler_stats["nSamplesSeen"]
+    scaler.n_features_in_ = n_features
+
+    return model, scaler, metadata
+
+
+def load_model_state(
+    path: str, expected_class: type
+) -> Tuple[Any, StandardScaler, bool, Dict[str, Any]]:
+    """
+    Load a model saved by save_forest_artifact (or a legacy pickle).
+
+    Legacy pickle files can execute arbitrary code when loaded, so they
+    are only read when ML_ALLOW_PICKLE_MODELS is enabled.
+
+    Args:
+        path: Artifact directory or legacy .pkl file
+        expected_class: Forest class the caller serves
+
+    Returns:
+        (model, scaler, is_trained, metadata)
+    """
+    if is_artifact(path):
+        model, scaler, metadata = load_forest_artifact(path)
+        is_trained = metadata["isTrained"]
+    elif os.path.isfile(path) and ALLOW_PICKLE_MODELS:
+        import pickle
+
+        with open(path, "rb") as f:
+            model_data = pickle.load(f)
+        model = model_data["model"]
+        scaler = model_data["scaler"]
+        is_trained = model_data["is_trained"]
+        metadata = {}
+    elif os.path.isfile(path):
+        raise ValueError(
+            f"Refusing to load pickle model {path}; "
+            "re-save it as an artifact or set ML_ALLOW_PICKLE_MODELS=true"
+        )
+    else:
+        raise ValueError(f"Model artifact not found: {path}")
+
+    if not isinstance(model, expected_class):
+        raise ValueError(
+            f"Expected {expected_class.__name__}, got {type(model).__name__}"
+        )
+
+    return model, scaler, is_trained, metadata
+
+
+def _as_node_dtype(nodes: np.ndarray) -> np.ndarray:
+    """Convert stored nodes to this sklearn version's node layout."""
+    if nodes.dtype == NODE_DTYPE:
+        return nodes
+
+    converted = np.zeros(len(nodes), dtype=NODE_DTYPE)
+    for name in NODE_DTYPE.names:
+        if name in nodes.dtype.names:
+            converted[name] = nodes[name]
+    return converted
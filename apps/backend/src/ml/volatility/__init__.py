@@ -1,6 +1,6 @@
 """Volatility prediction module."""
 
-from .features import VolatilityFeatures
+from .features import FEATURE_NAMES, VolatilityFeatures
 from .predictor import VolatilityPredictor
 
-__all__ = ["VolatilityPredictor", "VolatilityFeatures"]
+__all__ = ["VolatilityPredictor", "VolatilityFeatures", "FEATURE_NAMES"]
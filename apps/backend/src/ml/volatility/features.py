@@ -2,9 +2,44 @@
 Feature extraction for volatility prediction.
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Feature names in the (sorted) column order used by the models
+FEATURE_NAMES = (
+    "abs_returns_mean",
+    "high_low_range_mean",
+    "high_low_range_std",
+    "max_jump",
+    "momentum_1h",
+    "momentum_24h",
+    "momentum_6h",
+    "price_jumps",
+    "realized_vol_1h",
+    "realized_vol_24h",
+    "realized_vol_6h",
+    "returns_mean",
+    "returns_std",
+    "trend_strength",
+    "volume_current_ratio",
+    "volume_mean",
+    "volume_std",
+)
+
+
+def rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Sums of every full window, aligned to the window's last element."""
+    cumsum = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    return cumsum[window:] - cumsum[:-window]
+
+
+def rolling_mean_std(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Rolling mean and population std from running sums."""
+    mean = rolling_sum(values, window) / window
+    mean_sq = rolling_sum(values * values, window) / window
+    return mean, np.sqrt(np.maximum(mean_sq - mean * mean, 0.0))
 
 
 class VolatilityFeatures:
@@ -105,6 +140,115 @@ class VolatilityFeatures:
 
         return features
 
+    def extract_history(
+        self, market_data: Dict[str, Any], lookback: int = 25
+    ) -> Tuple[np.ndarray, List[str]]:
+        """
+        Extract features for every timestamp of a price history.
+
+        Row t holds the features extract() would return for the trailing
+        lookback candles ending at candle t (for t >= lookback - 1), but
+        all rows are computed in one vectorized pass using running sums,
+        including the rolling regression slope for trend strength.
+
+        Args:
+            market_data: Market data with close and optionally high, low
+                and volume sequences over the full history
+            lookback: Candles per sample (25 covers the 24h features)
+
+        Returns:
+            (n_candles - lookback + 1, n_features) array and the feature
+            names of its columns
+        """
+        close = np.asarray(market_data["close"], dtype=np.float64)
+        high = np.asarray(market_data.get("high", close), dtype=np.float64)
+        low = np.asarray(market_data.get("low", close), dtype=np.float64)
+        volume = np.asarray(
+            market_data.get("volume", np.full(len(close), 1000000.0)),
+            dtype=np.float64,
+        )
+
+        n = len(close)
+        if lookback < 2 or n < lookback:
+            return np.empty((0, len(FEATURE_NAMES))), list(FEATURE_NAMES)
+
+        rows = n - lookback + 1
+        n_returns = lookback - 1
+        returns = np.diff(close) / close[:-1]
+        abs_returns = np.abs(returns)
+        ends = np.arange(lookback - 1, n)  # Last candle of each sample
+
+        def last_returns(window: int) -> slice:
+            # Rolling windows over returns ending at each sample's last return
+            start = n_returns - window
+            return slice(start, start + rows)
+
+        columns = {}
+
+        # Historical volatility features (annualized)
+        columns["realized_vol_1h"] = np.zeros(rows)
+        for name, window, scale in (
+            ("realized_vol_6h", 6, 1460),
+            ("realized_vol_24h", 24, 365),
+        ):
+            if n_returns >= window:
+                _, std = rolling_mean_std(returns, window)
+                columns[name] = std[last_returns(window)] * np.sqrt(scale)
+            else:
+                columns[name] = np.full(rows, 0.02)
+
+        # Return features
+        mean, std = rolling_mean_std(returns, n_returns)
+        columns["returns_mean"] = mean
+        columns["returns_std"] = std
+        columns["abs_returns_mean"] = rolling_sum(abs_returns, n_returns) / n_returns
+
+        # Volume features
+        volume_mean, volume_std = rolling_mean_std(volume, lookback)
+        columns["volume_mean"] = volume_mean
+        columns["volume_std"] = volume_std
+        with np.errstate(divide="ignore", invalid="ignore"):
+            columns["volume_current_ratio"] = np.where(
+                volume_mean > 0, volume[ends] / volume_mean, 1.0
+            )
+
+        # Range features
+        range_mean, range_std = rolling_mean_std(high - low, lookback)
+        columns["high_low_range_mean"] = range_mean
+        columns["high_low_range_std"] = range_std
+
+        # Momentum features
+        for name, periods in (
+            ("momentum_1h", 1),
+            ("momentum_6h", 6),
+            ("momentum_24h", 24),
+        ):
+            if lookback >= periods + 1:
+                columns[name] = close[ends] / close[ends - periods] - 1
+            else:
+                columns[name] = np.zeros(rows)
+
+        # Price jump features
+        columns["price_jumps"] = rolling_sum(
+            (abs_returns > 0.01).astype(np.float64), n_returns
+        )
+        columns["max_jump"] = sliding_window_view(abs_returns, n_returns).max(axis=1)
+
+        # Trend strength: least-squares slope of close on x = 0..lookback-1
+        # per window, as a correlation with the centered index (running
+        # index * close sums lose precision on long histories)
+        centered = np.arange(lookback) - (lookback - 1) / 2
+        slope = np.convolve(close, centered[::-1], "valid") / np.dot(centered, centered)
+        y_sum = rolling_sum(close, lookback)
+        price_mean = y_sum / lookback
+        with np.errstate(divide="ignore", invalid="ignore"):
+            columns["trend_strength"] = np.where(
+                price_mean > 0, slope / price_mean, 0.0
+            )
+
+        matrix = np.column_stack([columns[name] for name in FEATURE_NAMES])
+        return matrix, list(FEATURE_NAMES)
+
     def _count_price_jumps(self, returns: np.ndarray, threshold: float = 0.01) -> int:
         """Count significant price jumps."""
         if len(returns) == 0:
@@ -3,13 +3,14 @@ Volatility prediction using machine learning.
 """
 
 import os
-import pickle
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import numpy as np
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import StandardScaler
 
+from ..utils.artifacts import load_model_state, save_forest_artifact
+
 
 class VolatilityPredictor:
     """ML-based volatility prediction system."""
@@ -26,6 +27,8 @@ class VolatilityPredictor:
         )
         self.scaler = StandardScaler()
         self.is_trained = False
+        # Concatenated node outputs of all trees and each tree's start offset
+        self._leaf_values = None
 
         if model_path and os.path.exists(model_path):
             self.load_model(model_path)
@@ -52,19 +55,76 @@ class VolatilityPredictor:
         X = np.array([[f[key] for key in sorted(f.keys())] for f in features])
         y = np.array(realized_volatility)
 
+        return self._fit(X, y)
+
+    def train_on_history(
+        self, market_data: Dict[str, Any], horizon: int = 24, lookback: int = 25
+    ) -> Dict[str, float]:
+        """
+        Train on every timestamp of a continuous price history.
+
+        Features for all samples come from one vectorized pass; the target
+        at each candle is the realized volatility of the following horizon
+        returns, annualized like realized_vol_24h.
+
+        Args:
+            market_data: Market data with close/high/low/volume sequences
+            horizon: Candles ahead to measure realized volatility over
+            lookback: Candles per feature sample
+
+        Returns:
+            Training metrics
+        """
+        from .features import VolatilityFeatures, rolling_mean_std
+
+        X, _ = VolatilityFeatures().extract_history(market_data, lookback=lookback)
+
+        close = np.asarray(market_data["close"], dtype=np.float64)
+        returns = np.diff(close) / close[:-1]
+        if len(returns) < horizon:
+            raise ValueError("Not enough history for the prediction horizon")
+
+        # Forward std of returns[t : t + horizon] for each candle t
+        _, forward_std = rolling_mean_std(returns, horizon)
+        forward_vol = forward_std * np.sqrt(365)
+
+        # Keep candles with both a full lookback and a full horizon
+        first = lookback - 1
+        samples = len(forward_vol) - first
+        if samples <= 0:
+            raise ValueError("Not enough history for lookback and horizon")
+
+        return self._fit(X[:samples], forward_vol[first : first + samples])
+
+    def train_on_features(self, X: np.ndarray, y: np.ndarray) -> Dict[str, float]:
+        """
+        Train on precomputed feature rows, e.g. read from the feature store.
+
+        Args:
+            X: (N, n_features) matrix in FEATURE_NAMES column order
+            y: Realized volatility target of each row
+
+        Returns:
+            Training metrics
+        """
+        return self._fit(np.asarray(X, dtype=np.float64), np.asarray(y))
+
+    def _fit(self, X: np.ndarray, y: np.ndarray) -> Dict[str, float]:
+        """Fit scaler and model on a feature matrix."""
         # Fit scaler and transform features
         X_scaled = self.scaler.fit_transform(X)
 
         # Train model
         self.model.fit(X_scaled, y)
         self.is_trained = True
+        self._leaf_values = None
 
         # Calculate training metrics
         predictions = self.model.predict(X_scaled)
         mae = np.mean(np.abs(predictions - y))
         rmse = np.sqrt(np.mean((predictions - y) ** 2))
 
-        return {"mae": float(mae), "rmse": float(rmse), "samples": len(historical_data)}
+        return {"mae": float(mae), "rmse": float(rmse), "samples": len(y)}
 
     def predict_volatility(
         self, market_data: Dict[str, Any], horizon: int = 24
@@ -79,82 +139,164 @@ class VolatilityPredictor:
         Returns:
             Volatility prediction with confidence interval
         """
-        from .features import VolatilityFeatures
+        return self.predict_volatility_batch([market_data], horizon=horizon)[0]
+
+    def predict_volatility_batch(
+        self, market_data: List[Dict[str, Any]], horizon: int = 24
+    ) -> List[Dict[str, Any]]:
+        """
+        Predict future volatility for many symbols at once.
+
+        Every tree's prediction for the whole batch is computed in one
+        vectorized pass (leaf lookup), and the point estimate and
+        confidence interval are reduced from that (N, n_trees) matrix.
+
+        Args:
+            market_data: Current market data, one entry per symbol
+            horizon: Prediction horizon in hours
+
+        Returns:
+            Volatility predictions in the same order as market_data
+        """
+        from .features import FEATURE_NAMES, VolatilityFeatures
 
         if not self.is_trained:
-            # Return default volatility if not trained
-            return {
-                "predicted": 0.02,
-                "confidence": 0.0,
-                "range": {"low": 0.015, "high": 0.025},
-                "horizon": horizon,
-                "regime": "UNKNOWN",
-                "risk": "MODERATE",
-            }
+            return [self._default_prediction(horizon) for _ in market_data]
 
         extractor = VolatilityFeatures()
-        features = extractor.extract(market_data)
+        features = [extractor.extract(data) for data in market_data]
 
         # Convert to array in sorted key order
-        X = np.array([[features[key] for key in sorted(features.keys())]])
-        X_scaled = self.scaler.transform(X)
+        X = np.array([[f[key] for key in FEATURE_NAMES] for f in features])
+        return self.predict_from_features(X, horizon=horizon)
 
-        # Get prediction
-        predicted_vol = self.model.predict(X_scaled)[0]
+    def predict_from_features(
+        self, X: np.ndarray, horizon: int = 24
+    ) -> List[Dict[str, Any]]:
+        """
+        Predict volatility from precomputed feature rows.
 
-        # Get confidence interval from individual trees
-        tree_predictions = np.array(
-            [tree.predict(X_scaled)[0] for tree in self.model.estimators_]
-        )
+        Args:
+            X: (N, n_features) matrix in FEATURE_NAMES column order, e.g.
+                rows read from the feature store
+            horizon: Prediction horizon in hours
 
-        confidence = (
-            1 - (np.std(tree_predictions) / np.mean(tree_predictions))
-            if np.mean(tree_predictions) > 0
-            else 0
-        )
-        lower = np.percentile(tree_predictions, 10)
-        upper = np.percentile(tree_predictions, 90)
-
-        # Determine volatility regime
-        current_vol = features.get("realized_vol_24h", 0.02)
-        if predicted_vol > current_vol * 1.2:
-            regime = "INCREASING_VOLATILITY"
-            risk = "HIGH"
-        elif predicted_vol < current_vol * 0.8:
-            regime = "DECREASING_VOLATILITY"
-            risk = "LOW"
-        else:
-            regime = "STABLE_VOLATILITY"
-            risk = "MODERATE"
+        Returns:
+            Volatility predictions in row order
+        """
+        from .features import FEATURE_NAMES
+
+        if not self.is_trained:
+            return [self._default_prediction(horizon) for _ in range(len(X))]
 
+        X = np.asarray(X, dtype=np.float64)
+        features = [dict(zip(FEATURE_NAMES, row.tolist())) for row in X]
+        X_scaled = self.scaler.transform(X)
+
+        # Per-tree predictions, shape (N, n_trees); the forest's prediction
+        # is their mean
+        tree_predictions = self._tree_predictions(X_scaled)
+        predicted = tree_predictions.mean(axis=1)
+        spread = tree_predictions.std(axis=1)
+        lower, upper = np.percentile(tree_predictions, [10, 90], axis=1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            confidence = np.where(predicted > 0, 1 - spread / predicted, 0.0)
+        confidence = np.clip(confidence, 0, 1)
+
+        results = []
+        for i, feature_row in enumerate(features):
+            predicted_vol = predicted[i]
+
+            # Determine volatility regime
+            current_vol = feature_row.get("realized_vol_24h", 0.02)
+            if predicted_vol > current_vol * 1.2:
+                regime = "INCREASING_VOLATILITY"
+                risk = "HIGH"
+            elif predicted_vol < current_vol * 0.8:
+                regime = "DECREASING_VOLATILITY"
+                risk = "LOW"
+            else:
+                regime = "STABLE_VOLATILITY"
+                risk = "MODERATE"
+
+            results.append(
+                {
+                    "predicted": float(predicted_vol),
+                    "confidence": float(confidence[i]),
+                    "range": {"low": float(lower[i]), "high": float(upper[i])},
+                    "horizon": horizon,
+                    "regime": regime,
+                    "risk": risk,
+                    "features": feature_row,
+                }
+            )
+
+        return results
+
+    def _default_prediction(self, horizon: int) -> Dict[str, Any]:
+        """Default volatility returned while the model is not trained."""
         return {
-            "predicted": float(predicted_vol),
-            "confidence": float(max(0, min(1, confidence))),
-            "range": {"low": float(lower), "high": float(upper)},
+            "predicted": 0.02,
+            "confidence": 0.0,
+            "range": {"low": 0.015, "high": 0.025},
             "horizon": horizon,
-            "regime": regime,
-            "risk": risk,
-            "features": features,
+            "regime": "UNKNOWN",
+            "risk": "MODERATE",
         }
 
-    def save_model(self, path: str):
-        """Save trained model to file."""
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-
-        model_data = {
-            "model": self.model,
-            "scaler": self.scaler,
-            "is_trained": self.is_trained,
-        }
+    def _tree_predictions(self, X_scaled: np.ndarray) -> np.ndarray:
+        """Predictions of every tree for every row, shape (N, n_trees)."""
+        if self._leaf_values is None:
+            trees = [estimator.tree_ for estimator in self.model.estimators_]
+            offsets = np.zeros(len(trees), dtype=np.intp)
+            offsets[1:] = np.cumsum([t.node_count for t in trees])[:-1]
+            values = np.concatenate([t.value[:, 0, 0] for t in trees])
+            self._leaf_values = (values, offsets)
+
+        # Leaf index reached in each tree, shape (N, n_trees)
+        values, offsets = self._leaf_values
+        leaves = self.model.apply(X_scaled.astype(np.float32))
+        return values[leaves + offsets]
+
+    def save_model(self, path: str, version: Optional[str] = None):
+        """
+        Save the model as a pickle-free artifact directory.
 
-        with open(path, "wb") as f:
-            pickle.dump(model_data, f)
+        Args:
+            path: Artifact directory
+            version: Model version recorded in the metadata (optional)
+        """
+        from .features import FEATURE_NAMES
+
+        save_forest_artifact(
+            path,
+            self.model,
+            self.scaler,
+            self.is_trained,
+            feature_names=FEATURE_NAMES,
+            extra={"modelType": "VOLATILITY", "version": version},
+        )
 
     def load_model(self, path: str):
-        """Load trained model from file."""
-        with open(path, "rb") as f:
-            model_data = pickle.load(f)
+        """Load a model artifact (only the leaf values stay memory-mapped)."""
+        from .features import FEATURE_NAMES
 
-        self.model = model_data["model"]
-        self.scaler = model_data["scaler"]
-        self.is_trained = model_data["is_trained"]
+        model, scaler, is_trained, metadata = load_model_state(
+            path, RandomForestRegressor
+        )
+        feature_names = metadata.get("featureNames")
+        if feature_names and feature_names != list(FEATURE_NAMES):
+            raise ValueError(f"Feature order of {path} does not match this build")
+
+        self.model = model
+        self.scaler = scaler
+        self.is_trained = is_trained
+        self._leaf_values = None
+        if is_trained and "nodeValues" in metadata:
+            # Memory-mapped straight from the artifact, no per-process copy
+            # (the trees themselves copy their arrays on load)
+            self._leaf_values = (
+                metadata["nodeValues"][:, 0, 0],
+                metadata["treeOffsets"][:-1],
+            )
@@ -14,6 +14,8 @@ from typing import Any, Dict, List, Optional, Type
 
 from prisma import Prisma
 
+from src.utils.database import get_prisma
+
 logger = logging.getLogger(__name__)
 
 
@@ -82,8 +84,8 @@ class IndicatorPlugin(PluginInterface):
 class PluginLoader:
     """Service for loading and managing plugins"""
 
-    def __init__(self):
-        self.prisma = Prisma()
+    def __init__(self, prisma: Optional[Prisma] = None):
+        self.prisma = prisma or get_prisma()
         self.loaded_plugins: Dict[str, Type[PluginInterface]] = {}
         self.plugin_instances: Dict[str, PluginInterface] = {}
         self.verify_signatures = (
@@ -153,128 +155,108 @@ class PluginLoader:
         description: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Register a plugin in the database"""
-        await self.prisma.connect()
-
-        try:
-            # Check if plugin already exists
-            existing = await self.prisma.plugin.find_first(where={"name": name})
-
-            if existing:
-                # Update existing plugin
-                plugin = await self.prisma.plugin.update(
-                    where={"id": existing.id},
-                    data={
-                        "version": version,
-                        "type": plugin_type,
-                        "entryPoint": entry_point,
-                        "author": author,
-                        "description": description,
-                    },
-                )
-            else:
-                # Create new plugin
-                plugin = await self.prisma.plugin.create(
-                    data={
-                        "name": name,
-                        "version": version,
-                        "type": plugin_type,
-                        "entryPoint": entry_point,
-                        "author": author,
-                        "description": description,
-                        "verified": False,  # Manual verification required
-                    }
-                )
-
-            return {
-                "id": plugin.id,
-                "name": plugin.name,
-                "version": plugin.version,
-                "type": plugin.type,
-            }
-        finally:
-            await self.prisma.disconnect()
+        # Check if plugin already exists
+        existing = await self.prisma.plugin.find_first(where={"name": name})
+
+        if existing:
+            # Update existing plugin
+            plugin = await self.prisma.plugin.update(
+                where={"id": existing.id},
+                data={
+                    "version": version,
+                    "type": plugin_type,
+                    "entryPoint": entry_point,
+                    "author": author,
+                    "description": description,
+                },
+            )
+        else:
+            # Create new plugin
+            plugin = await self.prisma.plugin.create(
+                data={
+                    "name": name,
+                    "version": version,
+                    "type": plugin_type,
+                    "entryPoint": entry_point,
+                    "author": author,
+                    "description": description,
+                    "verified": False,  # Manual verification required
+                }
+            )
+
+        return {
+            "id": plugin.id,
+            "name": plugin.name,
+            "version": plugin.version,
+            "type": plugin.type,
+        }
 
     async def install_plugin_for_user(
         self, user_id: int, plugin_name: str, config: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Install a plugin for a specific user"""
-        await self.prisma.connect()
+        # Find plugin
+        plugin = await self.prisma.plugin.find_first(where={"name": plugin_name})
 
-        try:
-            # Find plugin
-            plugin = await self.prisma.plugin.find_first(where={"name": plugin_name})
+        if not plugin:
+            raise ValueError(f"Plugin not found: {plugin_name}")
 
-            if not plugin:
-                raise ValueError(f"Plugin not found: {plugin_name}")
+        # Check if already installed
+        existing = await self.prisma.userplugin.find_first(
+            where={"userId": user_id, "pluginId": plugin.id}
+        )
 
-            # Check if already installed
-            existing = await self.prisma.userplugin.find_first(
-                where={"userId": user_id, "pluginId": plugin.id}
+        if existing:
+            # Update configuration
+            user_plugin = await self.prisma.userplugin.update(
+                where={"id": existing.id},
+                data={
+                    "config": json.dumps(config) if config else None,
+                    "enabled": True,
+                },
+            )
+        else:
+            # Create new installation
+            user_plugin = await self.prisma.userplugin.create(
+                data={
+                    "userId": user_id,
+                    "pluginId": plugin.id,
+                    "enabled": True,
+                    "config": json.dumps(config) if config else None,
+                }
             )
 
-            if existing:
-                # Update configuration
-                user_plugin = await self.prisma.userplugin.update(
-                    where={"id": existing.id},
-                    data={
-                        "config": json.dumps(config) if config else None,
-                        "enabled": True,
-                    },
-                )
-            else:
-                # Create new installation
-                user_plugin = await self.prisma.userplugin.create(
-                    data={
-                        "userId": user_id,
-                        "pluginId": plugin.id,
-                        "enabled": True,
-                        "config": json.dumps(config) if config else None,
-                    }
-                )
-
-            return {
-                "user_plugin_id": user_plugin.id,
-                "plugin_name": plugin.name,
-                "enabled": user_plugin.enabled,
-            }
-        finally:
-            await self.prisma.disconnect()
+        return {
+            "user_plugin_id": user_plugin.id,
+            "plugin_name": plugin.name,
+            "enabled": user_plugin.enabled,
+        }
 
     async def toggle_plugin(self, user_plugin_id: int, enabled: bool) -> Dict[str, Any]:
         """Enable or disable a plugin for a user"""
-        await self.prisma.connect()
-
-        try:
-            user_plugin = await self.prisma.userplugin.update(
-                where={"id": user_plugin_id}, data={"enabled": enabled}
-            )
+        user_plugin = await self.prisma.userplugin.update(
+            where={"id": user_plugin_id}, data={"enabled": enabled}
+        )
 
-            return {"user_plugin_id": user_plugin.id, "enabled": user_plugin.enabled}
-        finally:
-            await self.prisma.disconnect()
+        return {"user_plugin_id": user_plugin.id, "enabled": user_plugin.enabled}
 
     async def get_user_plugins(self, user_id: int) -> List[Dict[str, Any]]:
         """Get all plugins installed for a user"""
-        await self.prisma.connect()
-
-        try:
-            user_plugins = await self.prisma.userplugin.find_many(
-                where={"userId": user_id}, include={"plugin": True}
-            )
+        user_plugins = await self.prisma.userplugin.find_many(
+            where={"userId": user_id}, include={"plugin": True}
+        )
 
-            return [
-                {
-                    "user_plugin_id": up.id,
-                    "plugin_name": up.plugin.name,
-                    "plugin_version": up.plugin.version,
-                    "plugin_type": up.plugin.type,
-                    "enabled": up.enabled,
-                    "config": json.loads(up.config) if up.config else {},
-                }
-                for up in user_plugins
-            ]
-        finally:
-            await self.prisma.disconnect()
+        return [
+            {
+                "user_plugin_id": up.id,
+                "plugin_name": up.plugin.name,
+                "plugin_version": up.plugin.version,
+                "plugin_type": up.plugin.type,
+                "enabled": up.enabled,
+                "config": json.loads(up.config) if up.config else {},
+            }
+            for up in user_plugins
+        ]
 
     def load_plugin(self, plugin_name: str, config: Dict[str, Any]) -> PluginInterface:
         """
@@ -323,22 +305,17 @@ class PluginLoader:
 
     async def list_available_plugins(self) -> List[Dict[str, Any]]:
         """List all available plugins from database"""
-        await self.prisma.connect()
-
-        try:
-            plugins = await self.prisma.plugin.find_many()
-
-            return [
-                {
-                    "id": p.id,
-                    "name": p.name,
-                    "version": p.version,
-                    "type": p.type,
-                    "author": p.author,
-                    "description": p.description,
-                    "verified": p.verified,
-                }
-                for p in plugins
-            ]
-        finally:
-            await self.prisma.disconnect()
+        plugins = await self.prisma.plugin.find_many()
+
+        return [
+            {
+                "id": p.id,
+                "name": p.name,
+                "version": p.version,
+                "type": p.type,
+                "author": p.author,
+                "description": p.description,
+                "verified": p.verified,
+            }
+            for p in plugins
+        ]
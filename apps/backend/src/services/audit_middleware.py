@@ -4,30 +4,53 @@
 // Author: ZeaZDev Meta-Intelligence (Generated) //
 // --- DO NOT EDIT HEADER --- //"""
 
-from typing import Callable
-
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
-
-from src.services.audit_service import AuditService
-
-
-class AuditMiddleware(BaseHTTPMiddleware):
-    """Middleware to automatically log all API requests to audit trail"""
-
-    def __init__(self, app: ASGIApp):
-        super().__init__(app)
-        self.audit_service = AuditService()
-
-    def get_user_id(self, request: Request) -> int:
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from starlette.datastructures import Headers, QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.services.audit_writer import get_audit_writer
+
+
+class AuditMiddleware:
+    """
+    Pure ASGI middleware to automatically log all API requests to audit trail
+
+    Observes the response status from the ``http.response.start`` message and
+    passes every message straight through, so response bodies (including
+    streaming responses) are never wrapped or buffered. Request bodies are
+    captured from the ``receive`` channel as the app reads them.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        capture_body: Optional[bool] = None,
+        max_body_bytes: Optional[int] = None,
+    ):
+        self.app = app
+        self.audit_writer = get_audit_writer()
+        self.capture_body = (
+            capture_body
+            if capture_body is not None
+            else os.getenv("AUDIT_CAPTURE_REQUEST_BODY", "false").lower() == "true"
+        )
+        self.max_body_bytes = max_body_bytes or int(
+            os.getenv("AUDIT_MAX_BODY_BYTES", "4096")
+        )
+
+    def get_user_id(self, scope: Scope, headers: Headers) -> Optional[int]:
         """Extract user ID from request (if available)"""
         # Try to get from request state (set by auth middleware)
-        if hasattr(request.state, "user_id"):
-            return request.state.user_id
+        state = scope.get("state") or {}
+        if state.get("user_id") is not None:
+            return state["user_id"]
 
         # Try to get from headers (simple implementation)
-        user_id_header = request.headers.get("X-User-Id")
+        user_id_header = headers.get("x-user-id")
         if user_id_header:
             try:
                 return int(user_id_header)
@@ -70,53 +93,114 @@ class AuditMiddleware(BaseHTTPMiddleware):
 
         return True
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Process request and log to audit trail"""
+    def parse_body(
+        self, chunks: List[bytes], truncated: bool, headers: Headers
+    ) -> Optional[Any]:
+        """Decode a captured JSON request body (other content types are skipped)"""
+        if not chunks:
+            return None
+        if truncated:
+            return {"truncated": True}
+        if "application/json" not in headers.get("content-type", ""):
+            return None
 
-        # Process the request
-        response = await call_next(request)
+        try:
+            return json.loads(b"".join(chunks))
+        except ValueError:
+            return None
 
-        # Check if we should log this request
-        if not self.should_log(request.url.path):
-            return response
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process request and log to audit trail"""
+        if scope["type"] != "http" or not self.should_log(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+        body_chunks: List[bytes] = []
+        body_size = 0
+        body_truncated = False
+
+        async def receive_with_capture() -> Message:
+            nonlocal body_size, body_truncated
+            message = await receive()
+            if message["type"] == "http.request" and not body_truncated:
+                chunk = message.get("body", b"")
+                body_size += len(chunk)
+                if body_size > self.max_body_bytes:
+                    body_truncated = True
+                    body_chunks.clear()
+                elif chunk:
+                    body_chunks.append(chunk)
+            return message
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
 
-        # Extract request information
-        user_id = self.get_user_id(request)
-        action = self.get_action_from_method(request.method, request.url.path)
-        resource = request.url.path
-        method = request.method
-        status_code = response.status_code
-        ip_address = request.client.host if request.client else None
-        user_agent = request.headers.get("user-agent")
+        try:
+            await self.app(
+                scope,
+                receive_with_capture if self.capture_body else receive,
+                send_with_status,
+            )
+        finally:
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            await self.log_request(
+                scope,
+                status_code,
+                duration_ms,
+                body_chunks,
+                body_truncated,
+            )
 
-        # Get request data (query params and body)
-        request_data = {}
+    async def log_request(
+        self,
+        scope: Scope,
+        status_code: int,
+        duration_ms: float,
+        body_chunks: List[bytes],
+        body_truncated: bool,
+    ):
+        """Queue the completed request for the audit writer"""
+        headers = Headers(scope=scope)
+        path = scope["path"]
+        method = scope["method"]
+        client = scope.get("client")
+
+        # Get request data (query params, path params and body)
+        request_data: Dict[str, Any] = {}
 
         # Add query parameters
-        if request.query_params:
-            request_data["query"] = dict(request.query_params)
+        if scope.get("query_string"):
+            request_data["query"] = dict(QueryParams(scope["query_string"]))
 
-        # Add path parameters
-        if hasattr(request, "path_params") and request.path_params:
-            request_data["path"] = request.path_params
+        # Add path parameters (filled in by the router)
+        if scope.get("path_params"):
+            request_data["path"] = scope["path_params"]
 
-        # Note: We can't easily get the request body here because it's already been consumed
-        # If you need body logging, you'd need to implement a custom Request class
+        if self.capture_body:
+            body = self.parse_body(body_chunks, body_truncated, headers)
+            if body is not None:
+                request_data["body"] = body
 
-        # Log to audit trail (async, non-blocking)
+        # Queue for the background batch writer (no DB round trip here)
         try:
-            await self.audit_service.log_api_call(
-                user_id=user_id,
-                action=action,
-                resource=resource,
-                method=method,
-                status_code=status_code,
-                ip_address=ip_address,
-                user_agent=user_agent,
-                request_data=request_data if request_data else None,
+            await self.audit_writer.enqueue(
+                {
+                    "user_id": self.get_user_id(scope, headers),
+                    "action": self.get_action_from_method(method, path),
+                    "resource": path,
+                    "method": method,
+                    "status_code": status_code,
+                    "ip_address": client[0] if client else None,
+                    "user_agent": headers.get("user-agent"),
+                    "request_data": request_data if request_data else None,
+                    "metadata": {"durationMs": round(duration_ms, 2)},
+                }
             )
         except Exception as e:
             # Don't fail the request if audit logging fails
             print(f"Audit logging error: {e}")
-
-        return response
@@ -4,35 +4,89 @@
 // Author: ZeaZDev Meta-Intelligence (Generated) //
 // --- DO NOT EDIT HEADER --- //"""
 
+import base64
+import binascii
 import json
+import logging
 import os
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from prisma import Prisma
+from prisma.errors import DataError
+
+from src.utils.database import get_prisma
+
+logger = logging.getLogger(__name__)
 
 # Sensitive fields to sanitize from logs
 SENSITIVE_FIELDS = os.getenv(
     "AUDIT_SENSITIVE_FIELDS", "password,secret,token,api_key"
 ).split(",")
 
+# Max rollup rows per upsert statement (4 bind parameters each)
+STATS_UPSERT_CHUNK = 1000
+
+# Rows fetched per keyset query when streaming exports
+EXPORT_BATCH_SIZE = int(os.getenv("AUDIT_EXPORT_BATCH_SIZE", "1000"))
+
+# Monthly AuditLog partitions are named AuditLog_pYYYY_MM
+PARTITION_NAME_PATTERN = re.compile(r"^AuditLog_p(\d{4})_(\d{2})$")
+
+# Catch-all partition for rows outside the maintained months
+DEFAULT_PARTITION = "AuditLog_default"
+
+
+def _hour_bucket(dt: datetime) -> datetime:
+    """Truncate a datetime to its naive-UTC hour bucket"""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt.replace(minute=0, second=0, microsecond=0)
+
+
+def encode_cursor(created_at: datetime, log_id: int) -> str:
+    """Encode a (createdAt, id) keyset position as an opaque cursor"""
+    raw = f"{created_at.isoformat()}|{log_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        created_at, log_id = base64.urlsafe_b64decode(cursor).decode().split("|")
+        return datetime.fromisoformat(created_at), int(log_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def _month_start(dt: datetime) -> datetime:
+    """First instant of the month containing dt"""
+    return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_month(dt: datetime) -> datetime:
+    """First instant of the month after dt"""
+    month_start = _month_start(dt)
+    if month_start.month == 12:
+        return month_start.replace(year=month_start.year + 1, month=1)
+    return month_start.replace(month=month_start.month + 1)
+
 
 class AuditService:
     """Service for managing audit logs"""
 
-    def __init__(self):
-        self.prisma = Prisma()
+    def __init__(self, prisma: Optional[Prisma] = None):
+        self.prisma = prisma or get_prisma()
         self.retention_days = int(os.getenv("AUDIT_LOG_RETENTION_DAYS", "90"))
-
-    async def connect(self):
-        """Connect to database"""
-        if not self.prisma.is_connected():
-            await self.prisma.connect()
-
-    async def disconnect(self):
-        """Disconnect from database"""
-        if self.prisma.is_connected():
-            await self.prisma.disconnect()
+        self.partition_months_ahead = int(
+            os.getenv("AUDIT_PARTITION_MONTHS_AHEAD", "3")
+        )
 
     def sanitize_data(self, data: Any) -> str:
         """
@@ -66,6 +120,52 @@ class AuditService:
         else:
             return json.dumps(data)
 
+    def build_log_data(
+        self,
+        user_id: Optional[int],
+        action: str,
+        resource: str,
+        method: str,
+        status_code: int,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        request_data: Optional[Dict[str, Any]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        created_at: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build a sanitized AuditLog row from API call details
+
+        Args:
+            user_id: User ID making the request (None for unauthenticated)
+            action: Action type (CREATE, READ, UPDATE, DELETE, LOGIN, LOGOUT)
+            resource: API endpoint or resource identifier
+            method: HTTP method (GET, POST, PUT, DELETE)
+            status_code: HTTP status code
+            ip_address: Client IP address
+            user_agent: User agent string
+            request_data: Request body/parameters
+            metadata: Additional context
+            created_at: Time of the call (defaults to database time)
+
+        Returns:
+            Data dict for auditlog.create / create_many
+        """
+        data = {
+            "userId": user_id,
+            "action": action,
+            "resource": resource,
+            "method": method,
+            "statusCode": status_code,
+            "ipAddress": ip_address,
+            "userAgent": user_agent,
+            "requestData": self.sanitize_data(request_data) if request_data else None,
+            "metadata": self.sanitize_data(metadata) if metadata else None,
+        }
+        if created_at is not None:
+            data["createdAt"] = created_at
+        return data
+
     async def log_api_call(
         self,
         user_id: Optional[int],
@@ -81,6 +181,9 @@ class AuditService:
         """
         Log an API call to the audit trail
 
+        Writes a single row immediately. Request-path logging should go
+        through AuditLogWriter, which batches inserts in the background.
+
         Args:
             user_id: User ID making the request (None for unauthenticated)
             action: Action type (CREATE, READ, UPDATE, DELETE, LOGIN, LOGOUT)
@@ -95,25 +198,19 @@ class AuditService:
         Returns:
             Created audit log record
         """
-        await self.connect()
-
-        # Sanitize request data
-        sanitized_request = self.sanitize_data(request_data) if request_data else None
-        sanitized_metadata = self.sanitize_data(metadata) if metadata else None
-
-        audit_log = await self.prisma.auditlog.create(
-            data={
-                "userId": user_id,
-                "action": action,
-                "resource": resource,
-                "method": method,
-                "statusCode": status_code,
-                "ipAddress": ip_address,
-                "userAgent": user_agent,
-                "requestData": sanitized_request,
-                "metadata": sanitized_metadata,
-            }
+        data = self.build_log_data(
+            user_id=user_id,
+            action=action,
+            resource=resource,
+            method=method,
+            status_code=status_code,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            request_data=request_data,
+            metadata=metadata,
         )
+        audit_log = await self.prisma.auditlog.create(data=data)
+        await self.update_hourly_stats([{**data, "createdAt": audit_log.createdAt}])
 
         return {
             "id": audit_log.id,
@@ -123,6 +220,158 @@ class AuditService:
             "createdAt": audit_log.createdAt.isoformat(),
         }
 
+    async def create_logs(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert a batch of prepared audit log rows
+
+        Falls back to row-by-row inserts if the batch is rejected for its
+        data, so one bad row (e.g. unknown userId) does not discard the
+        whole batch. Any other error (e.g. the database is unreachable) is
+        raised without retrying row by row.
+
+        Args:
+            rows: Rows built with build_log_data()
+
+        Returns:
+            Number of rows written
+        """
+        if not rows:
+            return 0
+
+        try:
+            await self.prisma.auditlog.create_many(data=rows)
+            written_rows = rows
+        except DataError as e:
+            logger.warning(f"Audit batch insert failed, retrying per row: {e}")
+            written_rows = []
+            for row in rows:
+                try:
+                    await self.prisma.auditlog.create(data=row)
+                    written_rows.append(row)
+                except Exception as e:
+                    logger.error(f"Dropping audit log row: {e}")
+
+        try:
+            await self.update_hourly_stats(written_rows)
+        except Exception as e:
+            # The logs are written; only the rollup misses them
+            logger.error(f"Audit hourly stats update failed: {e}")
+        return len(written_rows)
+
+    async def update_hourly_stats(self, rows: List[Dict[str, Any]]):
+        """
+        Add written audit log rows to the hourly rollup table
+
+        Counts are aggregated in memory per (hour, dimension, key) and
+        merged with a single INSERT ... ON CONFLICT upsert per chunk.
+
+        Args:
+            rows: Audit log rows that were written
+        """
+        counts: Dict[tuple, int] = {}
+        now = datetime.utcnow()
+        for row in rows:
+            bucket = _hour_bucket(row.get("createdAt") or now)
+            keys = [("action", row["action"]), ("resource", row["resource"])]
+            if row.get("userId") is not None:
+                keys.append(("user", str(row["userId"])))
+            for dimension, key in keys:
+                counts[(bucket, dimension, key)] = (
+                    counts.get((bucket, dimension, key), 0) + 1
+                )
+
+        items = list(counts.items())
+        try:
+            for i in range(0, len(items), STATS_UPSERT_CHUNK):
+                chunk = items[i : i + STATS_UPSERT_CHUNK]
+                values = []
+                params: List[Any] = []
+                for (bucket, dimension, key), count in chunk:
+                    n = len(params)
+                    values.append(
+                        f"(${n + 1}::timestamp, ${n + 2}, ${n + 3}, ${n + 4}::int)"
+                    )
+                    params.extend([bucket, dimension, key, count])
+
+                await self.prisma.execute_raw(
+                    'INSERT INTO "AuditLogHourlyStat" '
+                    '("bucket", "dimension", "key", "count") '
+                    f"VALUES {', '.join(values)} "
+                    'ON CONFLICT ("bucket", "dimension", "key") '
+                    'DO UPDATE SET "count" = "AuditLogHourlyStat"."count" '
+                    '+ EXCLUDED."count"',
+                    *params,
+                )
+        except Exception as e:
+            # Stats are derived data; never fail audit logging because of them
+            logger.warning(f"Failed to update audit hourly stats: {e}")
+
+    def _build_where(
+        self,
+        user_id: Optional[int] = None,
+        action: Optional[str] = None,
+        resource: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """Build the AuditLog where clause for the common filters"""
+        where: Dict[str, Any] = {}
+        if user_id is not None:
+            where["userId"] = user_id
+        if action:
+            where["action"] = action
+        if resource:
+            where["resource"] = {"contains": resource}
+
+        # Date range filter
+        if start_date or end_date:
+            date_filter = {}
+            if start_date:
+                date_filter["gte"] = start_date
+            if end_date:
+                date_filter["lte"] = end_date
+            where["createdAt"] = date_filter
+
+        return where
+
+    def _format_log(self, log) -> Dict[str, Any]:
+        """Convert an AuditLog record (with user) to its API representation"""
+        return {
+            "id": log.id,
+            "userId": log.userId,
+            "userEmail": log.user.email if log.user else None,
+            "action": log.action,
+            "resource": log.resource,
+            "method": log.method,
+            "statusCode": log.statusCode,
+            "ipAddress": log.ipAddress,
+            "userAgent": log.userAgent,
+            "requestData": log.requestData,
+            "metadata": log.metadata,
+            "createdAt": log.createdAt.isoformat(),
+        }
+
+    async def _find_after(
+        self, where: Dict[str, Any], cursor: Optional[str], limit: int
+    ) -> List[Any]:
+        """Fetch up to limit logs ordered newest first, strictly after cursor"""
+        if cursor:
+            created_at, log_id = decode_cursor(cursor)
+            where = {
+                **where,
+                "OR": [
+                    {"createdAt": {"lt": created_at}},
+                    {"createdAt": created_at, "id": {"lt": log_id}},
+                ],
+            }
+
+        return await self.prisma.auditlog.find_many(
+            where=where,
+            take=limit,
+            order=[{"createdAt": "desc"}, {"id": "desc"}],
+            include={"user": True},
+        )
+
     async def get_logs(
         self,
         user_id: Optional[int] = None,
@@ -132,105 +381,119 @@ class AuditService:
         end_date: Optional[datetime] = None,
         page: int = 1,
         limit: int = 50,
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Query audit logs with filters
 
+        Without a cursor, pages by offset and includes the total count.
+        With a cursor (the nextCursor of a previous result), seeks on
+        (createdAt, id) instead, which costs the same at any depth and
+        skips the count query.
+
         Args:
             user_id: Filter by user ID
             action: Filter by action type
             resource: Filter by resource (supports partial match)
             start_date: Start of date range
             end_date: End of date range
-            page: Page number (1-indexed)
+            page: Page number (1-indexed, ignored when cursor is given)
             limit: Items per page (max 1000)
+            cursor: Keyset cursor to continue from
 
         Returns:
             Paginated audit logs
-        """
-        await self.connect()
 
-        # Build where clause
-        where = {}
-        if user_id is not None:
-            where["userId"] = user_id
-        if action:
-            where["action"] = action
-        if resource:
-            where["resource"] = {"contains": resource}
+        Raises:
+            ValueError: If the cursor is malformed
 
-        # Date range filter
-        if start_date or end_date:
-            date_filter = {}
-            if start_date:
-                date_filter["gte"] = start_date
-            if end_date:
-                date_filter["lte"] = end_date
-            where["createdAt"] = date_filter
+        Note:
+            Passing a date range lets Postgres skip the monthly AuditLog
+            partitions outside it.
+        """
+        where = self._build_where(user_id, action, resource, start_date, end_date)
 
         # Limit to max 1000 per page
         limit = min(limit, 1000)
-        skip = (page - 1) * limit
 
-        # Get logs and total count
-        logs = await self.prisma.auditlog.find_many(
-            where=where,
-            skip=skip,
-            take=limit,
-            order={"createdAt": "desc"},
-            include={"user": True},
+        if cursor:
+            logs = await self._find_after(where, cursor, limit)
+        else:
+            logs = await self.prisma.auditlog.find_many(
+                where=where,
+                skip=(page - 1) * limit,
+                take=limit,
+                order=[{"createdAt": "desc"}, {"id": "desc"}],
+                include={"user": True},
+            )
+
+        next_cursor = (
+            encode_cursor(logs[-1].createdAt, logs[-1].id)
+            if len(logs) == limit
+            else None
         )
+        result = {
+            "logs": [self._format_log(log) for log in logs],
+            "nextCursor": next_cursor,
+        }
+
+        if cursor:
+            result["limit"] = limit
+            return result
 
         total = await self.prisma.auditlog.count(where=where)
+        result.update(
+            {"total": total, "page": page, "pages": (total + limit - 1) // limit}
+        )
+        return result
 
-        return {
-            "logs": [
-                {
-                    "id": log.id,
-                    "userId": log.userId,
-                    "userEmail": log.user.email if log.user else None,
-                    "action": log.action,
-                    "resource": log.resource,
-                    "method": log.method,
-                    "statusCode": log.statusCode,
-                    "ipAddress": log.ipAddress,
-                    "userAgent": log.userAgent,
-                    "requestData": log.requestData,
-                    "metadata": log.metadata,
-                    "createdAt": log.createdAt.isoformat(),
-                }
-                for log in logs
-            ],
-            "total": total,
-            "page": page,
-            "pages": (total + limit - 1) // limit,
-        }
+    async def iter_logs(
+        self,
+        user_id: Optional[int] = None,
+        action: Optional[str] = None,
+        resource: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        batch_size: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield every matching audit log, newest first
+
+        Walks the result with keyset queries of batch_size rows, so memory
+        use stays constant however many logs match.
+
+        Args:
+            user_id: Filter by user ID
+            action: Filter by action type
+            resource: Filter by resource (supports partial match)
+            start_date: Start of date range
+            end_date: End of date range
+            batch_size: Rows per query (default AUDIT_EXPORT_BATCH_SIZE)
+        """
+        where = self._build_where(user_id, action, resource, start_date, end_date)
+        batch_size = batch_size or EXPORT_BATCH_SIZE
+        cursor = None
+
+        while True:
+            logs = await self._find_after(where, cursor, batch_size)
+            for log in logs:
+                yield self._format_log(log)
+
+            if len(logs) < batch_size:
+                return
+            cursor = encode_cursor(logs[-1].createdAt, logs[-1].id)
 
     async def get_log_by_id(self, log_id: int) -> Optional[Dict[str, Any]]:
         """Get a specific audit log by ID"""
-        await self.connect()
-
-        log = await self.prisma.auditlog.find_unique(
+        # The primary key is (id, createdAt) on the partitioned table
+        log = await self.prisma.auditlog.find_first(
             where={"id": log_id}, include={"user": True}
         )
 
         if not log:
             return None
 
-        return {
-            "id": log.id,
-            "userId": log.userId,
-            "userEmail": log.user.email if log.user else None,
-            "action": log.action,
-            "resource": log.resource,
-            "method": log.method,
-            "statusCode": log.statusCode,
-            "ipAddress": log.ipAddress,
-            "userAgent": log.userAgent,
-            "requestData": log.requestData,
-            "metadata": log.metadata,
-            "createdAt": log.createdAt.isoformat(),
-        }
+        return self._format_log(log)
 
     async def get_stats(
         self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
@@ -238,6 +501,9 @@ class AuditService:
         """
         Get audit log statistics
 
+        Reads the pre-aggregated hourly rollups instead of scanning
+        AuditLog, so the date range is applied at hour granularity.
+
         Args:
             start_date: Start of date range
             end_date: End of date range
@@ -245,67 +511,192 @@ class AuditService:
         Returns:
             Statistics about audit logs
         """
-        await self.connect()
-
-        # Build where clause for date range
-        where = {}
-        if start_date or end_date:
-            date_filter = {}
-            if start_date:
-                date_filter["gte"] = start_date
-            if end_date:
-                date_filter["lte"] = end_date
-            where["createdAt"] = date_filter
-
-        # Get total count
-        total = await self.prisma.auditlog.count(where=where)
-
-        # Get all logs for aggregation (could be optimized with raw SQL)
-        logs = await self.prisma.auditlog.find_many(where=where)
-
-        # Aggregate by action
-        by_action = {}
-        by_user = {}
-        resource_counts = {}
-
-        for log in logs:
-            # Count by action
-            by_action[log.action] = by_action.get(log.action, 0) + 1
-
-            # Count by user
-            if log.userId:
-                by_user[str(log.userId)] = by_user.get(str(log.userId), 0) + 1
+        # Range filter on the hourly rollup buckets
+        conditions = []
+        params: List[Any] = []
+        if start_date:
+            params.append(_hour_bucket(start_date))
+            conditions.append(f'"bucket" >= ${len(params)}::timestamp')
+        if end_date:
+            params.append(_hour_bucket(end_date))
+            conditions.append(f'"bucket" <= ${len(params)}::timestamp')
+        range_sql = "".join(f" AND {c}" for c in conditions)
+
+        # Count by action (its total is the total number of logs)
+        action_rows = await self.prisma.query_raw(
+            'SELECT "key", SUM("count")::int AS "count" FROM "AuditLogHourlyStat" '
+            f'WHERE "dimension" = \'action\'{range_sql} GROUP BY "key"',
+            *params,
+        )
+        by_action = {row["key"]: row["count"] for row in action_rows}
 
-            # Count by resource
-            resource_counts[log.resource] = resource_counts.get(log.resource, 0) + 1
+        # Count by user
+        user_rows = await self.prisma.query_raw(
+            'SELECT "key", SUM("count")::int AS "count" FROM "AuditLogHourlyStat" '
+            f'WHERE "dimension" = \'user\'{range_sql} GROUP BY "key"',
+            *params,
+        )
+        by_user = {row["key"]: row["count"] for row in user_rows}
 
         # Get top 10 endpoints
-        top_endpoints = sorted(
-            [{"resource": k, "count": v} for k, v in resource_counts.items()],
-            key=lambda x: x["count"],
-            reverse=True,
-        )[:10]
+        resource_rows = await self.prisma.query_raw(
+            'SELECT "key", SUM("count")::int AS "count" FROM "AuditLogHourlyStat" '
+            f'WHERE "dimension" = \'resource\'{range_sql} GROUP BY "key" '
+            'ORDER BY "count" DESC LIMIT 10',
+            *params,
+        )
+        top_endpoints = [
+            {"resource": row["key"], "count": row["count"]} for row in resource_rows
+        ]
 
         return {
-            "totalLogs": total,
+            "totalLogs": sum(by_action.values()),
             "byAction": by_action,
             "byUser": by_user,
             "topEndpoints": top_endpoints,
         }
 
+    async def list_partitions(self) -> List[Dict[str, Any]]:
+        """
+        List the monthly AuditLog partitions
+
+        Returns:
+            Partitions with name and month range, oldest first
+        """
+        rows = await self.prisma.query_raw(
+            "SELECT child.relname AS name FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = 'AuditLog'"
+        )
+
+        partitions = []
+        for row in rows:
+            match = PARTITION_NAME_PATTERN.match(row["name"])
+            if not match:
+                # Skip the default partition and anything unmanaged
+                continue
+            start = datetime(int(match.group(1)), int(match.group(2)), 1)
+            partitions.append(
+                {"name": row["name"], "start": start, "end": _next_month(start)}
+            )
+
+        return sorted(partitions, key=lambda p: p["start"])
+
+    async def ensure_partitions(self) -> List[str]:
+        """
+        Create monthly AuditLog partitions for the current and upcoming months
+
+        Returns:
+            Names of the partitions created
+        """
+        existing = {p["name"] for p in await self.list_partitions()}
+        month = _month_start(datetime.utcnow())
+
+        created = []
+        for _ in range(self.partition_months_ahead + 1):
+            name = f"AuditLog_p{month.year:04d}_{month.month:02d}"
+            if name not in existing:
+                try:
+                    await self._create_partition(name, month, _next_month(month))
+                    created.append(name)
+                except Exception as e:
+                    # Keep going; the next run retries this month
+                    logger.error(f"Failed to create audit log partition {name}: {e}")
+            month = _next_month(month)
+
+        if created:
+            logger.info(f"Created audit log partitions: {', '.join(created)}")
+        return created
+
+    async def _create_partition(self, name: str, start: datetime, end: datetime):
+        """
+        Create one monthly partition
+
+        Postgres refuses to create a partition while the default partition
+        holds rows in its range (e.g. the maintenance job ran late). In that
+        case the default partition is detached, the partition created, the
+        rows moved into it and the default partition re-attached, all in
+        one transaction.
+        """
+        # DDL can't take bind parameters; bounds are generated here
+        bounds = f"FROM ('{start.isoformat(sep=' ')}') TO ('{end.isoformat(sep=' ')}')"
+        create_sql = (
+            f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "AuditLog" '
+            f"FOR VALUES {bounds}"
+        )
+
+        stranded = await self.prisma.query_raw(
+            f'SELECT COUNT(*)::int AS "count" FROM "{DEFAULT_PARTITION}" '
+            'WHERE "createdAt" >= $1::timestamp AND "createdAt" < $2::timestamp',
+            start,
+            end,
+        )
+        if not stranded or not stranded[0]["count"]:
+            await self.prisma.execute_raw(create_sql)
+            return
+
+        in_range = (
+            f"\"createdAt\" >= '{start.isoformat(sep=' ')}' "
+            f"AND \"createdAt\" < '{end.isoformat(sep=' ')}'"
+        )
+        async with self.prisma.tx() as transaction:
+            await transaction.execute_raw(
+                f'ALTER TABLE "AuditLog" DETACH PARTITION "{DEFAULT_PARTITION}"'
+            )
+            await transaction.execute_raw(create_sql)
+            await transaction.execute_raw(
+                f'INSERT INTO "{name}" SELECT * FROM "{DEFAULT_PARTITION}" '
+                f"WHERE {in_range}"
+            )
+            await transaction.execute_raw(
+                f'DELETE FROM "{DEFAULT_PARTITION}" WHERE {in_range}'
+            )
+            await transaction.execute_raw(
+                f'ALTER TABLE "AuditLog" ATTACH PARTITION "{DEFAULT_PARTITION}" '
+                "DEFAULT"
+            )
+
+        logger.info(
+            f"Moved {stranded[0]['count']} audit logs from the default "
+            f"partition into {name}"
+        )
+
     async def cleanup_old_logs(self) -> int:
         """
         Delete audit logs older than retention period
 
+        Monthly partitions that are entirely past the cutoff are dropped
+        outright; only the month straddling the cutoff is trimmed with a
+        DELETE, which partition pruning keeps to that one partition.
+
         Returns:
             Number of logs deleted
         """
-        await self.connect()
-
         cutoff_date = datetime.utcnow() - timedelta(days=self.retention_days)
-
-        result = await self.prisma.auditlog.delete_many(
+        deleted = 0
+
+        for partition in await self.list_partitions():
+            if partition["end"] > cutoff_date:
+                break
+            name = partition["name"]
+            rows = await self.prisma.query_raw(
+                f'SELECT COUNT(*)::int AS "count" FROM "{name}"'
+            )
+            await self.prisma.execute_raw(
+                f'ALTER TABLE "AuditLog" DETACH PARTITION "{name}"'
+            )
+            await self.prisma.execute_raw(f'DROP TABLE "{name}"')
+            deleted += rows[0]["count"] if rows else 0
+            logger.info(f"Dropped audit log partition {name}")
+
+        deleted += await self.prisma.auditlog.delete_many(
             where={"createdAt": {"lt": cutoff_date}}
         )
 
-        return result
+        # Keep rollups in line with the retained logs
+        await self.prisma.auditloghourlystat.delete_many(
+            where={"bucket": {"lt": _hour_bucket(cutoff_date)}}
+        )
+
+        return deleted
@@ -0,0 +1,212 @@
+"""// ZeaZDev [Audit Log Batch Writer] //
+// Project: Auto Bot Trader i18n //
+// Version: 1.0.0 (Phase 5) //
+// Author: ZeaZDev Meta-Intelligence (Generated) //
+// --- DO NOT EDIT HEADER --- //"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from src.services.audit_service import AuditService
+from src.services.metrics_service import MetricsCollector
+
+logger = logging.getLogger(__name__)
+
+# What to do when the in-memory queue is full
+OVERFLOW_DROP_NEWEST = "drop_newest"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_BLOCK = "block"
+OVERFLOW_POLICIES = (OVERFLOW_DROP_NEWEST, OVERFLOW_DROP_OLDEST, OVERFLOW_BLOCK)
+
+
+class AuditLogWriter:
+    """
+    In-process bounded queue with a background flusher for audit logs
+
+    Request handlers enqueue raw call details (no sanitizing, no DB I/O);
+    the flusher sanitizes them and inserts with create_many every
+    flush interval or as soon as a full batch is waiting. A batch that
+    cannot be written (database unreachable) is requeued for the next
+    flush while there is room.
+    """
+
+    def __init__(
+        self,
+        audit_service: Optional[AuditService] = None,
+        max_queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval_ms: Optional[int] = None,
+        overflow_policy: Optional[str] = None,
+    ):
+        self.audit_service = audit_service or AuditService()
+        self.max_queue_size = max_queue_size or int(
+            os.getenv("AUDIT_QUEUE_MAX_SIZE", "10000")
+        )
+        self.batch_size = batch_size or int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+        self.flush_interval = (
+            flush_interval_ms or int(os.getenv("AUDIT_FLUSH_INTERVAL_MS", "250"))
+        ) / 1000
+        self.overflow_policy = (
+            overflow_policy or os.getenv("AUDIT_QUEUE_OVERFLOW", OVERFLOW_DROP_NEWEST)
+        ).lower()
+
+        if self.overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Invalid audit overflow policy: {self.overflow_policy}. "
+                f"Must be one of {', '.join(OVERFLOW_POLICIES)}"
+            )
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._batch_ready: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._stopping = False
+
+    def start(self):
+        """Start the background flusher on the running event loop"""
+        if self._task is not None and not self._task.done():
+            return
+
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._batch_ready = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flusher and write everything still queued"""
+        if self._task is not None:
+            # Wake the flusher and let it exit its loop (cancelling a task
+            # blocked in wait_for can be swallowed when the event is set)
+            self._stopping = True
+            self._batch_ready.set()
+            await self._task
+            self._task = None
+            self._stopping = False
+
+        if self._queue is not None:
+            written = await self.flush()
+            logger.info(f"Audit writer stopped, flushed {written} pending logs")
+
+    async def enqueue(self, record: Dict[str, Any]) -> bool:
+        """
+        Queue an API call for audit logging
+
+        Args:
+            record: Keyword arguments for AuditService.build_log_data()
+
+        Returns:
+            True if queued, False if dropped by the overflow policy
+        """
+        if self._task is None:
+            self.start()
+
+        record.setdefault("created_at", datetime.utcnow())
+
+        if self.overflow_policy == OVERFLOW_BLOCK:
+            await self._queue.put(record)
+        else:
+            try:
+                self._queue.put_nowait(record)
+            except asyncio.QueueFull:
+                MetricsCollector.record_audit_dropped(self.overflow_policy)
+                if self.overflow_policy == OVERFLOW_DROP_NEWEST:
+                    return False
+                # Drop the oldest queued record to make room
+                try:
+                    self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+                self._queue.put_nowait(record)
+
+        if self._queue.qsize() >= self.batch_size:
+            self._batch_ready.set()
+
+        return True
+
+    async def flush(self) -> int:
+        """
+        Write all queued records in batches
+
+        Returns:
+            Number of rows written
+        """
+        if self._queue is None:
+            return 0
+
+        written = 0
+        async with self._flush_lock:
+            while not self._queue.empty():
+                batch: List[Dict[str, Any]] = []
+                while len(batch) < self.batch_size and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                batch_written = await self._write_batch(batch)
+                if batch_written is None:
+                    # Database unavailable: retry at the next flush
+                    break
+                written += batch_written
+
+        MetricsCollector.set_audit_queue_depth(self._queue.qsize())
+        return written
+
+    async def _write_batch(self, batch: List[Dict[str, Any]]) -> Optional[int]:
+        """
+        Sanitize and insert one batch of queued records
+
+        Returns:
+            Number of rows written, or None if the batch could not be
+            written and was requeued
+        """
+        rows = [self.audit_service.build_log_data(**record) for record in batch]
+        try:
+            written = await self.audit_service.create_logs(rows)
+        except Exception as e:
+            # Don't let a DB outage kill the flusher or lose the batch
+            logger.error(f"Audit batch write failed, requeueing: {e}")
+            MetricsCollector.record_audit_batch(len(rows), 0)
+            self._requeue(batch)
+            return None
+
+        MetricsCollector.record_audit_batch(len(rows), written)
+        return written
+
+    def _requeue(self, batch: List[Dict[str, Any]]):
+        """Put a failed batch back, dropping what no longer fits"""
+        for i, record in enumerate(batch):
+            try:
+                self._queue.put_nowait(record)
+            except asyncio.QueueFull:
+                lost = len(batch) - i
+                logger.error(f"Audit queue full, {lost} logs lost")
+                for _ in range(lost):
+                    MetricsCollector.record_audit_dropped(self.overflow_policy)
+                return
+
+    async def _run(self):
+        """Flush every interval, or early when a full batch is waiting"""
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Audit flusher error: {e}")
+
+
+_writer: Optional[AuditLogWriter] = None
+
+
+def get_audit_writer() -> AuditLogWriter:
+    """Get the process-wide audit log writer"""
+    global _writer
+    if _writer is None:
+        _writer = AuditLogWriter()
+    return _writer
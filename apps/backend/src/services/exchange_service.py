@@ -4,14 +4,109 @@
 // Author: ZeaZDev Meta-Intelligence (Generated) //
 // --- DO NOT EDIT HEADER --- //"""
 
-from typing import Optional
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
 
 import ccxt
-from prisma import Prisma
 
 from src.security.crypto_service import decrypt_data
+from src.utils.database import get_prisma
 
-prisma = Prisma()
+
+class ExchangeClientCache:
+    """
+    Process-wide LRU cache of authenticated ccxt clients
+
+    Clients are keyed by ExchangeKey ID, so portfolio syncs and bot loops
+    share one client (and its loaded markets and rate limiter) per key.
+    Entries expire after a TTL, the least recently used client is evicted
+    beyond max_size, and a client is rebuilt when its stored key material
+    changes (rotation).
+    """
+
+    def __init__(self, max_size: Optional[int] = None, ttl: Optional[int] = None):
+        self.max_size = max_size or int(os.getenv("EXCHANGE_CLIENT_CACHE_SIZE", "128"))
+        self.ttl = ttl or int(os.getenv("EXCHANGE_CLIENT_TTL_SECONDS", "3600"))
+        self._clients: "OrderedDict[int, Tuple[ccxt.Exchange, str, float]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _fingerprint(exchange_key) -> str:
+        """Hash of the stored key material, changes when the key is rotated"""
+        material = "|".join(
+            [
+                exchange_key.exchange,
+                exchange_key.encrypted_key,
+                exchange_key.iv_key,
+                exchange_key.encrypted_secret,
+                exchange_key.iv_secret,
+            ]
+        )
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def get(self, exchange_key) -> ccxt.Exchange:
+        """
+        Get the client for an ExchangeKey record, creating it if needed
+
+        Args:
+            exchange_key: ExchangeKey record (encrypted credentials)
+
+        Returns:
+            Authenticated ccxt client
+        """
+        fingerprint = self._fingerprint(exchange_key)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._clients.get(exchange_key.id)
+            if entry and entry[1] == fingerprint and now - entry[2] < self.ttl:
+                self._clients.move_to_end(exchange_key.id)
+                return entry[0]
+
+        # Decrypt keys
+        api_key = decrypt_data(exchange_key.encrypted_key, exchange_key.iv_key)
+        api_secret = decrypt_data(exchange_key.encrypted_secret, exchange_key.iv_secret)
+
+        # Create exchange instance
+        exchange_class = getattr(ccxt, exchange_key.exchange)
+        client = exchange_class(
+            {"apiKey": api_key, "secret": api_secret, "enableRateLimit": True}
+        )
+
+        with self._lock:
+            self._clients[exchange_key.id] = (client, fingerprint, now)
+            self._clients.move_to_end(exchange_key.id)
+            while len(self._clients) > self.max_size:
+                self._clients.popitem(last=False)
+
+        return client
+
+    def invalidate(self, exchange_key_id: int):
+        """Drop the cached client for a key (rotation, deletion)"""
+        with self._lock:
+            self._clients.pop(exchange_key_id, None)
+
+    def clear(self):
+        """Drop all cached clients"""
+        with self._lock:
+            self._clients.clear()
+
+
+_client_cache: Optional[ExchangeClientCache] = None
+
+
+def get_exchange_client_cache() -> ExchangeClientCache:
+    """Get the process-wide exchange client cache"""
+    global _client_cache
+    if _client_cache is None:
+        _client_cache = ExchangeClientCache()
+    return _client_cache
 
 
 class ExchangeConnector:
@@ -20,10 +115,7 @@ class ExchangeConnector:
         where_clause = {"exchange": exchange_name}
         if owner_id:
             where_clause["ownerId"] = owner_id
-        key = await prisma.exchangekey.find_first(where=where_clause)
+        key = await get_prisma().exchangekey.find_first(where=where_clause)
         if not key:
             raise ValueError("No exchange key stored")
-        api_key = decrypt_data(key.encrypted_key, key.iv_key)
-        api_secret = decrypt_data(key.encrypted_secret, key.iv_secret)
-        cls = getattr(ccxt, exchange_name)
-        return cls({"apiKey": api_key, "secret": api_secret, "enableRateLimit": True})
+        return get_exchange_client_cache().get(key)
@@ -94,6 +94,89 @@ exchange_api_latency = Histogram(
     buckets=(0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0),
 )
 
+# Database Metrics
+db_client_connected = Gauge(
+    "db_client_connected", "Shared Prisma client connection state (1=connected)"
+)
+
+db_connects_total = Counter(
+    "db_connects_total", "Prisma client connect attempts", ["status"]
+)
+
+db_connect_latency = Histogram(
+    "db_connect_latency_seconds",
+    "Time taken to establish the Prisma client connection",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 2.0, 5.0, 10.0),
+)
+
+db_pool_size = Gauge("db_pool_size", "Configured Prisma connection pool size")
+
+# Audit Logging Metrics
+audit_queue_depth = Gauge(
+    "audit_queue_depth", "Audit log records waiting in the in-process queue"
+)
+
+audit_records_dropped = Counter(
+    "audit_records_dropped_total",
+    "Audit log records dropped because the queue was full",
+    ["policy"],
+)
+
+audit_records_written = Counter(
+    "audit_records_written_total", "Audit log records written to the database"
+)
+
+audit_batch_size = Histogram(
+    "audit_batch_size",
+    "Number of audit log records per batch insert",
+    buckets=(1, 10, 50, 100, 250, 500, 1000, 5000),
+)
+
+# TradingView Alert Metrics
+tradingview_alerts_received = Counter(
+    "tradingview_alerts_received_total",
+    "TradingView alerts accepted by the webhook",
+    ["action"],
+)
+
+tradingview_alerts_dropped = Counter(
+    "tradingview_alerts_dropped_total",
+    "TradingView alerts rejected because the queue was full",
+)
+
+tradingview_alerts_deduplicated = Counter(
+    "tradingview_alerts_deduplicated_total",
+    "Duplicate TradingView alerts dropped before queueing",
+    ["source"],
+)
+
+tradingview_queue_depth = Gauge(
+    "tradingview_queue_depth", "TradingView alerts waiting in the in-process queue"
+)
+
+tradingview_alerts_written = Counter(
+    "tradingview_alerts_written_total", "TradingView alerts written to the database"
+)
+
+tradingview_batch_size = Histogram(
+    "tradingview_batch_size",
+    "Number of TradingView alerts per batch insert",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500),
+)
+
+tradingview_alert_to_order = Histogram(
+    "tradingview_alert_to_order_seconds",
+    "Time from webhook receipt to order submission (exchange RTT excluded)",
+    ["exchange"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+tradingview_executions = Counter(
+    "tradingview_executions_total",
+    "TradingView alerts handled by the auto-trade executor",
+    ["outcome"],
+)
+
 # System Metrics
 system_info = Info("abtpro_system", "System information")
 
@@ -190,6 +273,74 @@ class MetricsCollector:
             latency
         )
 
+    @staticmethod
+    def record_db_connect(status: str, latency: float):
+        """Record a Prisma client connect attempt."""
+        db_connects_total.labels(status=status).inc()
+        db_connect_latency.observe(latency)
+
+    @staticmethod
+    def set_db_connected(connected: bool):
+        """Update shared Prisma client connection state."""
+        db_client_connected.set(1 if connected else 0)
+
+    @staticmethod
+    def set_db_pool_size(size: int):
+        """Set configured Prisma connection pool size."""
+        db_pool_size.set(size)
+
+    @staticmethod
+    def set_audit_queue_depth(depth: int):
+        """Update audit queue depth."""
+        audit_queue_depth.set(depth)
+
+    @staticmethod
+    def record_audit_dropped(policy: str):
+        """Record an audit log record dropped on queue overflow."""
+        audit_records_dropped.labels(policy=policy).inc()
+
+    @staticmethod
+    def record_audit_batch(size: int, written: int):
+        """Record an audit log batch insert."""
+        audit_batch_size.observe(size)
+        audit_records_written.inc(written)
+
+    @staticmethod
+    def record_tradingview_alert(action: str):
+        """Record a TradingView alert accepted by the webhook."""
+        tradingview_alerts_received.labels(action=action).inc()
+
+    @staticmethod
+    def record_tradingview_dropped():
+        """Record a TradingView alert rejected on queue overflow."""
+        tradingview_alerts_dropped.inc()
+
+    @staticmethod
+    def record_tradingview_duplicate(source: str):
+        """Record a duplicate TradingView alert dropped by deduplication."""
+        tradingview_alerts_deduplicated.labels(source=source).inc()
+
+    @staticmethod
+    def set_tradingview_queue_depth(depth: int):
+        """Update TradingView alert queue depth."""
+        tradingview_queue_depth.set(depth)
+
+    @staticmethod
+    def record_tradingview_batch(size: int, written: int):
+        """Record a TradingView alert batch insert."""
+        tradingview_batch_size.observe(size)
+        tradingview_alerts_written.inc(written)
+
+    @staticmethod
+    def record_tradingview_alert_to_order(exchange: str, latency: float):
+        """Record TradingView alert-to-order latency."""
+        tradingview_alert_to_order.labels(exchange=exchange).observe(latency)
+
+    @staticmethod
+    def record_tradingview_execution(outcome: str):
+        """Record the outcome of an auto-traded TradingView alert."""
+        tradingview_executions.labels(outcome=outcome).inc()
+
     @staticmethod
     def set_system_info(version: str, environment: str):
         """Set system information."""
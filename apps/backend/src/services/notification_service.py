@@ -4,33 +4,32 @@
 // Author: ZeaZDev Meta-Intelligence (Generated) //
 // --- DO NOT EDIT HEADER --- //"""
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from prisma import Prisma
 
+from src.utils.database import get_prisma
+
 from .telegram_service import TelegramService
 
 
 class NotificationService:
     """Service for sending notifications to users via various channels"""
 
-    def __init__(self):
+    def __init__(self, prisma: Optional[Prisma] = None):
         self.telegram_service = TelegramService()
-        self.prisma = Prisma()
+        self.prisma = prisma or get_prisma()
 
     async def send_trade_notification(
         self, user_id: int, trade_data: Dict[str, Any]
     ) -> bool:
         """Send trade execution notification"""
-        await self.prisma.connect()
-
         # Check if user has enabled trade alerts
         prefs = await self.prisma.notificationpreference.find_first(
             where={"userId": user_id}
         )
 
         if not prefs or not prefs.tradeAlerts:
-            await self.prisma.disconnect()
             return False
 
         # Get Telegram link
@@ -38,8 +37,6 @@ class NotificationService:
             where={"userId": user_id}
         )
 
-        await self.prisma.disconnect()
-
         if not telegram_link:
             return False
 
@@ -64,15 +61,12 @@ PnL: {pnl:.4f} USDT
 
     async def send_risk_alert(self, user_id: int, alert_data: Dict[str, Any]) -> bool:
         """Send risk management alert"""
-        await self.prisma.connect()
-
         # Check if user has enabled risk alerts
         prefs = await self.prisma.notificationpreference.find_first(
             where={"userId": user_id}
         )
 
         if not prefs or not prefs.riskAlerts:
-            await self.prisma.disconnect()
             return False
 
         # Get Telegram link
@@ -80,8 +74,6 @@ PnL: {pnl:.4f} USDT
             where={"userId": user_id}
         )
 
-        await self.prisma.disconnect()
-
         if not telegram_link:
             return False
 
@@ -100,15 +92,12 @@ Please review your trading strategy and risk settings.
 
     async def send_system_notification(self, user_id: int, message_text: str) -> bool:
         """Send system notification"""
-        await self.prisma.connect()
-
         # Check if user has enabled system alerts
         prefs = await self.prisma.notificationpreference.find_first(
             where={"userId": user_id}
         )
 
         if not prefs or not prefs.systemAlerts:
-            await self.prisma.disconnect()
             return False
 
         # Get Telegram link
@@ -116,8 +105,6 @@ Please review your trading strategy and risk settings.
             where={"userId": user_id}
         )
 
-        await self.prisma.disconnect()
-
         if not telegram_link:
             return False
 
@@ -132,15 +119,12 @@ Please review your trading strategy and risk settings.
         self, user_id: int, summary_data: Dict[str, Any]
     ) -> bool:
         """Send daily performance summary"""
-        await self.prisma.connect()
-
         # Check if user has enabled daily summaries
         prefs = await self.prisma.notificationpreference.find_first(
             where={"userId": user_id}
         )
 
         if not prefs or not prefs.dailySummary:
-            await self.prisma.disconnect()
             return False
 
         # Get Telegram link
@@ -148,8 +132,6 @@ Please review your trading strategy and risk settings.
             where={"userId": user_id}
         )
 
-        await self.prisma.disconnect()
-
         if not telegram_link:
             return False
 
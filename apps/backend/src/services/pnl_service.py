@@ -0,0 +1,132 @@
+"""// ZeaZDev [PnL Rollup Service] //
+// Project: Auto Bot Trader i18n //
+// Version: 1.0.0 (Phase 5) //
+// Author: ZeaZDev Meta-Intelligence (Generated) //
+// --- DO NOT EDIT HEADER --- //"""
+
+from typing import Any, Dict, Optional
+
+from prisma import Prisma
+
+from src.utils.database import get_prisma
+
+# Rollup scopes; GLOBAL uses scopeId 0
+SCOPE_GLOBAL = "GLOBAL"
+SCOPE_USER = "USER"
+SCOPE_BOT = "BOT"
+
+
+class PnlService:
+    """
+    Service for materialized PnL rollups
+
+    Keeps one PnlRollup row per bot, per user and a global row, each
+    updated in place as trades are recorded, so dashboards read a single
+    row instead of summing every TradeLog.
+    """
+
+    def __init__(self, prisma: Optional[Prisma] = None):
+        self.prisma = prisma or get_prisma()
+
+    async def record_trade(
+        self,
+        bot_id: int,
+        user_id: Optional[int],
+        pnl: float,
+        prisma: Optional[Prisma] = None,
+    ):
+        """
+        Add a recorded trade to the bot, user and global rollups
+
+        Args:
+            bot_id: Bot run the trade belongs to
+            user_id: Owner of the bot run
+            pnl: Realized PnL of the trade
+            prisma: Client or transaction to write with (defaults to the
+                service client); pass the transaction that wrote the
+                TradeLog to keep both in step
+        """
+        db = prisma or self.prisma
+        scopes = [(SCOPE_GLOBAL, 0), (SCOPE_BOT, bot_id)]
+        if user_id is not None:
+            scopes.append((SCOPE_USER, user_id))
+
+        values = []
+        params = []
+        for scope, scope_id in scopes:
+            n = len(params)
+            values.append(f"(${n + 1}, ${n + 2}::int, ${n + 3}::float8, 1, NOW())")
+            params.extend([scope, scope_id, pnl])
+
+        await db.execute_raw(
+            'INSERT INTO "PnlRollup" '
+            '("scope", "scopeId", "totalPnl", "tradeCount", "updatedAt") '
+            f"VALUES {', '.join(values)} "
+            'ON CONFLICT ("scope", "scopeId") DO UPDATE SET '
+            '"totalPnl" = "PnlRollup"."totalPnl" + EXCLUDED."totalPnl", '
+            '"tradeCount" = "PnlRollup"."tradeCount" + 1, '
+            '"updatedAt" = NOW()',
+            *params,
+        )
+
+    async def get_pnl(self, scope: str, scope_id: int = 0) -> Dict[str, Any]:
+        """
+        Get the rollup for one scope
+
+        Args:
+            scope: GLOBAL, USER or BOT
+            scope_id: User or bot run ID (0 for GLOBAL)
+
+        Returns:
+            Total PnL and trade count (zero if nothing was traded yet)
+        """
+        rollup = await self.prisma.pnlrollup.find_unique(
+            where={"scope_scopeId": {"scope": scope, "scopeId": scope_id}}
+        )
+
+        if not rollup:
+            return {"total_pnl": 0.0, "trade_count": 0, "updated_at": None}
+
+        return {
+            "total_pnl": rollup.totalPnl,
+            "trade_count": rollup.tradeCount,
+            "updated_at": rollup.updatedAt.isoformat(),
+        }
+
+    async def get_global_pnl(self) -> Dict[str, Any]:
+        """Get PnL across all trades"""
+        return await self.get_pnl(SCOPE_GLOBAL)
+
+    async def get_user_pnl(self, user_id: int) -> Dict[str, Any]:
+        """Get PnL across all of a user's bots"""
+        return await self.get_pnl(SCOPE_USER, user_id)
+
+    async def get_bot_pnl(self, bot_id: int) -> Dict[str, Any]:
+        """Get PnL for a single bot run"""
+        return await self.get_pnl(SCOPE_BOT, bot_id)
+
+    async def rebuild(self) -> int:
+        """
+        Recompute every rollup from TradeLog
+
+        Only needed to repair drift (e.g. trades written outside
+        BotRunner); normal operation updates rollups incrementally.
+
+        Returns:
+            Number of rollup rows written
+        """
+        async with self.prisma.tx() as transaction:
+            await transaction.execute_raw('DELETE FROM "PnlRollup"')
+            return await transaction.execute_raw(
+                'INSERT INTO "PnlRollup" '
+                '("scope", "scopeId", "totalPnl", "tradeCount", "updatedAt") '
+                "SELECT 'GLOBAL', 0, COALESCE(SUM(t.\"pnl\"), 0), COUNT(*), NOW() "
+                'FROM "TradeLog" t '
+                "UNION ALL "
+                'SELECT \'BOT\', t."botRunId", SUM(t."pnl"), COUNT(*), NOW() '
+                'FROM "TradeLog" t GROUP BY t."botRunId" '
+                "UNION ALL "
+                'SELECT \'USER\', b."userId", SUM(t."pnl"), COUNT(*), NOW() '
+                'FROM "TradeLog" t JOIN "BotRun" b ON b."id" = t."botRunId" '
+                'GROUP BY b."userId"'
+            )
@@ -5,24 +5,30 @@
 // --- DO NOT EDIT HEADER --- //"""
 
 import asyncio
+import json
 import logging
+import os
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 import ccxt
 from prisma import Prisma
 
-from src.security.crypto_service import decrypt_data
+from src.services.exchange_service import get_exchange_client_cache
+from src.services.pnl_service import PnlService
+from src.utils.database import get_prisma
 
 logger = logging.getLogger(__name__)
 
+# Max concurrent balance fetches per exchange
+SYNC_CONCURRENCY = int(os.getenv("PORTFOLIO_SYNC_CONCURRENCY", "5"))
+
 
 class PortfolioService:
     """Service for aggregating and managing multi-account portfolios"""
 
-    def __init__(self):
-        self.prisma = Prisma()
-        self.exchanges_cache: Dict[int, ccxt.Exchange] = {}
+    def __init__(self, prisma: Optional[Prisma] = None):
+        self.prisma = prisma or get_prisma()
 
     async def create_account(
         self,
@@ -32,265 +38,466 @@ class PortfolioService:
         group: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Create a new account for portfolio tracking"""
-        await self.prisma.connect()
-
-        try:
-            # Verify exchange key exists and belongs to user
-            exchange_key = await self.prisma.exchangekey.find_first(
-                where={"id": exchange_key_id, "ownerId": user_id}
-            )
-
-            if not exchange_key:
-                raise ValueError("Exchange key not found or does not belong to user")
-
-            # Create account
-            account = await self.prisma.account.create(
-                data={
-                    "userId": user_id,
-                    "exchangeKeyId": exchange_key_id,
-                    "label": label,
-                    "group": group,
-                    "enabled": True,
-                }
-            )
+        # Verify exchange key exists and belongs to user
+        exchange_key = await self.prisma.exchangekey.find_first(
+            where={"id": exchange_key_id, "ownerId": user_id}
+        )
 
-            return {
-                "id": account.id,
-                "label": account.label,
-                "exchange": exchange_key.exchange,
-                "group": account.group,
-                "enabled": account.enabled,
+        if not exchange_key:
+            raise ValueError("Exchange key not found or does not belong to user")
+
+        # Create account
+        account = await self.prisma.account.create(
+            data={
+                "userId": user_id,
+                "exchangeKeyId": exchange_key_id,
+                "label": label,
+                "group": group,
+                "enabled": True,
             }
-        finally:
-            await self.prisma.disconnect()
+        )
+
+        return {
+            "id": account.id,
+            "label": account.label,
+            "exchange": exchange_key.exchange,
+            "group": account.group,
+            "enabled": account.enabled,
+        }
 
     async def list_accounts(self, user_id: int) -> List[Dict[str, Any]]:
         """List all accounts for a user"""
-        await self.prisma.connect()
-
-        try:
-            accounts = await self.prisma.account.find_many(
-                where={"userId": user_id}, include={"exchangeKey": True}
-            )
+        accounts = await self.prisma.account.find_many(
+            where={"userId": user_id}, include={"exchangeKey": True}
+        )
 
-            return [
-                {
-                    "id": acc.id,
-                    "label": acc.label,
-                    "exchange": acc.exchangeKey.exchange,
-                    "group": acc.group,
-                    "enabled": acc.enabled,
-                    "created_at": acc.createdAt.isoformat(),
-                }
-                for acc in accounts
-            ]
-        finally:
-            await self.prisma.disconnect()
+        return [
+            {
+                "id": acc.id,
+                "label": acc.label,
+                "exchange": acc.exchangeKey.exchange,
+                "group": acc.group,
+                "enabled": acc.enabled,
+                "created_at": acc.createdAt.isoformat(),
+            }
+            for acc in accounts
+        ]
 
     async def sync_account_positions(self, account_id: int) -> List[Dict[str, Any]]:
         """Sync positions from exchange for a specific account"""
-        await self.prisma.connect()
+        # Get account with exchange key
+        account = await self.prisma.account.find_first(
+            where={"id": account_id}, include={"exchangeKey": True}
+        )
 
-        try:
-            # Get account with exchange key
-            account = await self.prisma.account.find_first(
-                where={"id": account_id}, include={"exchangeKey": True}
-            )
+        if not account or not account.enabled:
+            return []
 
-            if not account or not account.enabled:
-                return []
+        results = await self._sync_exchange_accounts([account])
+        return results[account_id]
 
-            # Get or create exchange instance
-            exchange = await self._get_exchange_instance(account.exchangeKey)
+    async def sync_accounts(
+        self, user_id: Optional[int] = None
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Sync positions for all enabled accounts, or only a user's accounts
 
-            # Fetch positions from exchange
-            try:
+        Accounts are grouped by exchange and synced concurrently; each
+        exchange gets a single bulk ticker fetch for every asset held
+        across its accounts.
+
+        Args:
+            user_id: Only sync this user's accounts
+
+        Returns:
+            Synced positions keyed by account ID
+        """
+        where: Dict[str, Any] = {"enabled": True}
+        if user_id is not None:
+            where["userId"] = user_id
+
+        accounts = await self.prisma.account.find_many(
+            where=where, include={"exchangeKey": True}
+        )
+
+        by_exchange: Dict[str, List[Any]] = {}
+        for account in accounts:
+            by_exchange.setdefault(account.exchangeKey.exchange, []).append(account)
+
+        results: Dict[int, List[Dict[str, Any]]] = {}
+        for exchange_results in await asyncio.gather(
+            *(self._sync_exchange_accounts(group) for group in by_exchange.values())
+        ):
+            results.update(exchange_results)
+
+        return results
+
+    async def _sync_exchange_accounts(
+        self, accounts: List[Any]
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """Sync accounts that share one exchange with a single ticker fetch"""
+        semaphore = asyncio.Semaphore(SYNC_CONCURRENCY)
+
+        async def fetch_balance(account):
+            async with semaphore:
+                exchange = await self._get_exchange_instance(account.exchangeKey)
                 balance = await asyncio.to_thread(exchange.fetch_balance)
-                positions = []
-
-                for symbol, amount in balance["total"].items():
-                    if amount > 0:
-                        # Try to get current price
-                        try:
-                            ticker_symbol = f"{symbol}/USDT"
-                            ticker = await asyncio.to_thread(exchange.fetch_ticker, ticker_symbol)
-                            current_price = ticker["last"]
-                        except Exception as e:
-                            logger.debug(f"Ticker fetch failed for {symbol}: {e}")
-                            current_price = None
-
-                        # Update or create position in database
-                        existing = await self.prisma.position.find_first(
-                            where={"accountId": account_id, "symbol": symbol}
-                        )
-
-                        if existing:
-                            await self.prisma.position.update(
-                                where={"id": existing.id},
-                                data={
-                                    "quantity": amount,
-                                    "currentPrice": current_price,
-                                },
-                            )
-                        else:
-                            await self.prisma.position.create(
-                                data={
-                                    "accountId": account_id,
-                                    "symbol": symbol,
-                                    "side": "LONG",
-                                    "quantity": amount,
-                                    "entryPrice": current_price or 0,
-                                    "currentPrice": current_price,
-                                }
-                            )
-
-                        positions.append(
-                            {
-                                "symbol": symbol,
-                                "quantity": amount,
-                                "current_price": current_price,
-                            }
-                        )
-
-                return positions
+                holdings = {
+                    asset: amount
+                    for asset, amount in balance["total"].items()
+                    if amount and amount > 0
+                }
+                return exchange, holdings
+
+        balances = await asyncio.gather(
+            *(fetch_balance(account) for account in accounts), return_exceptions=True
+        )
+
+        # One bulk ticker request for every asset held on this exchange
+        exchange = None
+        assets = set()
+        for balance in balances:
+            if not isinstance(balance, Exception):
+                exchange = exchange or balance[0]
+                assets.update(balance[1])
+        prices = await self._fetch_prices(exchange, assets) if exchange else {}
+
+        async def store(account, balance):
+            if isinstance(balance, Exception):
+                logger.error(
+                    f"Failed to sync positions for account {account.id}: {balance}"
+                )
+                return []
+            try:
+                return await self._upsert_positions(account.id, balance[1], prices)
             except Exception as e:
-                logger.error(f"Failed to sync positions for account {account_id}: {e}")
+                logger.error(f"Failed to sync positions for account {account.id}: {e}")
                 return []
-        finally:
-            await self.prisma.disconnect()
 
-    async def get_portfolio_summary(self, user_id: int) -> Dict[str, Any]:
-        """Get aggregated portfolio summary across all accounts"""
-        await self.prisma.connect()
+        stored = await asyncio.gather(
+            *(store(account, balance) for account, balance in zip(accounts, balances))
+        )
+        return {account.id: positions for account, positions in zip(accounts, stored)}
+
+    async def _fetch_prices(
+        self, exchange: ccxt.Exchange, assets: Set[str]
+    ) -> Dict[str, Optional[float]]:
+        """Get last USDT prices for assets with one fetch_tickers call"""
+        symbol_by_asset = {asset: f"{asset}/USDT" for asset in assets}
 
         try:
-            # Get all enabled accounts
-            accounts = await self.prisma.account.find_many(
-                where={"userId": user_id, "enabled": True},
-                include={"positions": True, "exchangeKey": True},
+            markets = await asyncio.to_thread(exchange.load_markets)
+            symbols = [s for s in symbol_by_asset.values() if s in markets]
+            if not symbols:
+                return {}
+
+            if exchange.has.get("fetchTickers"):
+                tickers = await asyncio.to_thread(exchange.fetch_tickers, symbols)
+            else:
+                fetched = await asyncio.gather(
+                    *(asyncio.to_thread(exchange.fetch_ticker, s) for s in symbols),
+                    return_exceptions=True,
+                )
+                # A delisted or failing symbol only loses its own price
+                tickers = {}
+                for symbol, ticker in zip(symbols, fetched):
+                    if isinstance(ticker, Exception):
+                        logger.debug(f"Ticker fetch failed for {symbol}: {ticker}")
+                    else:
+                        tickers[symbol] = ticker
+        except Exception as e:
+            logger.debug(f"Ticker fetch failed for {exchange.id}: {e}")
+            return {}
+
+        return {
+            asset: tickers[symbol]["last"]
+            for asset, symbol in symbol_by_asset.items()
+            if symbol in tickers
+        }
+
+    async def _upsert_positions(
+        self,
+        account_id: int,
+        holdings: Dict[str, float],
+        prices: Dict[str, Optional[float]],
+    ) -> List[Dict[str, Any]]:
+        """Write all of an account's holdings with one upsert statement"""
+        positions = [
+            {
+                "symbol": symbol,
+                "quantity": amount,
+                "current_price": prices.get(symbol),
+            }
+            for symbol, amount in holdings.items()
+        ]
+        if not positions:
+            return []
+
+        values = []
+        params: List[Any] = []
+        for position in positions:
+            n = len(params)
+            values.append(
+                f"($1::int, ${n + 2}, 'LONG', ${n + 3}::float8, "
+                f"COALESCE(${n + 4}::float8, 0), ${n + 4}::float8, NOW())"
             )
-
-            # Aggregate positions
-            aggregated_positions: Dict[str, Dict[str, Any]] = {}
-            total_value_usd = 0.0
-
-            for account in accounts:
-                for position in account.positions:
-                    symbol = position.symbol
-
-                    if symbol not in aggregated_positions:
-                        aggregated_positions[symbol] = {
-                            "symbol": symbol,
-                            "total_quantity": 0.0,
-                            "accounts": [],
-                        }
-
-                    aggregated_positions[symbol]["total_quantity"] += position.quantity
-                    aggregated_positions[symbol]["accounts"].append(
-                        {
-                            "account_id": account.id,
-                            "account_label": account.label,
-                            "quantity": position.quantity,
-                            "current_price": position.currentPrice,
-                        }
-                    )
-
-                    # Add to total value
-                    if position.currentPrice:
-                        total_value_usd += position.quantity * position.currentPrice
-
-            # Get total PnL from trade logs
-            trade_logs = await self.prisma.tradelog.find_many(
-                where={"botRun": {"userId": user_id}}
+            params.extend(
+                [position["symbol"], position["quantity"], position["current_price"]]
             )
-            total_pnl = sum(t.pnl for t in trade_logs)
-
-            return {
-                "total_accounts": len(accounts),
-                "total_positions": len(aggregated_positions),
-                "total_value_usd": round(total_value_usd, 2),
-                "total_pnl": round(total_pnl, 4),
-                "positions": list(aggregated_positions.values()),
-                "last_updated": datetime.utcnow().isoformat(),
+
+        await self.prisma.execute_raw(
+            'INSERT INTO "Position" ("accountId", "symbol", "side", "quantity", '
+            '"entryPrice", "currentPrice", "updatedAt") '
+            f"VALUES {', '.join(values)} "
+            'ON CONFLICT ("accountId", "symbol") DO UPDATE SET '
+            '"quantity" = EXCLUDED."quantity", '
+            '"currentPrice" = EXCLUDED."currentPrice", '
+            # Positions first seen without a price get one as soon as it is known
+            '"entryPrice" = CASE WHEN "Position"."entryPrice" > 0 '
+            'THEN "Position"."entryPrice" '
+            'ELSE COALESCE(EXCLUDED."currentPrice", 0) END, '
+            '"updatedAt" = NOW()',
+            account_id,
+            *params,
+        )
+
+        return positions
+
+    async def snapshot_accounts(
+        self, account_ids: List[int], taken_at: Optional[datetime] = None
+    ) -> int:
+        """
+        Sync accounts and store a valuation snapshot for each
+
+        Args:
+            account_ids: Accounts to snapshot (disabled ones are skipped)
+            taken_at: Snapshot timestamp shared by the whole run
+
+        Returns:
+            Number of snapshots stored
+        """
+        taken_at = taken_at or datetime.utcnow()
+        accounts = await self.prisma.account.find_many(
+            where={"id": {"in": account_ids}, "enabled": True},
+            include={"exchangeKey": True},
+        )
+        if not accounts:
+            return 0
+
+        by_exchange: Dict[str, List[Any]] = {}
+        for account in accounts:
+            by_exchange.setdefault(account.exchangeKey.exchange, []).append(account)
+        await asyncio.gather(
+            *(self._sync_exchange_accounts(group) for group in by_exchange.values())
+        )
+
+        # Value the freshly synced positions in one query
+        positions = await self.prisma.position.find_many(
+            where={"accountId": {"in": [account.id for account in accounts]}}
+        )
+        positions_by_account: Dict[int, List[Any]] = {}
+        for position in positions:
+            positions_by_account.setdefault(position.accountId, []).append(position)
+
+        snapshots = []
+        for account in accounts:
+            account_positions = positions_by_account.get(account.id, [])
+            values = {
+                p.symbol: p.quantity * (p.currentPrice or 0) for p in account_positions
+            }
+            total_value = sum(values.values())
+            weights = {
+                symbol: round(value / total_value, 6)
+                for symbol, value in values.items()
+                if total_value > 0 and value > 0
             }
-        finally:
-            await self.prisma.disconnect()
+            snapshots.append(
+                {
+                    "accountId": account.id,
+                    "userId": account.userId,
+                    "value": round(total_value, 2),
+                    "pnl": round(
+                        sum(self._unrealized_pnl(p) for p in account_positions), 4
+                    ),
+                    "weights": json.dumps(weights),
+                    "takenAt": taken_at,
+                }
+            )
 
-    async def get_account_performance(self, account_id: int) -> Dict[str, Any]:
-        """Get performance metrics for a specific account"""
-        await self.prisma.connect()
+        return await self.prisma.portfoliosnapshot.create_many(data=snapshots)
 
-        try:
-            # Get account positions
-            positions = await self.prisma.position.find_many(
-                where={"accountId": account_id}
+    @staticmethod
+    def _unrealized_pnl(position) -> float:
+        """Mark-to-market PnL of a position against its entry price"""
+        if not position.currentPrice or not position.entryPrice:
+            return 0.0
+        return position.quantity * (position.currentPrice - position.entryPrice)
+
+    async def get_portfolio_history(
+        self,
+        user_id: int,
+        account_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get stored snapshots as chart points
+
+        Without an account, snapshots from the same run are summed into
+        one point per timestamp across the user's accounts.
+
+        Args:
+            user_id: Owner of the accounts
+            account_id: Only this account
+            start_date: Start of date range
+            end_date: End of date range
+
+        Returns:
+            Points with timestamp, value, PnL and per-asset weights
+        """
+        where: Dict[str, Any] = {"userId": user_id}
+        if account_id is not None:
+            where["accountId"] = account_id
+        if start_date or end_date:
+            date_filter = {}
+            if start_date:
+                date_filter["gte"] = start_date
+            if end_date:
+                date_filter["lte"] = end_date
+            where["takenAt"] = date_filter
+
+        snapshots = await self.prisma.portfoliosnapshot.find_many(
+            where=where, order={"takenAt": "asc"}
+        )
+
+        points: Dict[datetime, Dict[str, Any]] = {}
+        for snapshot in snapshots:
+            point = points.setdefault(
+                snapshot.takenAt, {"value": 0.0, "pnl": 0.0, "asset_values": {}}
             )
+            point["value"] += snapshot.value
+            point["pnl"] += snapshot.pnl
+            for symbol, weight in json.loads(snapshot.weights).items():
+                point["asset_values"][symbol] = (
+                    point["asset_values"].get(symbol, 0.0) + weight * snapshot.value
+                )
+
+        return [
+            {
+                "timestamp": taken_at.isoformat(),
+                "value": round(point["value"], 2),
+                "pnl": round(point["pnl"], 4),
+                "weights": {
+                    symbol: round(value / point["value"], 6)
+                    for symbol, value in point["asset_values"].items()
+                    if point["value"] > 0
+                },
+            }
+            for taken_at, point in points.items()
+        ]
 
-            # Calculate metrics
-            total_positions = len(positions)
-            total_pnl = sum(p.pnl for p in positions)
+    async def get_portfolio_summary(self, user_id: int) -> Dict[str, Any]:
+        """Get aggregated portfolio summary across all accounts"""
+        # Get all enabled accounts
+        accounts = await self.prisma.account.find_many(
+            where={"userId": user_id, "enabled": True},
+            include={"positions": True, "exchangeKey": True},
+        )
 
-            # Get account value
-            account_value = sum(p.quantity * (p.currentPrice or 0) for p in positions)
+        # Aggregate positions
+        aggregated_positions: Dict[str, Dict[str, Any]] = {}
+        total_value_usd = 0.0
+
+        for account in accounts:
+            for position in account.positions:
+                symbol = position.symbol
+
+                if symbol not in aggregated_positions:
+                    aggregated_positions[symbol] = {
+                        "symbol": symbol,
+                        "total_quantity": 0.0,
+                        "accounts": [],
+                    }
 
-            return {
-                "account_id": account_id,
-                "total_positions": total_positions,
-                "account_value_usd": round(account_value, 2),
-                "total_pnl": round(total_pnl, 4),
-                "positions": [
+                aggregated_positions[symbol]["total_quantity"] += position.quantity
+                aggregated_positions[symbol]["accounts"].append(
                     {
-                        "symbol": p.symbol,
-                        "quantity": p.quantity,
-                        "entry_price": p.entryPrice,
-                        "current_price": p.currentPrice,
-                        "pnl": p.pnl,
+                        "account_id": account.id,
+                        "account_label": account.label,
+                        "quantity": position.quantity,
+                        "current_price": position.currentPrice,
                     }
-                    for p in positions
-                ],
-            }
-        finally:
-            await self.prisma.disconnect()
+                )
 
-    async def _get_exchange_instance(self, exchange_key) -> ccxt.Exchange:
-        """Get or create CCXT exchange instance"""
-        if exchange_key.id in self.exchanges_cache:
-            return self.exchanges_cache[exchange_key.id]
-
-        # Decrypt keys
-        api_key = decrypt_data(exchange_key.encrypted_key, exchange_key.iv_key)
-        api_secret = decrypt_data(exchange_key.encrypted_secret, exchange_key.iv_secret)
-
-        # Create exchange instance
-        exchange_class = getattr(ccxt, exchange_key.exchange)
-        exchange = exchange_class(
-            {"apiKey": api_key, "secret": api_secret, "enableRateLimit": True}
+                # Add to total value
+                if position.currentPrice:
+                    total_value_usd += position.quantity * position.currentPrice
+
+        # Get total PnL from the user's materialized rollup
+        total_pnl = (await PnlService(self.prisma).get_user_pnl(user_id))["total_pnl"]
+
+        return {
+            "total_accounts": len(accounts),
+            "total_positions": len(aggregated_positions),
+            "total_value_usd": round(total_value_usd, 2),
+            "total_pnl": round(total_pnl, 4),
+            "positions": list(aggregated_positions.values()),
+            "last_updated": datetime.utcnow().isoformat(),
+        }
+
+    async def get_account_performance(self, account_id: int) -> Dict[str, Any]:
+        """Get performance metrics for a specific account"""
+        # Get account positions
+        positions = await self.prisma.position.find_many(
+            where={"accountId": account_id}
         )
 
-        # Cache instance
-        self.exchanges_cache[exchange_key.id] = exchange
+        # Calculate metrics
+        total_positions = len(positions)
+        total_pnl = sum(p.pnl for p in positions)
+
+        # Get account value
+        account_value = sum(p.quantity * (p.currentPrice or 0) for p in positions)
+
+        return {
+            "account_id": account_id,
+            "total_positions": total_positions,
+            "account_value_usd": round(account_value, 2),
+            "total_pnl": round(total_pnl, 4),
+            "positions": [
+                {
+                    "symbol": p.symbol,
+                    "quantity": p.quantity,
+                    "entry_price": p.entryPrice,
+                    "current_price": p.currentPrice,
+                    "pnl": p.pnl,
+                }
+                for p in positions
+            ],
+        }
 
-        return exchange
+    async def _get_exchange_instance(self, exchange_key) -> ccxt.Exchange:
+        """Get the shared CCXT exchange instance for an exchange key"""
+        return get_exchange_client_cache().get(exchange_key)
 
     async def delete_account(self, account_id: int, user_id: int) -> Dict[str, Any]:
         """Delete an account and its positions"""
-        await self.prisma.connect()
+        # Verify account belongs to user
+        account = await self.prisma.account.find_first(
+            where={"id": account_id, "userId": user_id}
+        )
 
-        try:
-            # Verify account belongs to user
-            account = await self.prisma.account.find_first(
-                where={"id": account_id, "userId": user_id}
-            )
+        if not account:
+            raise ValueError("Account not found or does not belong to user")
 
-            if not account:
-                raise ValueError("Account not found or does not belong to user")
+        # Delete all positions and snapshots for this account
+        await self.prisma.position.delete_many(where={"accountId": account_id})
+        await self.prisma.portfoliosnapshot.delete_many(where={"accountId": account_id})
 
-            # Delete all positions for this account
-            await self.prisma.position.delete_many(where={"accountId": account_id})
+        # Delete account
+        await self.prisma.account.delete(where={"id": account_id})
 
-            # Delete account
-            await self.prisma.account.delete(where={"id": account_id})
+        # Don't keep an authenticated client around for the removed account
+        get_exchange_client_cache().invalidate(account.exchangeKeyId)
 
-            return {"success": True, "account_id": account_id}
-        finally:
-            await self.prisma.disconnect()
+        return {"success": True, "account_id": account_id}
@@ -16,14 +16,16 @@ from typing import Any, Dict, Optional
 import qrcode
 from prisma import Prisma
 
+from src.utils.database import get_prisma
+
 
 class PromptPayService:
     """Service for handling PromptPay QR code generation and payment processing"""
 
-    def __init__(self):
+    def __init__(self, prisma: Optional[Prisma] = None):
         self.merchant_id = os.getenv("PROMPTPAY_MERCHANT_ID", "")
         self.webhook_secret = os.getenv("PROMPTPAY_WEBHOOK_SECRET", "")
-        self.prisma = Prisma()
+        self.prisma = prisma or get_prisma()
 
     def generate_qr_code(self, amount: float, reference_id: str) -> str:
         """
@@ -79,43 +81,38 @@ class PromptPayService:
         Returns:
             Dict with QR code and transaction details
         """
-        await self.prisma.connect()
-
-        try:
-            # Create transaction record
-            transaction = await self.prisma.transaction.create(
-                data={
-                    "userId": user_id,
-                    "type": "TOP_UP",
-                    "amount": amount,
-                    "currency": currency,
-                    "status": "PENDING",
-                    "paymentMethod": "PROMPTPAY",
-                    "metadata": json.dumps({"description": description}),
-                }
-            )
-
-            reference_id = f"TXN-{transaction.id}-{int(datetime.utcnow().timestamp())}"
-
-            # Update transaction with reference ID
-            await self.prisma.transaction.update(
-                where={"id": transaction.id}, data={"referenceId": reference_id}
-            )
-
-            # Generate QR code
-            qr_code_url = self.generate_qr_code(amount, reference_id)
-
-            return {
-                "transaction_id": transaction.id,
-                "reference_id": reference_id,
+        # Create transaction record
+        transaction = await self.prisma.transaction.create(
+            data={
+                "userId": user_id,
+                "type": "TOP_UP",
                 "amount": amount,
                 "currency": currency,
-                "qr_code_url": qr_code_url,
                 "status": "PENDING",
-                "created_at": transaction.createdAt.isoformat(),
+                "paymentMethod": "PROMPTPAY",
+                "metadata": json.dumps({"description": description}),
             }
-        finally:
-            await self.prisma.disconnect()
+        )
+
+        reference_id = f"TXN-{transaction.id}-{int(datetime.utcnow().timestamp())}"
+
+        # Update transaction with reference ID
+        await self.prisma.transaction.update(
+            where={"id": transaction.id}, data={"referenceId": reference_id}
+        )
+
+        # Generate QR code
+        qr_code_url = self.generate_qr_code(amount, reference_id)
+
+        return {
+            "transaction_id": transaction.id,
+            "reference_id": reference_id,
+            "amount": amount,
+            "currency": currency,
+            "qr_code_url": qr_code_url,
+            "status": "PENDING",
+            "created_at": transaction.createdAt.isoformat(),
+        }
 
     def verify_webhook_signature(self, payload: str, signature: str) -> bool:
         """
@@ -148,44 +145,39 @@ class PromptPayService:
         Returns:
             Dict with processing result
         """
-        await self.prisma.connect()
+        # Find transaction
+        transaction = await self.prisma.transaction.find_first(
+            where={"referenceId": reference_id}
+        )
 
-        try:
-            # Find transaction
-            transaction = await self.prisma.transaction.find_first(
-                where={"referenceId": reference_id}
-            )
+        if not transaction:
+            return {"success": False, "error": "Transaction not found"}
 
-            if not transaction:
-                return {"success": False, "error": "Transaction not found"}
-
-            # Update transaction status
-            await self.prisma.transaction.update(
-                where={"id": transaction.id},
-                data={
-                    "status": status,
-                    "completedAt": datetime.utcnow() if status == "SUCCESS" else None,
-                    "metadata": json.dumps(
-                        {
-                            **json.loads(transaction.metadata or "{}"),
-                            "callback_metadata": metadata or {},
-                        }
-                    ),
-                },
-            )
+        # Update transaction status
+        await self.prisma.transaction.update(
+            where={"id": transaction.id},
+            data={
+                "status": status,
+                "completedAt": datetime.utcnow() if status == "SUCCESS" else None,
+                "metadata": json.dumps(
+                    {
+                        **json.loads(transaction.metadata or "{}"),
+                        "callback_metadata": metadata or {},
+                    }
+                ),
+            },
+        )
 
-            # If successful, credit user wallet
-            if status == "SUCCESS":
-                await self._credit_wallet(transaction.userId, transaction.amount)
+        # If successful, credit user wallet
+        if status == "SUCCESS":
+            await self._credit_wallet(transaction.userId, transaction.amount)
 
-            return {
-                "success": True,
-                "transaction_id": transaction.id,
-                "status": status,
-                "amount": transaction.amount,
-            }
-        finally:
-            await self.prisma.disconnect()
+        return {
+            "success": True,
+            "transaction_id": transaction.id,
+            "status": status,
+            "amount": transaction.amount,
+        }
 
     async def _credit_wallet(self, user_id: int, amount: float):
         """Credit amount to user wallet"""
@@ -205,54 +197,44 @@ class PromptPayService:
 
     async def get_wallet_balance(self, user_id: int) -> Dict[str, Any]:
         """Get user wallet balance"""
-        await self.prisma.connect()
-
-        try:
-            wallet = await self.prisma.wallet.find_first(where={"userId": user_id})
+        wallet = await self.prisma.wallet.find_first(where={"userId": user_id})
 
-            if not wallet:
-                # Create wallet with zero balance
-                wallet = await self.prisma.wallet.create(
-                    data={"userId": user_id, "balance": 0.0, "currency": "THB"}
-                )
+        if not wallet:
+            # Create wallet with zero balance
+            wallet = await self.prisma.wallet.create(
+                data={"userId": user_id, "balance": 0.0, "currency": "THB"}
+            )
 
-            return {
-                "balance": wallet.balance,
-                "currency": wallet.currency,
-                "last_updated": wallet.updatedAt.isoformat(),
-            }
-        finally:
-            await self.prisma.disconnect()
+        return {
+            "balance": wallet.balance,
+            "currency": wallet.currency,
+            "last_updated": wallet.updatedAt.isoformat(),
+        }
 
     async def get_transaction_history(
         self, user_id: int, limit: int = 50, offset: int = 0
     ) -> list:
         """Get user transaction history"""
-        await self.prisma.connect()
-
-        try:
-            transactions = await self.prisma.transaction.find_many(
-                where={"userId": user_id},
-                order={"createdAt": "desc"},
-                take=limit,
-                skip=offset,
-            )
+        transactions = await self.prisma.transaction.find_many(
+            where={"userId": user_id},
+            order={"createdAt": "desc"},
+            take=limit,
+            skip=offset,
+        )
 
-            return [
-                {
-                    "id": txn.id,
-                    "type": txn.type,
-                    "amount": txn.amount,
-                    "currency": txn.currency,
-                    "status": txn.status,
-                    "payment_method": txn.paymentMethod,
-                    "reference_id": txn.referenceId,
-                    "created_at": txn.createdAt.isoformat(),
-                    "completed_at": (
-                        txn.completedAt.isoformat() if txn.completedAt else None
-                    ),
-                }
-                for txn in transactions
-            ]
-        finally:
-            await self.prisma.disconnect()
+        return [
+            {
+                "id": txn.id,
+                "type": txn.type,
+                "amount": txn.amount,
+                "currency": txn.currency,
+                "status": txn.status,
+                "payment_method": txn.paymentMethod,
+                "reference_id": txn.referenceId,
+                "created_at": txn.createdAt.isoformat(),
+                "completed_at": (
+                    txn.completedAt.isoformat() if txn.completedAt else None
+                ),
+            }
+            for txn in transactions
+        ]
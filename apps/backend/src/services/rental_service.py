@@ -10,6 +10,8 @@ from typing import Any, Dict, List, Optional
 
 from prisma import Prisma
 
+from src.utils.database import get_prisma
+
 
 class RentalService:
     """Service for managing rental contracts and subscriptions"""
@@ -55,230 +57,199 @@ class RentalService:
         },
     }
 
-    def __init__(self):
-        self.prisma = Prisma()
+    def __init__(self, prisma: Optional[Prisma] = None):
+        self.prisma = prisma or get_prisma()
 
     async def get_user_contract(self, user_id: int) -> Optional[Dict[str, Any]]:
         """Get user's current rental contract"""
-        await self.prisma.connect()
-
-        try:
-            contract = await self.prisma.rentalcontract.find_first(
-                where={"userId": user_id}, order={"createdAt": "desc"}
-            )
-
-            if not contract:
-                return None
-
-            # Parse features JSON
-            features = json.loads(contract.features) if contract.features else []
-
-            return {
-                "id": contract.id,
-                "plan": contract.plan,
-                "status": contract.status,
-                "expiry": contract.expiry.isoformat(),
-                "grace_period_days": contract.gracePeriodDays,
-                "auto_renew": contract.autoRenew,
-                "features": features,
-                "created_at": contract.createdAt.isoformat(),
-                "renewed_at": (
-                    contract.renewedAt.isoformat() if contract.renewedAt else None
-                ),
-                "is_expired": datetime.utcnow() > contract.expiry,
-                "days_until_expiry": (contract.expiry - datetime.utcnow()).days,
-            }
-        finally:
-            await self.prisma.disconnect()
+        contract = await self.prisma.rentalcontract.find_first(
+            where={"userId": user_id}, order={"createdAt": "desc"}
+        )
+
+        if not contract:
+            return None
+
+        # Parse features JSON
+        features = json.loads(contract.features) if contract.features else []
+
+        return {
+            "id": contract.id,
+            "plan": contract.plan,
+            "status": contract.status,
+            "expiry": contract.expiry.isoformat(),
+            "grace_period_days": contract.gracePeriodDays,
+            "auto_renew": contract.autoRenew,
+            "features": features,
+            "created_at": contract.createdAt.isoformat(),
+            "renewed_at": (
+                contract.renewedAt.isoformat() if contract.renewedAt else None
+            ),
+            "is_expired": datetime.utcnow() > contract.expiry,
+            "days_until_expiry": (contract.expiry - datetime.utcnow()).days,
+        }
 
     async def create_contract(
         self, user_id: int, plan: str, auto_renew: bool = False
     ) -> Dict[str, Any]:
         """Create a new rental contract"""
-        await self.prisma.connect()
-
-        try:
-            if plan not in self.PLANS:
-                raise ValueError(f"Invalid plan: {plan}")
-
-            plan_config = self.PLANS[plan]
-            expiry = datetime.utcnow() + timedelta(days=plan_config["duration_days"])
-
-            contract = await self.prisma.rentalcontract.create(
-                data={
-                    "userId": user_id,
-                    "plan": plan,
-                    "expiry": expiry,
-                    "status": "ACTIVE",
-                    "gracePeriodDays": 3,
-                    "autoRenew": auto_renew,
-                    "features": json.dumps(plan_config["features"]),
-                }
-            )
+        if plan not in self.PLANS:
+            raise ValueError(f"Invalid plan: {plan}")
+
+        plan_config = self.PLANS[plan]
+        expiry = datetime.utcnow() + timedelta(days=plan_config["duration_days"])
 
-            return {
-                "id": contract.id,
+        contract = await self.prisma.rentalcontract.create(
+            data={
+                "userId": user_id,
                 "plan": plan,
-                "status": contract.status,
-                "expiry": contract.expiry.isoformat(),
-                "price": plan_config["price"],
-                "currency": plan_config["currency"],
+                "expiry": expiry,
+                "status": "ACTIVE",
+                "gracePeriodDays": 3,
+                "autoRenew": auto_renew,
+                "features": json.dumps(plan_config["features"]),
             }
-        finally:
-            await self.prisma.disconnect()
+        )
+
+        return {
+            "id": contract.id,
+            "plan": plan,
+            "status": contract.status,
+            "expiry": contract.expiry.isoformat(),
+            "price": plan_config["price"],
+            "currency": plan_config["currency"],
+        }
 
     async def renew_contract(
         self, user_id: int, plan: Optional[str] = None
     ) -> Dict[str, Any]:
         """Renew user's contract (optionally upgrade/downgrade)"""
-        await self.prisma.connect()
-
-        try:
-            # Get current contract
-            current_contract = await self.prisma.rentalcontract.find_first(
-                where={"userId": user_id}, order={"createdAt": "desc"}
-            )
-
-            if not current_contract:
-                raise ValueError("No active contract found")
-
-            # Use current plan if not specified
-            new_plan = plan or current_contract.plan
-
-            if new_plan not in self.PLANS:
-                raise ValueError(f"Invalid plan: {new_plan}")
-
-            plan_config = self.PLANS[new_plan]
-
-            # Calculate new expiry
-            # If current contract is still active, extend from expiry date
-            # Otherwise, extend from now
-            base_date = (
-                current_contract.expiry
-                if current_contract.status == "ACTIVE"
-                and datetime.utcnow() < current_contract.expiry
-                else datetime.utcnow()
-            )
-            new_expiry = base_date + timedelta(days=plan_config["duration_days"])
-
-            # Update contract
-            updated_contract = await self.prisma.rentalcontract.update(
-                where={"id": current_contract.id},
-                data={
-                    "plan": new_plan,
-                    "expiry": new_expiry,
-                    "status": "ACTIVE",
-                    "renewedAt": datetime.utcnow(),
-                    "features": json.dumps(plan_config["features"]),
-                },
-            )
-
-            return {
-                "id": updated_contract.id,
+        # Get current contract
+        current_contract = await self.prisma.rentalcontract.find_first(
+            where={"userId": user_id}, order={"createdAt": "desc"}
+        )
+
+        if not current_contract:
+            raise ValueError("No active contract found")
+
+        # Use current plan if not specified
+        new_plan = plan or current_contract.plan
+
+        if new_plan not in self.PLANS:
+            raise ValueError(f"Invalid plan: {new_plan}")
+
+        plan_config = self.PLANS[new_plan]
+
+        # Calculate new expiry
+        # If current contract is still active, extend from expiry date
+        # Otherwise, extend from now
+        base_date = (
+            current_contract.expiry
+            if current_contract.status == "ACTIVE"
+            and datetime.utcnow() < current_contract.expiry
+            else datetime.utcnow()
+        )
+        new_expiry = base_date + timedelta(days=plan_config["duration_days"])
+
+        # Update contract
+        updated_contract = await self.prisma.rentalcontract.update(
+            where={"id": current_contract.id},
+            data={
                 "plan": new_plan,
-                "status": updated_contract.status,
-                "expiry": updated_contract.expiry.isoformat(),
-                "price": plan_config["price"],
-                "currency": plan_config["currency"],
-            }
-        finally:
-            await self.prisma.disconnect()
+                "expiry": new_expiry,
+                "status": "ACTIVE",
+                "renewedAt": datetime.utcnow(),
+                "features": json.dumps(plan_config["features"]),
+            },
+        )
+
+        return {
+            "id": updated_contract.id,
+            "plan": new_plan,
+            "status": updated_contract.status,
+            "expiry": updated_contract.expiry.isoformat(),
+            "price": plan_config["price"],
+            "currency": plan_config["currency"],
+        }
 
     async def check_contract_expiry(self) -> List[Dict[str, Any]]:
         """
         Check for expiring/expired contracts
         Returns list of contracts that need attention
         """
-        await self.prisma.connect()
-
-        try:
-            now = datetime.utcnow()
+        now = datetime.utcnow()
+
+        # Find contracts expiring within next 7 days or already expired
+        contracts = await self.prisma.rentalcontract.find_many(
+            where={"status": "ACTIVE", "expiry": {"lte": now + timedelta(days=7)}}
+        )
+
+        results = []
+        for contract in contracts:
+            days_until_expiry = (contract.expiry - now).days
+            is_expired = now > contract.expiry
+            in_grace_period = (
+                is_expired and (now - contract.expiry).days <= contract.gracePeriodDays
+            )
 
-            # Find contracts expiring within next 7 days or already expired
-            contracts = await self.prisma.rentalcontract.find_many(
-                where={"status": "ACTIVE", "expiry": {"lte": now + timedelta(days=7)}}
+            results.append(
+                {
+                    "contract_id": contract.id,
+                    "user_id": contract.userId,
+                    "plan": contract.plan,
+                    "expiry": contract.expiry.isoformat(),
+                    "days_until_expiry": days_until_expiry,
+                    "is_expired": is_expired,
+                    "in_grace_period": in_grace_period,
+                    "should_send_reminder": days_until_expiry in [7, 3, 1]
+                    and not is_expired,
+                    "should_disable": is_expired and not in_grace_period,
+                }
             )
 
-            results = []
-            for contract in contracts:
-                days_until_expiry = (contract.expiry - now).days
-                is_expired = now > contract.expiry
-                in_grace_period = (
-                    is_expired
-                    and (now - contract.expiry).days <= contract.gracePeriodDays
-                )
-
-                results.append(
-                    {
-                        "contract_id": contract.id,
-                        "user_id": contract.userId,
-                        "plan": contract.plan,
-                        "expiry": contract.expiry.isoformat(),
-                        "days_until_expiry": days_until_expiry,
-                        "is_expired": is_expired,
-                        "in_grace_period": in_grace_period,
-                        "should_send_reminder": days_until_expiry in [7, 3, 1]
-                        and not is_expired,
-                        "should_disable": is_expired and not in_grace_period,
-                    }
-                )
-
-            return results
-        finally:
-            await self.prisma.disconnect()
+        return results
 
     async def expire_contract(self, contract_id: int) -> Dict[str, Any]:
         """Mark a contract as expired and disable user's bots"""
-        await self.prisma.connect()
-
-        try:
-            # Update contract status
-            contract = await self.prisma.rentalcontract.update(
-                where={"id": contract_id}, data={"status": "EXPIRED"}
-            )
-
-            # Stop all user's active bots
-            await self.prisma.botrun.update_many(
-                where={"userId": contract.userId, "status": "RUNNING"},
-                data={"status": "STOPPED", "stoppedAt": datetime.utcnow()},
-            )
-
-            return {
-                "contract_id": contract.id,
-                "user_id": contract.userId,
-                "status": contract.status,
-                "bots_stopped": True,
-            }
-        finally:
-            await self.prisma.disconnect()
+        # Update contract status
+        contract = await self.prisma.rentalcontract.update(
+            where={"id": contract_id}, data={"status": "EXPIRED"}
+        )
+
+        # Stop all user's active bots
+        await self.prisma.botrun.update_many(
+            where={"userId": contract.userId, "status": "RUNNING"},
+            data={"status": "STOPPED", "stoppedAt": datetime.utcnow()},
+        )
+
+        return {
+            "contract_id": contract.id,
+            "user_id": contract.userId,
+            "status": contract.status,
+            "bots_stopped": True,
+        }
 
     async def has_feature(self, user_id: int, feature_name: str) -> bool:
         """Check if user has access to a specific feature"""
-        await self.prisma.connect()
-
-        try:
-            contract = await self.prisma.rentalcontract.find_first(
-                where={"userId": user_id, "status": "ACTIVE"},
-                order={"createdAt": "desc"},
+        contract = await self.prisma.rentalcontract.find_first(
+            where={"userId": user_id, "status": "ACTIVE"},
+            order={"createdAt": "desc"},
+        )
+
+        if not contract:
+            return False
+
+        # Check if expired (including grace period)
+        now = datetime.utcnow()
+        if now > contract.expiry:
+            grace_period_end = contract.expiry + timedelta(
+                days=contract.gracePeriodDays
             )
-
-            if not contract:
+            if now > grace_period_end:
                 return False
 
-            # Check if expired (including grace period)
-            now = datetime.utcnow()
-            if now > contract.expiry:
-                grace_period_end = contract.expiry + timedelta(
-                    days=contract.gracePeriodDays
-                )
-                if now > grace_period_end:
-                    return False
-
-            # Check features
-            features = json.loads(contract.features) if contract.features else []
-            return feature_name in features
-        finally:
-            await self.prisma.disconnect()
+        # Check features
+        features = json.loads(contract.features) if contract.features else []
+        return feature_name in features
 
     def get_plan_info(self, plan: str) -> Optional[Dict[str, Any]]:
         """Get information about a subscription plan"""
@@ -11,27 +11,20 @@ from typing import Any, Dict, List, Optional
 
 from prisma import Prisma
 
+from src.services.exchange_service import get_exchange_client_cache
+from src.utils.database import get_prisma
+
 
 class SecretRotationService:
     """Service for managing secret rotation"""
 
-    def __init__(self):
-        self.prisma = Prisma()
+    def __init__(self, prisma: Optional[Prisma] = None):
+        self.prisma = prisma or get_prisma()
         self.rotation_policy_days = int(os.getenv("SECRET_ROTATION_POLICY_DAYS", "90"))
         self.grace_period_days = int(
             os.getenv("SECRET_ROTATION_GRACE_PERIOD_DAYS", "7")
         )
 
-    async def connect(self):
-        """Connect to database"""
-        if not self.prisma.is_connected():
-            await self.prisma.connect()
-
-    async def disconnect(self):
-        """Disconnect from database"""
-        if self.prisma.is_connected():
-            await self.prisma.disconnect()
-
     def hash_secret(self, secret: str) -> str:
         """
         Create a hash of the secret for verification (never store the actual secret)
@@ -65,8 +58,6 @@ class SecretRotationService:
         Returns:
             Created rotation record
         """
-        await self.connect()
-
         # Calculate next rotation date
         next_rotation = datetime.utcnow() + timedelta(days=self.rotation_policy_days)
 
@@ -120,8 +111,6 @@ class SecretRotationService:
         Returns:
             List of rotation schedules
         """
-        await self.connect()
-
         where = {}
         if secret_type:
             where["secretType"] = secret_type
@@ -165,8 +154,6 @@ class SecretRotationService:
         Returns:
             List of historical rotations
         """
-        await self.connect()
-
         where = {}
         if secret_type:
             where["secretType"] = secret_type
@@ -202,8 +189,6 @@ class SecretRotationService:
         Returns:
             List of secrets needing rotation
         """
-        await self.connect()
-
         cutoff_date = datetime.utcnow() + timedelta(days=days_ahead)
 
         rotations = await self.prisma.secretrotation.find_many(
@@ -245,8 +230,6 @@ class SecretRotationService:
         Returns:
             Updated rotation record
         """
-        await self.connect()
-
         # Find active rotation
         rotation = await self.prisma.secretrotation.find_first(
             where={
@@ -291,8 +274,6 @@ class SecretRotationService:
         Returns:
             Result of rotation completion
         """
-        await self.connect()
-
         # Find active rotation
         rotation = await self.prisma.secretrotation.find_first(
             where={
@@ -312,6 +293,10 @@ class SecretRotationService:
             where={"id": rotation.id}, data={"status": "ROTATED"}
         )
 
+        # Cached exchange clients hold credentials decrypted with the old secret
+        if secret_type in ("API_KEY", "ENCRYPTION_KEY"):
+            get_exchange_client_cache().clear()
+
         return {
             "secretType": secret_type,
             "secretName": secret_name,
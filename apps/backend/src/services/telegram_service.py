@@ -12,14 +12,16 @@ from prisma import Prisma
 from telegram import Bot
 from telegram.error import TelegramError
 
+from src.utils.database import get_prisma
+
 
 class TelegramService:
     """Telegram bot service for notifications and account linking"""
 
-    def __init__(self):
+    def __init__(self, prisma: Optional[Prisma] = None):
         self.bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
         self.bot = Bot(token=self.bot_token) if self.bot_token else None
-        self.prisma = Prisma()
+        self.prisma = prisma or get_prisma()
 
     async def send_message(self, chat_id: str, text: str) -> bool:
         """Send a message to a Telegram chat"""
@@ -49,8 +51,6 @@ class TelegramService:
         self, user_id: int, chat_id: str, username: Optional[str] = None
     ) -> Dict[str, Any]:
         """Link a Telegram account to a user"""
-        await self.prisma.connect()
-
         try:
             # Check if chat is already linked
             existing_link = await self.prisma.telegramlink.find_first(
@@ -58,7 +58,6 @@ class TelegramService:
             )
 
             if existing_link and existing_link.userId != user_id:
-                await self.prisma.disconnect()
                 return {
                     "success": False,
                     "error": "Chat ID already linked to another user",
@@ -88,22 +87,17 @@ class TelegramService:
                 "✅ Your Telegram account has been successfully linked to ABTPro!",
             )
 
-            await self.prisma.disconnect()
             return {"success": True, "link": link}
 
         except Exception as e:
-            await self.prisma.disconnect()
             return {"success": False, "error": str(e)}
 
     async def unlink_telegram_account(self, user_id: int) -> Dict[str, Any]:
         """Unlink a Telegram account from a user"""
-        await self.prisma.connect()
-
         try:
             link = await self.prisma.telegramlink.find_first(where={"userId": user_id})
 
             if not link:
-                await self.prisma.disconnect()
                 return {"success": False, "error": "No Telegram account linked"}
 
             # Send goodbye message
@@ -114,21 +108,15 @@ class TelegramService:
             # Delete link
             await self.prisma.telegramlink.delete(where={"userId": user_id})
 
-            await self.prisma.disconnect()
             return {"success": True}
 
         except Exception as e:
-            await self.prisma.disconnect()
             return {"success": False, "error": str(e)}
 
     async def get_telegram_link_status(self, user_id: int) -> Optional[Dict[str, Any]]:
         """Get Telegram link status for a user"""
-        await self.prisma.connect()
-
         link = await self.prisma.telegramlink.find_first(where={"userId": user_id})
 
-        await self.prisma.disconnect()
-
         if link:
             return {
                 "linked": True,
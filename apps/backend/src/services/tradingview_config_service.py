@@ -0,0 +1,324 @@
+"""// ZeaZDev [TradingView Webhook Config Service] //
+// Project: Auto Bot Trader i18n //
+// Version: 1.0.0 (Phase 7) //
+// Author: ZeaZDev Meta-Intelligence (Generated) //
+// --- DO NOT EDIT HEADER --- //"""
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from prisma import Prisma
+
+from src.utils.database import get_prisma
+
+logger = logging.getLogger(__name__)
+
+# Shortest webhook secret accepted from users
+MIN_SECRET_LENGTH = 16
+
+# Seconds an unknown secret is remembered as unknown
+MISS_TTL_SECONDS = 30
+
+# Called with (user_id, config) on change; config is None once deleted
+ConfigListener = Callable[[int, Optional[Dict[str, Any]]], None]
+
+
+class TradingViewConfigService:
+    """
+    Per-user TradingView webhook configs with a cached secret lookup
+
+    Secrets are stored only as SHA-256 hashes. Authenticating a webhook
+    hashes the presented secret, looks the hash up in an in-memory cache
+    holding every config (one per user, prefilled by load_all) and
+    confirms it with a constant-time comparison. Expired entries are
+    served while they refresh in the background. A secret missing from
+    the cache is only looked up in the database (it may have been saved
+    by another process) within a per-second budget; unknown secrets are
+    remembered in a separate bounded set, so a flood of bad secrets can
+    neither load the database nor evict real configs. Changes made
+    through this service update the cache immediately and are pushed to
+    listeners (the auto-trade executor).
+    """
+
+    def __init__(
+        self,
+        prisma: Optional[Prisma] = None,
+        cache_ttl: Optional[int] = None,
+        max_unknown: Optional[int] = None,
+        miss_lookups_per_second: Optional[int] = None,
+    ):
+        self._prisma = prisma
+        self.cache_ttl = cache_ttl or int(
+            os.getenv("TRADINGVIEW_CONFIG_CACHE_TTL_SECONDS", "300")
+        )
+        self.max_unknown = max_unknown or int(
+            os.getenv("TRADINGVIEW_CONFIG_MISS_CACHE_SIZE", "10000")
+        )
+        self.miss_lookups_per_second = miss_lookups_per_second or int(
+            os.getenv("TRADINGVIEW_CONFIG_MISS_LOOKUPS_PER_SECOND", "5")
+        )
+
+        # Secret hash -> (config, expiry) for every known config
+        self._cache: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        # Secret hash -> expiry for unknown secrets; insertion order is expiry order
+        self._unknown: "OrderedDict[str, float]" = OrderedDict()
+        # Database lookups for cache misses in the current second
+        self._miss_window = 0
+        self._miss_lookups = 0
+        # Secret hash -> background refresh in progress
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._listeners: List[ConfigListener] = []
+
+    @property
+    def prisma(self) -> Prisma:
+        return self._prisma or get_prisma()
+
+    @staticmethod
+    def hash_secret(secret: str) -> str:
+        """SHA-256 hash of a webhook secret (the secret itself is never stored)"""
+        return hashlib.sha256(secret.encode()).hexdigest()
+
+    def add_listener(self, listener: ConfigListener):
+        """Register a callback for config changes"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    async def load_all(self) -> int:
+        """
+        Fill the cache with every stored config
+
+        Returns:
+            Number of configs loaded
+        """
+        records = await self.prisma.tradingviewwebhookconfig.find_many()
+        for record in records:
+            config = self._to_config(record)
+            self._cache_config(config)
+            self._notify(config["user_id"], config)
+        return len(records)
+
+    async def authenticate(self, secret: str) -> Optional[Dict[str, Any]]:
+        """
+        Find the config a webhook secret belongs to
+
+        Args:
+            secret: Secret presented by the webhook
+
+        Returns:
+            Config dict, or None if no user has this secret
+        """
+        digest = self.hash_secret(secret)
+        entry = self._cache.get(digest)
+        now = time.monotonic()
+
+        if entry is not None:
+            config, expires_at = entry
+            if expires_at <= now and digest not in self._refreshing:
+                # Serve the cached answer, refresh it off the request path
+                self._refreshing[digest] = asyncio.create_task(self._refresh(digest))
+        else:
+            self._expire_unknown(now)
+            if digest in self._unknown or not self._allow_miss_lookup(now):
+                return None
+            config = await self._lookup(digest)
+
+        if config is None or not hmac.compare_digest(config["secret_hash"], digest):
+            return None
+        return config
+
+    async def get_config(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Get a user's webhook config (without the secret hash)"""
+        record = await self.prisma.tradingviewwebhookconfig.find_unique(
+            where={"userId": user_id}
+        )
+        return self._public(self._to_config(record)) if record else None
+
+    async def save_config(
+        self,
+        user_id: int,
+        webhook_secret: Optional[str] = None,
+        auto_trade: bool = False,
+        exchange: str = "binance",
+        position_size: Optional[float] = None,
+        risk_per_trade: float = 1.0,
+    ) -> Dict[str, Any]:
+        """
+        Create or update a user's webhook config
+
+        A secret is generated for a new config when none is given.
+
+        Args:
+            user_id: User ID
+            webhook_secret: New webhook secret (optional, rotates the secret)
+            auto_trade: Execute alerts as orders
+            exchange: Exchange to trade on
+            position_size: Order size in base currency
+            risk_per_trade: Risk percentage per trade
+
+        Returns:
+            Saved config; includes webhook_secret only when generated
+        """
+        if webhook_secret is not None and len(webhook_secret) < MIN_SECRET_LENGTH:
+            raise ValueError(
+                f"Webhook secret must be at least {MIN_SECRET_LENGTH} characters"
+            )
+        if auto_trade and not position_size:
+            raise ValueError("Position size is required for auto trading")
+        if position_size is not None and position_size <= 0:
+            raise ValueError("Position size must be positive")
+
+        existing = await self.prisma.tradingviewwebhookconfig.find_unique(
+            where={"userId": user_id}
+        )
+
+        generated = None
+        if webhook_secret is None and existing is None:
+            generated = webhook_secret = secrets.token_urlsafe(32)
+
+        data: Dict[str, Any] = {
+            "autoTrade": auto_trade,
+            "exchange": exchange.lower(),
+            "positionSize": position_size,
+            "riskPerTrade": risk_per_trade,
+        }
+        if webhook_secret is not None:
+            data["secretHash"] = self.hash_secret(webhook_secret)
+
+        record = await self.prisma.tradingviewwebhookconfig.upsert(
+            where={"userId": user_id},
+            data={"create": {"userId": user_id, **data}, "update": data},
+        )
+
+        # A rotated secret stops working right away
+        if existing is not None and existing.secretHash != record.secretHash:
+            self._cache.pop(existing.secretHash, None)
+
+        config = self._to_config(record)
+        self._cache_config(config)
+        self._notify(user_id, config)
+
+        result = self._public(config)
+        if generated is not None:
+            result["webhook_secret"] = generated
+        return result
+
+    async def delete_config(self, user_id: int) -> bool:
+        """
+        Delete a user's webhook config
+
+        Returns:
+            True if a config was deleted
+        """
+        record = await self.prisma.tradingviewwebhookconfig.find_unique(
+            where={"userId": user_id}
+        )
+        if record is None:
+            return False
+
+        await self.prisma.tradingviewwebhookconfig.delete(where={"userId": user_id})
+        self._cache.pop(record.secretHash, None)
+        self._notify(user_id, None)
+        return True
+
+    @staticmethod
+    def _to_config(record) -> Dict[str, Any]:
+        """Config dict of a TradingViewWebhookConfig record"""
+        return {
+            "user_id": record.userId,
+            "secret_hash": record.secretHash,
+            "auto_trade": record.autoTrade,
+            "exchange": record.exchange,
+            "position_size": record.positionSize,
+            "risk_per_trade": record.riskPerTrade,
+        }
+
+    @staticmethod
+    def _public(config: Dict[str, Any]) -> Dict[str, Any]:
+        """Config without the secret hash"""
+        return {key: value for key, value in config.items() if key != "secret_hash"}
+
+    def _cache_config(self, config: Dict[str, Any]):
+        """Cache a known config under its secret hash"""
+        digest = config["secret_hash"]
+        self._cache[digest] = (config, time.monotonic() + self.cache_ttl)
+        self._unknown.pop(digest, None)
+
+    def _remember_unknown(self, digest: str):
+        """Remember an unknown secret hash, dropping the oldest past the limit"""
+        self._unknown.pop(digest, None)
+        self._unknown[digest] = time.monotonic() + MISS_TTL_SECONDS
+        while len(self._unknown) > self.max_unknown:
+            self._unknown.popitem(last=False)
+
+    def _expire_unknown(self, now: float):
+        """Drop expired unknown secret hashes (oldest first)"""
+        while self._unknown:
+            digest, expires_at = next(iter(self._unknown.items()))
+            if expires_at > now:
+                break
+            del self._unknown[digest]
+
+    def _allow_miss_lookup(self, now: float) -> bool:
+        """Spend one database lookup of the current second's miss budget"""
+        window = int(now)
+        if window != self._miss_window:
+            self._miss_window = window
+            self._miss_lookups = 0
+        if self._miss_lookups >= self.miss_lookups_per_second:
+            return False
+        self._miss_lookups += 1
+        return True
+
+    async def _lookup(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Load the config of a secret hash from the database into the cache"""
+        record = await self.prisma.tradingviewwebhookconfig.find_unique(
+            where={"secretHash": digest}
+        )
+        if record is None:
+            self._remember_unknown(digest)
+            return None
+
+        config = self._to_config(record)
+        self._cache_config(config)
+        self._notify(config["user_id"], config)
+        return config
+
+    async def _refresh(self, digest: str):
+        """Reload an expired cache entry"""
+        try:
+            config = await self._lookup(digest)
+            cached = self._cache.get(digest)
+            if config is None and cached is not None:
+                # Deleted or rotated elsewhere
+                del self._cache[digest]
+                self._notify(cached[0]["user_id"], None)
+        except Exception as e:
+            logger.warning(f"TradingView config refresh failed: {e}")
+        finally:
+            self._refreshing.pop(digest, None)
+
+    def _notify(self, user_id: int, config: Optional[Dict[str, Any]]):
+        """Push a config change to every listener"""
+        for listener in self._listeners:
+            try:
+                listener(user_id, self._public(config) if config else None)
+            except Exception as e:
+                logger.error(f"TradingView config listener failed: {e}")
+
+
+_service: Optional[TradingViewConfigService] = None
+
+
+def get_tradingview_config_service() -> TradingViewConfigService:
+    """Get the process-wide TradingView webhook config service"""
+    global _service
+    if _service is None:
+        _service = TradingViewConfigService()
+    return _service
@@ -0,0 +1,165 @@
+"""// ZeaZDev [TradingView Alert Deduplication] //
+// Project: Auto Bot Trader i18n //
+// Version: 1.0.0 (Phase 7) //
+// Author: ZeaZDev Meta-Intelligence (Generated) //
+// --- DO NOT EDIT HEADER --- //"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import redis.asyncio as redis
+
+from src.services.metrics_service import MetricsCollector
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "tradingview:dedup:"
+
+# Keep a slow or unreachable Redis from stalling the webhook
+REDIS_TIMEOUT_SECONDS = 0.05
+
+
+class AlertDeduplicator:
+    """
+    Drops repeated TradingView alerts before they are queued
+
+    An alert's key is the hash of its normalized content plus the time
+    bucket it arrived in. An alert whose content was already seen in the
+    current or previous bucket is a duplicate (a TradingView retry, or
+    the same alert configured twice), so repeats within one window are
+    always caught. Keys live in an in-memory TTL set; when a Redis URL is
+    configured, keys missing locally are also claimed in Redis with
+    SET NX, so duplicates arriving at other worker processes are caught
+    too. Redis errors fall back to the in-memory set alone.
+    """
+
+    def __init__(
+        self,
+        window_seconds: Optional[int] = None,
+        max_keys: Optional[int] = None,
+        redis_url: Optional[str] = None,
+    ):
+        self.window = window_seconds or int(
+            os.getenv("TRADINGVIEW_DEDUP_WINDOW_SECONDS", "60")
+        )
+        self.max_keys = max_keys or int(
+            os.getenv("TRADINGVIEW_DEDUP_MAX_KEYS", "100000")
+        )
+        self.redis_url = (
+            redis_url
+            if redis_url is not None
+            else os.getenv("TRADINGVIEW_DEDUP_REDIS_URL", "")
+        )
+
+        # Key -> expiry (wall clock); insertion order is expiry order
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+        self._redis: Optional[redis.Redis] = None
+
+    @staticmethod
+    def content_hash(alert: Dict[str, Any]) -> str:
+        """Stable hash of an alert's content"""
+        payload = json.dumps(alert, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def claim(
+        self, alert: Dict[str, Any], now: Optional[float] = None
+    ) -> Optional[str]:
+        """
+        Record an alert unless it is a duplicate
+
+        Args:
+            alert: Normalized alert content (no receipt timestamps)
+            now: Receipt time as a UNIX timestamp (defaults to now)
+
+        Returns:
+            Dedup key if the alert is new, None if it is a duplicate
+        """
+        now = time.time() if now is None else now
+        digest = self.content_hash(alert)
+        bucket = int(now // self.window)
+        key = f"{digest}:{bucket}"
+
+        self._expire(now)
+        if key in self._seen or f"{digest}:{bucket - 1}" in self._seen:
+            MetricsCollector.record_tradingview_duplicate("memory")
+            return None
+
+        if self.redis_url and not await self._claim_redis(digest, bucket):
+            self._remember(key, now)
+            MetricsCollector.record_tradingview_duplicate("redis")
+            return None
+
+        self._remember(key, now)
+        return key
+
+    async def release(self, key: str):
+        """Forget a claimed key (the alert was not accepted after all)"""
+        self._seen.pop(key, None)
+        if self.redis_url:
+            try:
+                await self._client().delete(REDIS_KEY_PREFIX + key)
+            except Exception as e:
+                logger.warning(f"TradingView dedup release failed in Redis: {e}")
+
+    async def close(self):
+        """Close the Redis connection (if any)"""
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    def _remember(self, key: str, now: float):
+        """Add a key that lives for two buckets"""
+        self._seen[key] = now + 2 * self.window
+        while len(self._seen) > self.max_keys:
+            self._seen.popitem(last=False)
+
+    def _expire(self, now: float):
+        """Drop expired keys (oldest first)"""
+        while self._seen:
+            key, expires_at = next(iter(self._seen.items()))
+            if expires_at > now:
+                break
+            del self._seen[key]
+
+    def _client(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.from_url(
+                self.redis_url,
+                socket_timeout=REDIS_TIMEOUT_SECONDS,
+                socket_connect_timeout=REDIS_TIMEOUT_SECONDS,
+            )
+        return self._redis
+
+    async def _claim_redis(self, digest: str, bucket: int) -> bool:
+        """Claim a key in Redis; False if this or the previous bucket has it"""
+        try:
+            async with self._client().pipeline(transaction=False) as pipe:
+                pipe.set(
+                    f"{REDIS_KEY_PREFIX}{digest}:{bucket}",
+                    1,
+                    nx=True,
+                    ex=2 * self.window,
+                )
+                pipe.exists(f"{REDIS_KEY_PREFIX}{digest}:{bucket - 1}")
+                claimed, previous = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"TradingView dedup Redis unavailable, using memory: {e}")
+            return True
+
+        return bool(claimed) and not previous
+
+
+_deduplicator: Optional[AlertDeduplicator] = None
+
+
+def get_alert_deduplicator() -> AlertDeduplicator:
+    """Get the process-wide TradingView alert deduplicator"""
+    global _deduplicator
+    if _deduplicator is None:
+        _deduplicator = AlertDeduplicator()
+    return _deduplicator
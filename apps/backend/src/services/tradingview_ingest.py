@@ -0,0 +1,235 @@
+"""// ZeaZDev [TradingView Alert Ingestion Queue] //
+// Project: Auto Bot Trader i18n //
+// Version: 1.0.0 (Phase 7) //
+// Author: ZeaZDev Meta-Intelligence (Generated) //
+// --- DO NOT EDIT HEADER --- //"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import zlib
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from prisma import Prisma
+
+from src.services.metrics_service import MetricsCollector
+from src.utils.database import get_prisma
+
+logger = logging.getLogger(__name__)
+
+# Handler that routes one alert to trading; returns True if it acted on it
+AlertRoute = Callable[[Dict[str, Any]], Awaitable[bool]]
+
+
+class TradingViewAlertQueue:
+    """
+    In-process alert queue with a consumer pool for TradingView webhooks
+
+    The webhook handler only validates and enqueues (no DB I/O). Alerts
+    are sharded by ticker over a pool of consumers, so alerts for one
+    symbol are always handled in arrival order. Each consumer drains
+    whatever is waiting in its shard (up to a batch), routes every alert
+    to the registered trading routes and inserts the batch with
+    create_many in the background, so the next batch is routed without
+    waiting for the database. Failed inserts are retried with backoff.
+    """
+
+    def __init__(
+        self,
+        prisma: Optional[Prisma] = None,
+        max_queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        consumers: Optional[int] = None,
+    ):
+        self._prisma = prisma
+        self.max_queue_size = max_queue_size or int(
+            os.getenv("TRADINGVIEW_QUEUE_MAX_SIZE", "10000")
+        )
+        self.batch_size = batch_size or int(os.getenv("TRADINGVIEW_BATCH_SIZE", "100"))
+        self.consumers = max(
+            1, consumers or int(os.getenv("TRADINGVIEW_CONSUMERS", "4"))
+        )
+        # Failed batch writes are retried with exponential backoff
+        self.write_retries = int(os.getenv("TRADINGVIEW_WRITE_RETRIES", "3"))
+        self.write_retry_seconds = float(
+            os.getenv("TRADINGVIEW_WRITE_RETRY_SECONDS", "0.5")
+        )
+
+        self._routes: List[AlertRoute] = []
+        self._queues: List[asyncio.Queue] = []
+        self._tasks: List[asyncio.Task] = []
+        self._writes: Set[asyncio.Task] = set()
+
+    @property
+    def prisma(self) -> Prisma:
+        return self._prisma or get_prisma()
+
+    def add_route(self, route: AlertRoute):
+        """Register a handler that receives every consumed alert"""
+        if route not in self._routes:
+            self._routes.append(route)
+
+    def start(self):
+        """Start the consumer pool on the running event loop"""
+        if self._tasks and not all(task.done() for task in self._tasks):
+            return
+
+        if not self._queues:
+            # Each shard gets an equal share of the queue capacity
+            shard_size = max(1, self.max_queue_size // self.consumers)
+            self._queues = [
+                asyncio.Queue(maxsize=shard_size) for _ in range(self.consumers)
+            ]
+
+        self._tasks = [
+            asyncio.create_task(self._consume(queue)) for queue in self._queues
+        ]
+
+    async def stop(self):
+        """Stop the consumers after everything still queued is handled"""
+        if not self._tasks:
+            return
+
+        for queue in self._queues:
+            # Sentinel: the consumer exits once it reaches it
+            await queue.put(None)
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await asyncio.gather(*self._writes, return_exceptions=True)
+        logger.info("TradingView alert queue stopped")
+
+    def enqueue(self, alert: Dict[str, Any]) -> bool:
+        """
+        Queue a validated alert for persistence and routing
+
+        Args:
+            alert: Alert payload (ticker and action required)
+
+        Returns:
+            True if queued, False if the ticker's shard is full
+        """
+        if not self._tasks:
+            self.start()
+
+        alert.setdefault("received_at", datetime.utcnow())
+        # Monotonic receipt time for alert-to-order latency
+        alert.setdefault("received_perf", time.perf_counter())
+        queue = self._queues[self._shard(alert["ticker"])]
+
+        try:
+            queue.put_nowait(alert)
+        except asyncio.QueueFull:
+            MetricsCollector.record_tradingview_dropped()
+            return False
+
+        MetricsCollector.record_tradingview_alert(alert["action"])
+        return True
+
+    def depth(self) -> int:
+        """Alerts waiting across all shards"""
+        return sum(queue.qsize() for queue in self._queues)
+
+    def _shard(self, ticker: str) -> int:
+        """Consumer shard of a ticker (stable across processes)"""
+        return zlib.crc32(ticker.encode()) % len(self._queues)
+
+    async def _consume(self, queue: asyncio.Queue):
+        """Handle batches from one shard until the stop sentinel"""
+        stopping = False
+        while not stopping:
+            batch: List[Dict[str, Any]] = []
+            alert = await queue.get()
+            while alert is not None:
+                batch.append(alert)
+                if len(batch) >= self.batch_size or queue.empty():
+                    break
+                alert = queue.get_nowait()
+            stopping = alert is None
+
+            if batch:
+                try:
+                    await self._handle_batch(batch)
+                except Exception as e:
+                    logger.error(f"TradingView consumer error: {e}")
+
+            MetricsCollector.set_tradingview_queue_depth(self.depth())
+
+    async def _handle_batch(self, batch: List[Dict[str, Any]]):
+        """Route every alert of a batch, then persist it in the background"""
+        processed = [await self._route(alert) for alert in batch]
+        write = asyncio.create_task(self._write_batch(batch, processed))
+        self._writes.add(write)
+        write.add_done_callback(self._writes.discard)
+
+    async def _route(self, alert: Dict[str, Any]) -> bool:
+        """Pass one alert to every route; True if any acted on it"""
+        acted = False
+        for route in self._routes:
+            try:
+                acted = bool(await route(alert)) or acted
+            except Exception as e:
+                # One failing route must not block the shard
+                logger.error(
+                    f"TradingView route failed for {alert['ticker']}: {e}",
+                    extra={"component": "tradingview", "ticker": alert["ticker"]},
+                )
+        return acted
+
+    async def _write_batch(
+        self, batch: List[Dict[str, Any]], processed: List[bool]
+    ) -> int:
+        """Insert one batch of alerts, retrying with backoff before dropping it"""
+        rows = [
+            {
+                "ticker": alert["ticker"],
+                "exchange": alert.get("exchange") or "binance",
+                "action": alert["action"],
+                "price": alert.get("price"),
+                "strategy": alert.get("strategy") or "TRADINGVIEW_ALERT",
+                "interval": alert.get("interval"),
+                "volume": alert.get("volume"),
+                "message": alert.get("message"),
+                "rawPayload": json.dumps(alert.get("raw_payload") or {}, default=str),
+                "receivedAt": alert["received_at"],
+                "processed": was_processed,
+            }
+            for alert, was_processed in zip(batch, processed)
+        ]
+
+        # The alerts' dedup keys are already claimed, so a dropped batch is
+        # never re-sent; ride out short DB outages before giving up
+        for attempt in range(self.write_retries + 1):
+            try:
+                written = await self.prisma.tradingviewalert.create_many(data=rows)
+                break
+            except Exception as e:
+                if attempt < self.write_retries:
+                    delay = self.write_retry_seconds * 2**attempt
+                    logger.warning(
+                        f"TradingView batch write failed, retrying in {delay}s: {e}"
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                # Don't let a DB outage kill the consumer
+                logger.error(
+                    f"TradingView batch write failed, {len(rows)} alerts lost: {e}"
+                )
+                MetricsCollector.record_tradingview_batch(len(rows), 0)
+                return 0
+
+        MetricsCollector.record_tradingview_batch(len(rows), written)
+        return written
+
+
+_queue: Optional[TradingViewAlertQueue] = None
+
+
+def get_tradingview_queue() -> TradingViewAlertQueue:
+    """Get the process-wide TradingView alert queue"""
+    global _queue
+    if _queue is None:
+        _queue = TradingViewAlertQueue()
+    return _queue
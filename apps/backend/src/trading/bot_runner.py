@@ -5,16 +5,21 @@
 // --- DO NOT EDIT HEADER --- //"""
 
 import asyncio
-from typing import Any, Dict
+import logging
+from typing import Any, Dict, List
 
 from prisma import Prisma
 from tenacity import retry, stop_after_attempt, wait_fixed
 
+from src.ml.feature_store import FEATURE_STORE_ENABLED, get_feature_store
 from src.services.exchange_service import ExchangeConnector
 from src.services.metrics_service import MetricsCollector
+from src.services.pnl_service import PnlService
 from src.trading.risk_manager import EnhancedRiskManager
 from src.trading.strategy_interface import StrategyRegistry
 
+logger = logging.getLogger(__name__)
+
 
 # Legacy RiskManager for backward compatibility
 class RiskManager:
@@ -36,6 +41,9 @@ class BotRunner:
         self.prisma = prisma
         self.bot_id = bot_id
         self._running = True
+        self.pnl_service = PnlService(prisma)
+        self.feature_store = get_feature_store() if FEATURE_STORE_ENABLED else None
+        self._last_closed_candle = None
         # Use enhanced risk manager by default
         if use_enhanced_risk:
             self.risk = EnhancedRiskManager()
@@ -69,6 +77,7 @@ class BotRunner:
             ohlcv = await asyncio.to_thread(
                 self.fetch_ohlcv, exchange, symbol, timeframe
             )
+            await self.materialize_features(symbol, timeframe, ohlcv)
 
             # Extract OHLCV data
             opens = [c[1] for c in ohlcv]
@@ -117,21 +126,44 @@ class BotRunner:
         # Update bot status when stopped
         MetricsCollector.update_bot_status(self.bot_id, bot.strategy, symbol, False)
 
+    async def materialize_features(
+        self, symbol: str, timeframe: str, ohlcv: List[List[float]]
+    ):
+        """Append features for newly closed candles to the feature store"""
+        # The last candle is still forming
+        closed = ohlcv[:-1]
+        if self.feature_store is None or not closed:
+            return
+        if closed[-1][0] == self._last_closed_candle:
+            return
+
+        try:
+            await self.feature_store.append_candles(symbol, timeframe, closed)
+            self._last_closed_candle = closed[-1][0]
+        except Exception as e:
+            # Features are derived data; never stop trading because of them
+            logger.warning(f"Feature store update failed for {symbol}: {e}")
+
     async def record_trade(self, side: str, quantity: float, price: float, decision):
         pnl = 0.0  # For simplicity - could calculate based on previous trades
 
         # Get bot info for metrics
         bot = await self.prisma.botrun.find_unique(where={"id": self.bot_id})
 
-        await self.prisma.tradelog.create(
-            data={
-                "botRunId": self.bot_id,
-                "side": side,
-                "quantity": quantity,
-                "price": price,
-                "pnl": pnl,
-            }
-        )
+        # Write the trade and its PnL rollups together
+        async with self.prisma.tx() as transaction:
+            await transaction.tradelog.create(
+                data={
+                    "botRunId": self.bot_id,
+                    "side": side,
+                    "quantity": quantity,
+                    "price": price,
+                    "pnl": pnl,
+                }
+            )
+            await self.pnl_service.record_trade(
+                self.bot_id, bot.userId, pnl, prisma=transaction
+            )
 
         # Record metrics
         MetricsCollector.record_trade(self.bot_id, bot.strategy, side, bot.symbol, pnl)
@@ -85,13 +85,14 @@ class CircuitBreaker:
         self.recent_trades: list = []  # List of trade timestamps
 
     def record_trade_outcome(
-        self, is_profitable: bool, timestamp: Optional[datetime] = None
+        self,
+        is_profitable: bool,
+        timestamp: Optional[datetime] = None,
+        count_trade: bool = True,
     ):
-        """Record a trade outcome."""
-        if timestamp is None:
-            timestamp = datetime.utcnow()
-
-        self.recent_trades.append(timestamp)
+        """Record a trade outcome (count_trade=False if already counted)."""
+        if count_trade:
+            self.record_trade_time(timestamp)
 
         if is_profitable:
             self.consecutive_losses = 0
@@ -102,6 +103,10 @@ class CircuitBreaker:
             if self.consecutive_losses >= self.max_consecutive_losses:
                 self.trip_breaker()
 
+    def record_trade_time(self, timestamp: Optional[datetime] = None):
+        """Count a trade towards the hourly rate limit."""
+        self.recent_trades.append(timestamp or datetime.utcnow())
+
     def trip_breaker(self):
         """Trip the circuit breaker."""
         self.tripped_until = datetime.utcnow() + timedelta(
@@ -213,6 +218,19 @@ class EnhancedRiskManager:
                 "reason": f"Max drawdown exceeded: {self.drawdown_tracker.get_metrics()['current_drawdown']:.2%}",
             }
 
+        # Check order size against equity (when the caller knows both)
+        order_value = context.get("order_value")
+        equity = context.get("equity")
+        if order_value is not None and equity is not None:
+            if order_value > equity * self.max_position_fraction:
+                return {
+                    "allowed": False,
+                    "reason": (
+                        f"Order value {order_value:.2f} exceeds "
+                        f"{self.max_position_fraction:.2%} of equity {equity:.2f}"
+                    ),
+                }
+
         return {"allowed": True, "reason": "All risk checks passed"}
 
     async def update_equity_from_trades(self, prisma: Prisma, bot_id: int):
@@ -225,10 +243,12 @@ class EnhancedRiskManager:
         self.current_equity = self.initial_equity + total_pnl
         self.drawdown_tracker.update_equity(self.current_equity)
 
-    def record_trade_result(self, pnl: float):
+    def record_trade_result(self, pnl: float, count_trade: bool = True):
         """Record trade result for circuit breaker."""
         is_profitable = pnl > 0
-        self.circuit_breaker.record_trade_outcome(is_profitable)
+        self.circuit_breaker.record_trade_outcome(
+            is_profitable, count_trade=count_trade
+        )
 
         # Update equity
         self.current_equity += pnl
@@ -4,9 +4,10 @@
 // Author: ZeaZDev Meta-Intelligence (Generated) //
 // --- DO NOT EDIT HEADER --- //"""
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 from src.trading.strategy_interface import Strategy, StrategyRegistry
 
@@ -26,6 +27,39 @@ class BreakoutStrategy(Strategy):
         self.volume_factor = volume_factor
         self.last_signal = "HOLD"
 
+    def signal_conditions(
+        self, ticker_data: Dict[str, Any]
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        closes = np.asarray(ticker_data.get("closes") or [], dtype=float)
+        highs = np.asarray(ticker_data.get("highs", closes), dtype=float)
+        lows = np.asarray(ticker_data.get("lows", closes), dtype=float)
+        volumes = np.asarray(ticker_data.get("volumes", []), dtype=float)
+
+        n = len(closes)
+        buy = np.zeros(n, dtype=bool)
+        sell = np.zeros(n, dtype=bool)
+        first = self.lookback + 4  # Insufficient data before this candle
+        if n <= first:
+            return buy, sell
+
+        # High/low of the lookback candles before each candle t >= first
+        windows = slice(first - self.lookback, n - self.lookback)
+        recent_high = sliding_window_view(highs[:-1], self.lookback)[windows].max(
+            axis=1
+        )
+        recent_low = sliding_window_view(lows[:-1], self.lookback)[windows].min(axis=1)
+
+        volume_confirmed = np.ones(n - first, dtype=bool)
+        if len(volumes) == n and n > self.lookback:
+            avg_volume = sliding_window_view(volumes[:-1], self.lookback)[windows].mean(
+                axis=1
+            )
+            volume_confirmed = volumes[first:] > avg_volume * self.volume_factor
+
+        buy[first:] = (closes[first:] > recent_high) & volume_confirmed
+        sell[first:] = (closes[first:] < recent_low) & volume_confirmed
+        return buy, sell
+
     def execute(
         self, ticker_data: Dict[str, Any], context: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -4,7 +4,7 @@
 // Author: ZeaZDev Meta-Intelligence (Generated) //
 // --- DO NOT EDIT HEADER --- //"""
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -21,16 +21,30 @@ class RSICrossStrategy(Strategy):
         self.oversold = oversold
         self.last_signal = "HOLD"
 
-    def compute_rsi(self, closes):
-        series = pd.Series(closes)
+    def compute_rsi_series(self, closes) -> pd.Series:
+        series = pd.Series(closes, dtype=float)
         delta = series.diff().dropna()
         up = delta.clip(lower=0)
         down = -1 * delta.clip(upper=0)
         ema_up = up.ewm(alpha=1 / self.period, adjust=False).mean()
         ema_down = down.ewm(alpha=1 / self.period, adjust=False).mean()
         rs = ema_up / ema_down.replace(0, np.nan)
-        rsi = 100 - (100 / (1 + rs))
-        return rsi.iloc[-1]
+        return 100 - (100 / (1 + rs))
+
+    def compute_rsi(self, closes):
+        return self.compute_rsi_series(closes).iloc[-1]
+
+    def signal_conditions(
+        self, ticker_data: Dict[str, Any]
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        closes = ticker_data.get("closes") or []
+        # The recursive RSI over the full history equals compute_rsi() on
+        # every prefix of it
+        rsi = np.full(len(closes), np.nan)
+        if len(closes) > 1:
+            rsi[1:] = self.compute_rsi_series(closes).to_numpy()
+        rsi[: self.period + 4] = np.nan  # Insufficient data
+        return rsi < self.oversold, rsi > self.overbought
 
     def execute(
         self, ticker_data: Dict[str, Any], context: Dict[str, Any]
@@ -4,7 +4,7 @@
 // Author: ZeaZDev Meta-Intelligence (Generated) //
 // --- DO NOT EDIT HEADER --- //"""
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
 import numpy as np
 
@@ -30,6 +30,24 @@ class VWAPStrategy(Strategy):
         vwap = np.cumsum(typical_prices * np.array(volumes)) / np.cumsum(volumes)
         return vwap
 
+    def signal_conditions(
+        self, ticker_data: Dict[str, Any]
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        closes = ticker_data.get("closes") or []
+        highs = ticker_data.get("highs", closes)
+        lows = ticker_data.get("lows", closes)
+        volumes = ticker_data.get("volumes")
+
+        if not volumes or len(volumes) != len(closes):
+            hold = np.zeros(len(closes), dtype=bool)
+            return hold, hold
+
+        # Cumulative VWAP at t equals calculate_vwap() on candles 0..t
+        vwap = self.calculate_vwap(highs, lows, closes, volumes)
+        deviation = (np.asarray(closes, dtype=float) - vwap) / vwap
+        deviation[:4] = np.nan  # Insufficient data
+        return deviation < -self.threshold, deviation > self.threshold
+
     def execute(
         self, ticker_data: Dict[str, Any], context: Dict[str, Any]
     ) -> Dict[str, Any]:
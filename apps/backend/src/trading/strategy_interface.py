@@ -5,7 +5,9 @@
 // --- DO NOT EDIT HEADER --- //"""
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Type
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import numpy as np
 
 
 class Strategy(ABC):
@@ -18,6 +20,19 @@ class Strategy(ABC):
         """Return dict including potential 'signal': BUY/SELL/HOLD and 'confidence'."""
         raise NotImplementedError
 
+    def signal_conditions(
+        self, ticker_data: Dict[str, Any]
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Vectorized entry conditions for every candle of a history
+
+        Returns (buy, sell) boolean arrays where element t is what
+        execute() would test on the candles up to and including t, before
+        the last_signal check. Strategies without a vectorized form return
+        None and are backtested by replaying execute().
+        """
+        return None
+
 
 class StrategyRegistry:
     _strategies: Dict[str, Type[Strategy]] = {}
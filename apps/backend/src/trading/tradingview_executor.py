@@ -0,0 +1,460 @@
+"""// ZeaZDev [TradingView Alert Executor] //
+// Project: Auto Bot Trader i18n //
+// Version: 1.0.0 (Phase 7) //
+// Author: ZeaZDev Meta-Intelligence (Generated) //
+// --- DO NOT EDIT HEADER --- //"""
+
+import asyncio
+import logging
+import os
+import time
+from functools import partial
+from typing import Any, Dict, Optional, Tuple
+
+import ccxt
+
+from src.services.exchange_service import ExchangeConnector
+from src.services.metrics_service import MetricsCollector
+from src.services.pnl_service import PnlService
+from src.trading.risk_manager import EnhancedRiskManager
+from src.trading.strategies.tradingview_strategy import TradingViewStrategy
+from src.utils.database import get_prisma
+
+logger = logging.getLogger(__name__)
+
+# Auto-trade settings used when a config leaves them out
+DEFAULT_CONFIG = {
+    "auto_trade": False,
+    "exchange": "binance",
+    "position_size": None,
+    "risk_per_trade": 1.0,
+}
+
+
+class TradingViewExecutor:
+    """
+    Low-latency alert -> TradingViewStrategy -> EnhancedRiskManager -> order path
+
+    Everything the hot path needs (user configs, per-user strategy and
+    risk state, authenticated ccxt clients with loaded markets and
+    balances) is kept in memory and refreshed by a background task, so
+    handling an alert never queries the database or decrypts exchange
+    keys. Only the order itself leaves the process. An order may use at
+    most risk_per_trade percent of the user's quote-currency balance;
+    alerts without a price, or users without a known balance, are not
+    traded. Filled orders are logged to TradeLog and the PnL rollups
+    after submission, under one TRADINGVIEW bot run per user and symbol.
+    """
+
+    def __init__(self, refresh_seconds: Optional[int] = None):
+        self.refresh_seconds = refresh_seconds or int(
+            os.getenv("TRADINGVIEW_CLIENT_REFRESH_SECONDS", "300")
+        )
+
+        self._configs: Dict[int, Dict[str, Any]] = {}
+        self._strategies: Dict[int, TradingViewStrategy] = {}
+        self._risk: Dict[int, EnhancedRiskManager] = {}
+        self._clients: Dict[Tuple[int, str], ccxt.Exchange] = {}
+        # Balance totals per (user, exchange) from the last refresh
+        self._balances: Dict[Tuple[int, str], Dict[str, float]] = {}
+        self._task: Optional[asyncio.Task] = None
+        # Client warm-ups started by configure()
+        self._warming: Dict[int, asyncio.Task] = {}
+        # Last submitted order per (user, symbol)
+        self._lanes: Dict[Tuple[int, str], asyncio.Task] = {}
+        # TRADINGVIEW bot run id per (user, symbol) that fills are logged to
+        self._bot_runs: Dict[Tuple[int, str], int] = {}
+        # Open (quantity, average entry price) per (user, symbol)
+        self._positions: Dict[Tuple[int, str], Tuple[float, float]] = {}
+
+        # Single-account setup from the environment
+        user_id = os.getenv("TRADINGVIEW_USER_ID")
+        self.default_user_id = int(user_id) if user_id else None
+        if self.default_user_id is not None:
+            position_size = os.getenv("TRADINGVIEW_POSITION_SIZE")
+            self.configure(
+                {
+                    "user_id": self.default_user_id,
+                    "auto_trade": os.getenv("TRADINGVIEW_AUTO_TRADE", "false").lower()
+                    == "true",
+                    "exchange": os.getenv("TRADINGVIEW_EXCHANGE", "binance"),
+                    "position_size": float(position_size) if position_size else None,
+                }
+            )
+
+    def configure(self, config: Dict[str, Any]):
+        """
+        Add or replace a user's auto-trade config
+
+        Args:
+            config: Dict with user_id and optional auto_trade, exchange,
+                position_size and risk_per_trade
+        """
+        user_id = config["user_id"]
+        config = {**DEFAULT_CONFIG, **config}
+        config["exchange"] = config["exchange"].lower()
+        self._configs[user_id] = config
+        self._strategies.setdefault(user_id, TradingViewStrategy())
+
+        # Keep risk state (breaker, trade times) across config changes
+        max_position_fraction = config["risk_per_trade"] / 100
+        risk = self._risk.get(user_id)
+        if risk is None:
+            self._risk[user_id] = EnhancedRiskManager(
+                max_position_fraction=max_position_fraction
+            )
+        else:
+            risk.max_position_fraction = max_position_fraction
+
+        # Once running, warm a new client now instead of at the next refresh
+        if (
+            self._task is not None
+            and config["auto_trade"]
+            and (user_id, config["exchange"]) not in self._clients
+            and user_id not in self._warming
+        ):
+            self._warming[user_id] = asyncio.create_task(self._warm_user(user_id))
+
+    def sync_config(self, user_id: int, config: Optional[Dict[str, Any]]):
+        """Config listener: apply a changed config, or forget a deleted one"""
+        if config is None:
+            self.remove(user_id)
+        else:
+            self.configure({**config, "user_id": user_id})
+
+    def remove(self, user_id: int):
+        """Forget a user's config, state and clients"""
+        self._configs.pop(user_id, None)
+        self._strategies.pop(user_id, None)
+        self._risk.pop(user_id, None)
+        for key in [key for key in self._positions if key[0] == user_id]:
+            self._positions.pop(key, None)
+            self._bot_runs.pop(key, None)
+        for key in [key for key in self._clients if key[0] == user_id]:
+            self._clients.pop(key, None)
+            self._balances.pop(key, None)
+
+    async def warm_up(self):
+        """Build clients and load markets for every auto-trading config"""
+        for user_id in list(self._configs):
+            await self._warm_user(user_id)
+
+    async def _warm_user(self, user_id: int):
+        """Build one user's client, load its markets and refresh its balance"""
+        try:
+            config = self._configs.get(user_id)
+            if not config or not config["auto_trade"]:
+                return
+
+            exchange = config["exchange"]
+            # Cache hit unless the key changed (rotation)
+            client = await ExchangeConnector.for_exchange(exchange, user_id)
+            if not client.markets:
+                await asyncio.to_thread(client.load_markets)
+            self._clients[(user_id, exchange)] = client
+
+            balance = await asyncio.to_thread(client.fetch_balance)
+            self._balances[(user_id, exchange)] = balance.get("total") or {}
+        except Exception as e:
+            logger.warning(f"TradingView client warm-up failed for user {user_id}: {e}")
+        finally:
+            self._warming.pop(user_id, None)
+
+    def start(self):
+        """Start the background warm-up/refresh loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refresh())
+
+    async def stop(self):
+        """Stop the refresh loop and wait for orders in flight"""
+        await asyncio.gather(*self._lanes.values(), return_exceptions=True)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def handle_alert(self, alert: Dict[str, Any]) -> bool:
+        """
+        Execute one queued alert for its user
+
+        Args:
+            alert: Validated alert from the TradingView queue
+
+        Returns:
+            True if an order was submitted
+        """
+        received = alert.get("received_perf") or time.perf_counter()
+        user_id = alert.get("user_id", self.default_user_id)
+        config = self._configs.get(user_id)
+        if not config or not config["auto_trade"]:
+            return False
+
+        exchange = (alert.get("exchange") or config["exchange"]).lower()
+        client = self._clients.get((user_id, exchange))
+        if client is None:
+            logger.warning(
+                f"No warm {exchange} client for user {user_id}, alert skipped"
+            )
+            MetricsCollector.record_tradingview_execution("not_ready")
+            return False
+
+        symbol = self._resolve_symbol(client, alert["ticker"])
+        if symbol is None:
+            logger.warning(f"Unknown {exchange} market: {alert['ticker']}")
+            MetricsCollector.record_tradingview_execution("unknown_symbol")
+            return False
+
+        quantity = config["position_size"]
+        if not quantity:
+            logger.warning(f"No position size configured for user {user_id}")
+            MetricsCollector.record_tradingview_execution("no_position_size")
+            return False
+
+        # Strategy validation
+        context = {"symbol": symbol, "timeframe": alert.get("interval")}
+        decision = self._strategies[user_id].execute(
+            {"tradingview_alert": alert}, context
+        )
+        signal = decision.get("signal", "HOLD")
+        MetricsCollector.record_strategy_signal("TRADINGVIEW", signal, symbol)
+        if signal not in ("BUY", "SELL"):
+            MetricsCollector.record_tradingview_execution("hold")
+            return False
+
+        # risk_per_trade needs the order value and the balance it risks;
+        # without both the order cannot be sized safely
+        price = alert.get("price") or alert.get("close")
+        quote = client.markets[symbol].get("quote")
+        equity = self._balances.get((user_id, exchange), {}).get(quote)
+        if not price or equity is None:
+            missing = "alert price" if not price else f"{quote} balance"
+            logger.warning(f"TradingView {signal} {symbol} skipped: no {missing}")
+            MetricsCollector.record_tradingview_execution("size_unknown")
+            return False
+        context["order_value"] = quantity * price
+        context["equity"] = equity
+
+        # Risk checks (in-memory state only, no equity refresh from the DB)
+        risk = self._risk[user_id]
+        risk_result = await risk.assess(context, decision)
+        MetricsCollector.record_risk_check(risk_result["allowed"])
+        if not risk_result["allowed"]:
+            logger.info(
+                f"TradingView {signal} {symbol} blocked: {risk_result['reason']}"
+            )
+            MetricsCollector.record_tradingview_execution("risk_rejected")
+            return False
+
+        # Alert-to-order latency stops at submission (exchange RTT excluded)
+        MetricsCollector.record_tradingview_alert_to_order(
+            exchange, time.perf_counter() - received
+        )
+        risk.circuit_breaker.record_trade_time()
+
+        # Orders for one user and symbol reach the exchange in alert order,
+        # without holding up the consumer for the exchange round trip
+        lane = (user_id, symbol)
+        order = asyncio.create_task(
+            self._place_order(
+                client,
+                exchange,
+                symbol,
+                signal,
+                quantity,
+                price,
+                user_id,
+                context["timeframe"],
+                self._lanes.get(lane),
+            )
+        )
+        self._lanes[lane] = order
+        order.add_done_callback(partial(self._release_lane, lane))
+        return True
+
+    def _release_lane(self, lane: Tuple[int, str], order: asyncio.Task):
+        """Forget a lane once its latest order is done"""
+        if self._lanes.get(lane) is order:
+            del self._lanes[lane]
+
+    async def _place_order(
+        self,
+        client: ccxt.Exchange,
+        exchange: str,
+        symbol: str,
+        signal: str,
+        quantity: float,
+        price: float,
+        user_id: int,
+        timeframe: Optional[str],
+        previous: Optional[asyncio.Task],
+    ):
+        """Submit a market order once the lane's previous order is done"""
+        if previous is not None:
+            await asyncio.wait([previous])
+
+        start = time.perf_counter()
+        try:
+            order = await asyncio.to_thread(
+                client.create_order, symbol, "market", signal.lower(), quantity
+            )
+        except Exception as e:
+            MetricsCollector.record_exchange_api_call(
+                exchange, "create_order", "error", time.perf_counter() - start
+            )
+            MetricsCollector.record_tradingview_execution("order_failed")
+            logger.error(
+                f"TradingView order failed: {signal} {quantity} {symbol}: {e}",
+                extra={"component": "tradingview", "user_id": user_id},
+            )
+            return
+
+        MetricsCollector.record_exchange_api_call(
+            exchange, "create_order", "success", time.perf_counter() - start
+        )
+        MetricsCollector.record_tradingview_execution("ordered")
+        logger.info(
+            f"TradingView order placed: {signal} {quantity} {symbol}",
+            extra={
+                "component": "tradingview",
+                "user_id": user_id,
+                "order_id": order.get("id"),
+            },
+        )
+
+        # Fills are priced from the order, falling back to the alert
+        filled = float(order.get("filled") or quantity)
+        fill_price = float(order.get("average") or order.get("price") or price)
+        await self._record_fill(
+            user_id, symbol, signal, filled, fill_price, timeframe or "alert"
+        )
+
+    async def _record_fill(
+        self,
+        user_id: int,
+        symbol: str,
+        side: str,
+        quantity: float,
+        price: float,
+        timeframe: str,
+    ):
+        """
+        Log a fill to TradeLog and the PnL rollups, like BotRunner.record_trade
+
+        Only fills that close a position realize PnL; those are also fed to
+        the user's circuit breaker so consecutive losses can trip it.
+        """
+        pnl = self._realize(user_id, symbol, side, quantity, price)
+        risk = self._risk.get(user_id)
+        if pnl is not None and risk is not None:
+            # The trade was counted towards the rate limit at submission
+            risk.record_trade_result(pnl, count_trade=False)
+            if risk.circuit_breaker.is_tripped():
+                MetricsCollector.record_circuit_breaker_trip()
+
+        try:
+            prisma = get_prisma()
+            bot_id = await self._bot_run(prisma, user_id, symbol, timeframe)
+            async with prisma.tx() as transaction:
+                await transaction.tradelog.create(
+                    data={
+                        "botRunId": bot_id,
+                        "userId": user_id,
+                        "side": side,
+                        "quantity": quantity,
+                        "price": price,
+                        "pnl": pnl or 0.0,
+                    }
+                )
+                await PnlService(prisma).record_trade(
+                    bot_id, user_id, pnl or 0.0, prisma=transaction
+                )
+        except Exception as e:
+            logger.error(
+                f"TradingView trade log failed: {side} {quantity} {symbol}: {e}",
+                extra={"component": "tradingview", "user_id": user_id},
+            )
+            return
+
+        MetricsCollector.record_trade(bot_id, "TRADINGVIEW", side, symbol, pnl or 0.0)
+
+    def _realize(
+        self, user_id: int, symbol: str, side: str, quantity: float, price: float
+    ) -> Optional[float]:
+        """
+        Update the open position with a fill
+
+        Returns:
+            PnL realized against the average entry price, or None if the
+            fill only opened or added to the position
+        """
+        key = (user_id, symbol)
+        held, entry = self._positions.get(key, (0.0, 0.0))
+        if side == "BUY":
+            total = held + quantity
+            self._positions[key] = (total, (held * entry + quantity * price) / total)
+            return None
+
+        closed = min(quantity, held)
+        if closed <= 0:
+            return None
+        if held - closed > 0:
+            self._positions[key] = (held - closed, entry)
+        else:
+            self._positions.pop(key, None)
+        return (price - entry) * closed
+
+    async def _bot_run(self, prisma, user_id: int, symbol: str, timeframe: str) -> int:
+        """Id of the user's TRADINGVIEW bot run for a symbol (created once)"""
+        key = (user_id, symbol)
+        bot_id = self._bot_runs.get(key)
+        if bot_id is None:
+            bot_run = await prisma.botrun.find_first(
+                where={"userId": user_id, "strategy": "TRADINGVIEW", "symbol": symbol}
+            )
+            if bot_run is None:
+                bot_run = await prisma.botrun.create(
+                    data={
+                        "userId": user_id,
+                        "strategy": "TRADINGVIEW",
+                        "symbol": symbol,
+                        "timeframe": timeframe,
+                        "status": "RUNNING",
+                    }
+                )
+            bot_id = self._bot_runs[key] = bot_run.id
+        return bot_id
+
+    @staticmethod
+    def _resolve_symbol(client: ccxt.Exchange, ticker: str) -> Optional[str]:
+        """Unified ccxt symbol of a TradingView ticker (e.g. BINANCE:BTCUSDT)"""
+        ticker = ticker.split(":")[-1].upper()
+        if "/" in ticker:
+            return ticker if ticker in (client.markets or {}) else None
+
+        markets = (client.markets_by_id or {}).get(ticker)
+        if isinstance(markets, list):
+            markets = markets[0] if markets else None
+        return markets["symbol"] if markets else None
+
+    async def _refresh(self):
+        """Warm clients now and again every refresh interval"""
+        while True:
+            try:
+                await self.warm_up()
+            except Exception as e:
+                logger.error(f"TradingView client refresh error: {e}")
+            await asyncio.sleep(self.refresh_seconds)
+
+
+_executor: Optional[TradingViewExecutor] = None
+
+
+def get_tradingview_executor() -> TradingViewExecutor:
+    """Get the process-wide TradingView alert executor"""
+    global _executor
+    if _executor is None:
+        _executor = TradingViewExecutor()
+    return _executor
@@ -4,32 +4,126 @@
 // Author: ZeaZDev Meta-Intelligence //
 // --- DO NOT EDIT HEADER --- //"""
 
+import asyncio
+import os
+import time
 from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Any, Callable, Dict, TypeVar
+from typing import Any, Callable, Dict, Optional, TypeVar
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 from prisma import Prisma
 
+from src.services.metrics_service import MetricsCollector
+
 T = TypeVar("T")
 
+# Connection pool configuration (passed to the Prisma query engine)
+DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "10"))
+DATABASE_POOL_TIMEOUT = int(os.getenv("DATABASE_POOL_TIMEOUT", "10"))
+
+_prisma: Optional[Prisma] = None
+_connect_lock: Optional[asyncio.Lock] = None
+
+
+def _pooled_database_url(url: str) -> str:
+    """Add connection pool parameters to the database URL unless already set"""
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    query.setdefault("connection_limit", str(DATABASE_POOL_SIZE))
+    query.setdefault("pool_timeout", str(DATABASE_POOL_TIMEOUT))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def get_prisma() -> Prisma:
+    """
+    Get the process-wide Prisma client
+
+    The client is created lazily and shared by every service, router and
+    worker task in the process. It is connected once by the application
+    (or worker) lifecycle hooks rather than per call.
+
+    Returns:
+        Shared Prisma client
+    """
+    global _prisma
+    if _prisma is None:
+        database_url = os.getenv("DATABASE_URL")
+        if database_url:
+            _prisma = Prisma(datasource={"url": _pooled_database_url(database_url)})
+        else:
+            _prisma = Prisma()
+        MetricsCollector.set_db_pool_size(DATABASE_POOL_SIZE)
+    return _prisma
+
+
+async def connect_db() -> Prisma:
+    """
+    Connect the shared Prisma client if it is not connected yet
+
+    Safe to call concurrently; only one connect is issued.
+
+    Returns:
+        Connected shared Prisma client
+    """
+    global _connect_lock
+    prisma = get_prisma()
+    if prisma.is_connected():
+        return prisma
+
+    if _connect_lock is None:
+        _connect_lock = asyncio.Lock()
+
+    async with _connect_lock:
+        if not prisma.is_connected():
+            start_time = time.perf_counter()
+            try:
+                await prisma.connect()
+            except Exception:
+                MetricsCollector.record_db_connect(
+                    "failed", time.perf_counter() - start_time
+                )
+                raise
+            MetricsCollector.record_db_connect(
+                "success", time.perf_counter() - start_time
+            )
+            MetricsCollector.set_db_connected(True)
+
+    return prisma
+
+
+async def disconnect_db():
+    """Disconnect the shared Prisma client (application/worker shutdown only)"""
+    if _prisma is not None and _prisma.is_connected():
+        await _prisma.disconnect()
+        MetricsCollector.set_db_connected(False)
+
+
+async def get_db() -> Prisma:
+    """
+    FastAPI dependency returning the shared, connected Prisma client
+
+    Usage:
+        @router.get("/items")
+        async def list_items(db: Prisma = Depends(get_db)):
+            return await db.item.find_many()
+    """
+    return await connect_db()
+
 
 @asynccontextmanager
 async def get_db_connection():
     """
     Context manager for database connections
 
-    Ensures proper connection and disconnection
+    Yields the shared Prisma client; the connection is kept open for
+    reuse after the block exits.
 
     Usage:
         async with get_db_connection() as db:
             result = await db.user.count()
     """
-    prisma = Prisma()
-    await prisma.connect()
-    try:
-        yield prisma
-    finally:
-        await prisma.disconnect()
+    yield await connect_db()
 
 
 async def time_database_operation(operation: Callable[[], Any]) -> Dict[str, Any]:
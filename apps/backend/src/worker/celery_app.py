@@ -7,6 +7,7 @@
 import os
 
 from celery import Celery
+from celery.schedules import crontab
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
 
@@ -20,3 +21,35 @@ celery_app.conf.update(
     task_track_started=True,
     worker_max_tasks_per_child=1000,
 )
+
+# Minutes between scheduled portfolio snapshots
+PORTFOLIO_SNAPSHOT_INTERVAL_MINUTES = int(
+    os.getenv("PORTFOLIO_SNAPSHOT_INTERVAL_MINUTES", "60")
+)
+
+# Queue for scheduled maintenance tasks, consumed by its own worker so
+# they are not stuck behind a long-running run_bot_loop
+SCHEDULED_QUEUE = "scheduled"
+
+celery_app.conf.beat_schedule = {
+    "check-secret-rotation-daily": {
+        "task": "check_secret_rotation",
+        "schedule": crontab(hour=6, minute=0),  # 6 AM UTC daily
+        "options": {"queue": SCHEDULED_QUEUE},
+    },
+    "maintain-audit-partitions-daily": {
+        "task": "maintain_audit_partitions",
+        "schedule": crontab(hour=2, minute=30),  # 2:30 AM UTC daily
+        "options": {"queue": SCHEDULED_QUEUE},
+    },
+    "snapshot-portfolios": {
+        "task": "snapshot_portfolios",
+        "schedule": PORTFOLIO_SNAPSHOT_INTERVAL_MINUTES * 60,
+        "options": {"queue": SCHEDULED_QUEUE},
+    },
+    "cleanup-audit-logs-weekly": {
+        "task": "cleanup_audit_logs",
+        "schedule": crontab(day_of_week=0, hour=3, minute=0),  # Sunday 3 AM UTC
+        "options": {"queue": SCHEDULED_QUEUE},
+    },
+}
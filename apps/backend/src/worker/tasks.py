@@ -6,37 +6,73 @@
 
 import asyncio
 import logging
+import math
+import os
+from datetime import datetime
+from typing import Any, Awaitable, Dict, List, Optional
 
-from prisma import Prisma
+import ccxt
+from celery.signals import worker_process_shutdown, worker_shutdown
 
+from src.ml.training import TrainingJobs
 from src.services.audit_service import AuditService
 from src.services.notification_service import NotificationService
+from src.services.portfolio_service import PortfolioService
 from src.services.rental_service import RentalService
 from src.services.secret_rotation_service import SecretRotationService
 from src.trading.bot_runner import BotRunner
+from src.utils.database import connect_db, disconnect_db, get_prisma
 from src.worker.celery_app import celery_app
 
 logger = logging.getLogger(__name__)
-prisma = Prisma()
+
+# Portfolio snapshots: accounts per task, and an optional fixed delay between
+# an exchange's tasks (derived from the exchange's rate limit when unset)
+PORTFOLIO_SNAPSHOT_BATCH_SIZE = int(os.getenv("PORTFOLIO_SNAPSHOT_BATCH_SIZE", "10"))
+PORTFOLIO_SNAPSHOT_STAGGER_SECONDS = os.getenv("PORTFOLIO_SNAPSHOT_STAGGER_SECONDS")
+
+# Fallback delay when an exchange's rate limit is unknown
+DEFAULT_SNAPSHOT_STAGGER_SECONDS = 30
+
+# Persistent event loop per worker process. The shared Prisma client is bound
+# to the loop it connected on, so tasks reuse it instead of asyncio.run().
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def run_async(coro: Awaitable[Any]) -> Any:
+    """Run a coroutine on the worker loop with the shared DB client connected"""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    _loop.run_until_complete(connect_db())
+    return _loop.run_until_complete(coro)
+
+
+@worker_shutdown.connect
+@worker_process_shutdown.connect
+def _shutdown_db(**kwargs):
+    """Disconnect the shared Prisma client when the worker exits"""
+    if _loop is not None and not _loop.is_closed():
+        _loop.run_until_complete(disconnect_db())
+        _loop.close()
 
 
 @celery_app.task(bind=True, name="run_bot_loop")
 def run_bot_loop(self, bot_id: int):
-    asyncio.run(run_bot_async(bot_id))
+    run_async(run_bot_async(bot_id))
 
 
 async def run_bot_async(bot_id: int):
-    await prisma.connect()
-    runner = BotRunner(prisma=prisma, bot_id=bot_id)
+    runner = BotRunner(prisma=get_prisma(), bot_id=bot_id)
     await runner.run_loop()
-    await prisma.disconnect()
 
 
 # Phase 4: Contract expiry checking task
 @celery_app.task(bind=True, name="check_contract_expiry")
 def check_contract_expiry(self):
     """Check for expiring or expired rental contracts"""
-    asyncio.run(check_contract_expiry_async())
+    run_async(check_contract_expiry_async())
 
 
 async def check_contract_expiry_async():
@@ -91,7 +127,7 @@ async def check_contract_expiry_async():
 @celery_app.task(bind=True, name="check_secret_rotation")
 def check_secret_rotation(self):
     """Check for secrets that need rotation and send reminders"""
-    asyncio.run(check_secret_rotation_async())
+    run_async(check_secret_rotation_async())
 
 
 async def check_secret_rotation_async():
@@ -137,7 +173,7 @@ async def check_secret_rotation_async():
 @celery_app.task(bind=True, name="cleanup_audit_logs")
 def cleanup_audit_logs(self):
     """Clean up old audit logs based on retention policy"""
-    asyncio.run(cleanup_audit_logs_async())
+    run_async(cleanup_audit_logs_async())
 
 
 async def cleanup_audit_logs_async():
@@ -154,3 +190,184 @@ async def cleanup_audit_logs_async():
     except Exception as e:
         logger.error(f"Error during audit log cleanup: {e}")
         raise
+
+
+# Audit log partition maintenance task
+@celery_app.task(bind=True, name="maintain_audit_partitions")
+def maintain_audit_partitions(self):
+    """Create upcoming monthly audit log partitions"""
+    run_async(maintain_audit_partitions_async())
+
+
+async def maintain_audit_partitions_async():
+    """Async implementation of audit log partition maintenance"""
+    audit_service = AuditService()
+
+    try:
+        logger.info("Starting audit log partition maintenance...")
+
+        created = await audit_service.ensure_partitions()
+
+        logger.info(
+            f"Audit log partition maintenance completed. "
+            f"Created {len(created)} partitions."
+        )
+
+    except Exception as e:
+        logger.error(f"Error during audit log partition maintenance: {e}")
+        raise
+
+
+# Portfolio snapshot tasks
+@celery_app.task(bind=True, name="snapshot_portfolios")
+def snapshot_portfolios(self):
+    """Schedule snapshots of all enabled accounts, staggered per exchange"""
+    return run_async(snapshot_portfolios_async())
+
+
+async def snapshot_portfolios_async() -> int:
+    """
+    Split enabled accounts into per-exchange batches
+
+    Batches for different exchanges start together; batches on the same
+    exchange are spaced by snapshot_stagger_seconds() so each exchange's
+    rate limit is respected. Every batch shares one timestamp.
+    """
+    accounts = await get_prisma().account.find_many(
+        where={"enabled": True}, include={"exchangeKey": True}
+    )
+
+    by_exchange = {}
+    for account in accounts:
+        by_exchange.setdefault(account.exchangeKey.exchange, []).append(account.id)
+
+    taken_at = datetime.utcnow().isoformat()
+    scheduled = 0
+    for exchange, account_ids in by_exchange.items():
+        stagger = snapshot_stagger_seconds(exchange)
+        for index in range(0, len(account_ids), PORTFOLIO_SNAPSHOT_BATCH_SIZE):
+            batch = account_ids[index : index + PORTFOLIO_SNAPSHOT_BATCH_SIZE]
+            snapshot_accounts.apply_async(
+                args=[batch, taken_at],
+                countdown=(index // PORTFOLIO_SNAPSHOT_BATCH_SIZE) * stagger,
+            )
+            scheduled += 1
+
+    logger.info(
+        f"Scheduled {scheduled} portfolio snapshot batches for "
+        f"{len(accounts)} accounts on {len(by_exchange)} exchanges"
+    )
+    return scheduled
+
+
+def snapshot_stagger_seconds(exchange: str) -> int:
+    """
+    Delay between snapshot batches on one exchange
+
+    A batch makes one balance request per account plus a markets and a
+    tickers request; batches are spaced by that many requests at the
+    exchange's ccxt rateLimit (milliseconds between requests), unless
+    PORTFOLIO_SNAPSHOT_STAGGER_SECONDS fixes the delay.
+    """
+    if PORTFOLIO_SNAPSHOT_STAGGER_SECONDS:
+        return int(PORTFOLIO_SNAPSHOT_STAGGER_SECONDS)
+
+    try:
+        rate_limit_ms = getattr(ccxt, exchange)().rateLimit
+    except Exception:
+        return DEFAULT_SNAPSHOT_STAGGER_SECONDS
+
+    requests = PORTFOLIO_SNAPSHOT_BATCH_SIZE + 2
+    return max(1, math.ceil(requests * rate_limit_ms / 1000))
+
+
+@celery_app.task(bind=True, name="snapshot_accounts")
+def snapshot_accounts(self, account_ids: List[int], taken_at: str):
+    """Sync and snapshot one batch of accounts on the same exchange"""
+    return run_async(snapshot_accounts_async(account_ids, taken_at))
+
+
+async def snapshot_accounts_async(account_ids: List[int], taken_at: str) -> int:
+    """Async implementation of a portfolio snapshot batch"""
+    portfolio_service = PortfolioService()
+
+    try:
+        stored = await portfolio_service.snapshot_accounts(
+            account_ids, taken_at=datetime.fromisoformat(taken_at)
+        )
+        logger.info(f"Stored {stored} portfolio snapshots")
+        return stored
+
+    except Exception as e:
+        logger.error(f"Error during portfolio snapshot: {e}")
+        raise
+
+
+# Phase 6: ML training tasks
+@celery_app.task(bind=True, name="train_ml_model")
+def train_ml_model(self, training_id: int):
+    """Train a queued MLModelTraining run"""
+    return run_async(train_ml_model_async(training_id))
+
+
+async def train_ml_model_async(training_id: int) -> Dict[str, Any]:
+    """Async implementation of model training"""
+    try:
+        logger.info(f"Starting ML model training run {training_id}")
+        metrics = await TrainingJobs().run_model_training(training_id)
+        logger.info(f"ML model training run {training_id} completed: {metrics}")
+        return metrics
+
+    except Exception as e:
+        logger.error(f"Error during ML model training run {training_id}: {e}")
+        raise
+
+
+@celery_app.task(bind=True, name="optimize_strategy")
+def optimize_strategy(
+    self,
+    optimization_id: int,
+    symbol: str,
+    timeframe: str,
+    optimization_goal: str = "SHARPE_RATIO",
+    historical_data: Optional[List[Dict[str, float]]] = None,
+    exchange: str = "binance",
+):
+    """Run a queued StrategyOptimization"""
+    return run_async(
+        optimize_strategy_async(
+            optimization_id,
+            symbol,
+            timeframe,
+            optimization_goal,
+            historical_data,
+            exchange,
+        )
+    )
+
+
+async def optimize_strategy_async(
+    optimization_id: int,
+    symbol: str,
+    timeframe: str,
+    optimization_goal: str,
+    historical_data: Optional[List[Dict[str, float]]],
+    exchange: str,
+) -> Dict[str, Any]:
+    """Async implementation of strategy optimization"""
+    try:
+        logger.info(f"Starting strategy optimization {optimization_id}")
+        result = await TrainingJobs().run_optimization(
+            optimization_id,
+            symbol,
+            timeframe,
+            optimization_goal=optimization_goal,
+            historical_data=historical_data,
+            exchange=exchange,
+        )
+        logger.info(f"Strategy optimization {optimization_id} completed")
+        return result
+
+    except Exception as e:
+        logger.error(f"Error during strategy optimization {optimization_id}: {e}")
+        raise
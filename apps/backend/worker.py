@@ -5,12 +5,15 @@
 // Author: ZeaZDev Meta-Intelligence (Generated) //
 // --- DO NOT EDIT HEADER --- //"""
 
-from src.worker.celery_app import celery_app
+import os
 
 # Import tasks to register them with celery
+import src.worker.tasks  # noqa: F401
+from src.worker.celery_app import celery_app
 
 if __name__ == "__main__":
-    # Start celery worker
+    # Start celery worker on CELERY_QUEUES (comma-separated)
+    queues = os.getenv("CELERY_QUEUES", "celery")
     celery_app.worker_main(
-        ["worker", "--loglevel=info", "--concurrency=2", "--pool=solo"]
+        ["worker", "--loglevel=info", "--concurrency=2", "--pool=solo", "-Q", queues]
     )
@@ -0,0 +1,77 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Ensure the backend package is on sys.path for src.* imports during tests
+BACKEND = Path(__file__).resolve().parents[1] / "apps" / "backend"
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+pytest.importorskip("pandas")
+
+from src.backtesting.vectorized import (  # noqa: E402
+    VectorizedBacktester,
+    build_strategy,
+    resolve_positions,
+)
+
+
+def _history(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    return [
+        {
+            "close": float(c),
+            "high": float(c * (1 + rng.uniform(0, 0.02))),
+            "low": float(c * (1 - rng.uniform(0, 0.02))),
+            "volume": float(rng.uniform(1, 10)),
+        }
+        for c in closes
+    ]
+
+
+def _replay_positions(strategy, ticker_data):
+    """Long/flat position after each candle from execute() on every prefix"""
+    n = len(ticker_data["closes"])
+    positions = np.zeros(n)
+    long = False
+    for t in range(n):
+        window = {key: values[: t + 1] for key, values in ticker_data.items() if values}
+        signal = strategy.execute(window, {"backtest": True}).get("signal", "HOLD")
+        if signal in ("BUY", "SELL"):
+            long = signal == "BUY"
+        positions[t] = long
+    return positions
+
+
+@pytest.mark.parametrize(
+    "strategy_name, params",
+    [
+        ("RSI_CROSS", {}),
+        (
+            "RSI_CROSS",
+            {"period": 7, "oversoldThreshold": 40, "overboughtThreshold": 60},
+        ),
+        ("BREAKOUT", {}),
+        ("BREAKOUT", {"lookback": 10, "volume_factor": 1.0}),
+        ("VWAP", {}),
+        ("VWAP", {"threshold": 0.005}),
+    ],
+)
+def test_signal_conditions_match_execute_replay(strategy_name, params):
+    backtester = VectorizedBacktester(_history())
+
+    conditions = build_strategy(strategy_name, params).signal_conditions(
+        backtester.ticker_data
+    )
+    assert conditions is not None
+    vectorized = resolve_positions(*conditions)
+
+    replayed = _replay_positions(
+        build_strategy(strategy_name, params), backtester.ticker_data
+    )
+
+    assert replayed.any(), "history should produce at least one entry"
+    np.testing.assert_array_equal(vectorized, replayed)